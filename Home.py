@@ -1,90 +1,47 @@
 """Home page for the Garmin R10 Analyzer Streamlit app.
 
 This module handles file uploads, session-state management and persistence
-between reloads. Uploaded CSV files are combined into a single dataframe and
-cached on disk so the user can navigate between pages without losing data.
+between reloads. Uploaded CSV files are added to a per-session
+:class:`~utils.shot_store.ShotStore` and cached on disk so the user can
+navigate between pages without losing data.
 """
 
-import json
-import os
-import uuid
-
-import pandas as pd
 import streamlit as st
 
-from utils.logger import logger
-from utils.session_loader import load_sessions
+from utils.session_loader import file_digest, is_archive, load_sessions
+from utils.page_utils import classify_sessions, get_shot_sketches, get_shot_store
 from utils.responsive import configure_page
-from utils.cache import persist_state, CACHE_PATH
+from utils.cache import load_persisted_state, persist_state
 
 configure_page()
 st.title("📊 Garmin R10 Analyzer")
 
 if "session_ids" not in st.session_state:
     st.session_state["session_ids"] = {}
-if "shot_tags" not in st.session_state:
-    st.session_state["shot_tags"] = {}
+if "file_hashes" not in st.session_state:
+    st.session_state["file_hashes"] = {}
 if "practice_log" not in st.session_state:
     st.session_state["practice_log"] = []
 
 
-def _refresh_session_views() -> None:
-    """Recompute derived session state like ``df_all`` and ``club_data``."""
-
-    df = st.session_state.get("session_df", pd.DataFrame())
-    st.session_state["df_all"] = df
-    if "Club" in df.columns:
-        st.session_state["club_data"] = {club: grp for club, grp in df.groupby("Club")}
-    else:
-        st.session_state["club_data"] = {}
+def load_state() -> None:
+    """Load previously persisted session state from disk if it exists.
 
+    Shot segments are attached lazily by :func:`load_persisted_state` and only
+    read once a page needs them, so the home page starts without loading the
+    full history.
+    """
 
-def load_state() -> None:
-    """Load previously persisted session state from disk if it exists."""
-
-    if os.path.exists(CACHE_PATH):
-        try:
-            with open(CACHE_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except (OSError, json.JSONDecodeError) as exc:  # pragma: no cover - rare
-            logger.warning("Failed to load cached state: %s", exc)
-            return
-        st.session_state["uploaded_sessions"] = data.get("sessions", data.get("files", []))
-        st.session_state["shot_tags"] = {
-            int(k): v for k, v in data.get("shot_tags", {}).items()
-        }
-        st.session_state["practice_log"] = data.get("practice_log", [])
-        st.session_state["session_ids"] = data.get("session_ids", {})
-
-        df_json = data.get("df")
-        if df_json:
-            try:
-                st.session_state["session_df"] = pd.read_json(
-                    df_json, orient="split"
-                )
-            except ValueError as exc:  # pragma: no cover - rarely triggered
-                logger.warning("Failed to parse cached dataframe: %s", exc)
-                st.session_state["session_df"] = pd.DataFrame()
-        else:
-            st.session_state["session_df"] = pd.DataFrame()
-
-        # If session IDs are missing but sessions are present, generate them
-        if (
-            st.session_state.get("session_df") is not None
-            and not st.session_state["session_df"].empty
-            and "Session ID" not in st.session_state["session_df"].columns
-        ):
-            sid_map = {}
-            for sname in st.session_state["session_df"]["Session Name"].unique():
-                sid = uuid.uuid4().hex
-                sid_map[sname] = sid
-                st.session_state["session_df"].loc[
-                    st.session_state["session_df"]["Session Name"] == sname,
-                    "Session ID",
-                ] = sid
-            st.session_state["session_ids"] = sid_map
-
-        _refresh_session_views()
+    data = load_persisted_state()
+    if data is None:
+        return
+    st.session_state["uploaded_sessions"] = data.get("sessions", data.get("files", []))
+    st.session_state["practice_log"] = data.get("practice_log", [])
+    st.session_state["session_ids"] = data.get("session_ids", {})
+    st.session_state["file_hashes"] = data.get("file_hashes", {})
+    st.session_state["shot_store"] = data["store"]
+    data["store"].tag(data.get("shot_tags", {}))
+    st.session_state["shot_sketches"] = data["sketches"]
 
 
 def _rerun() -> None:
@@ -103,38 +60,58 @@ if "uploaded_sessions" not in st.session_state:
 
 
 uploaded_files = st.file_uploader(
-    "Upload one or more Garmin CSV files",
-    type=["csv"],
+    "Upload one or more Garmin CSV files, or a zip / tar.gz archive of them",
+    type=["csv", "zip", "tar", "gz", "tgz"],
     accept_multiple_files=True,
 )
 
 if uploaded_files:
-    df_new = load_sessions(uploaded_files)
+    # Hash every upload first: files already in the session are skipped
+    # without being parsed, which keeps reruns with a full uploader cheap.
+    file_hashes = st.session_state["file_hashes"]
+    archives = [f for f in uploaded_files if is_archive(f.name)]
+    fresh_files, fresh_digests = [], []
+    for file in uploaded_files:
+        if file in archives:
+            continue
+        digest = file_digest(file)
+        if digest in file_hashes or digest in fresh_digests:
+            continue
+        fresh_files.append(file)
+        fresh_digests.append(digest)
+    already_loaded = len(fresh_files) < len(uploaded_files) - len(archives)
+
+    # Archive members are streamed one at a time; members that are already
+    # loaded are skipped by digest just like individual uploads.  Loose files
+    # and archives are named together so same-date sessions stay distinct.
+    df_new = load_sessions(
+        fresh_files, fresh_digests, archives=archives, skip_digests=file_hashes
+    )
+    new_names = (
+        df_new["Session Name"].drop_duplicates().tolist() if not df_new.empty else []
+    )
     existing = set(st.session_state.get("uploaded_sessions", []))
-    new_names = df_new["Session Name"].drop_duplicates().tolist()
     dupes = [n for n in new_names if n in existing]
     if dupes:
         st.warning("Skipping duplicate session(s): " + ", ".join(dupes))
-    df_new = df_new[~df_new["Session Name"].isin(dupes)]
+        dup_rows = df_new[df_new["Session Name"].isin(dupes)]
+        for digest, name in dup_rows[["Source Hash", "Session Name"]].drop_duplicates().values:
+            file_hashes[digest] = st.session_state["session_ids"].get(name)
+        df_new = df_new[~df_new["Session Name"].isin(dupes)]
     if not df_new.empty:
-        if (
-            "session_df" in st.session_state
-            and st.session_state["session_df"].shape[0] > 0
-        ):
-            st.session_state["session_df"] = pd.concat(
-                [st.session_state["session_df"], df_new], ignore_index=True
-            )
-        else:
-            st.session_state["session_df"] = df_new
+        added = get_shot_store().append(df_new)
+        # Sketch and label only the new segments.
+        get_shot_sketches()
+        classify_sessions(added)
 
         ids = (
-            df_new[["Session ID", "Session Name"]]
+            df_new[["Session ID", "Session Name", "Source Hash"]]
             .drop_duplicates()
             .to_dict("records")
         )
         for rec in ids:
             st.session_state["session_ids"][rec["Session Name"]] = rec["Session ID"]
-        _refresh_session_views()
+            file_hashes[rec["Source Hash"]] = rec["Session ID"]
         st.session_state["uploaded_sessions"].extend(
             [name for name in new_names if name not in dupes]
         )
@@ -142,6 +119,11 @@ if uploaded_files:
         st.success(
             f"✅ {len(new_names) - len(dupes)} new session(s) uploaded. Navigate to any page to begin.",
         )
+    elif already_loaded or archives:
+        st.info(
+            "📁 The uploaded files contain no new sessions. "
+            "You can navigate to any page or clear/remove them below."
+        )
 elif st.session_state.get("uploaded_sessions"):
     st.info(
         f"📁 {len(st.session_state['uploaded_sessions'])} session(s) currently stored. "
@@ -158,16 +140,11 @@ def remove_session(name: str) -> None:
         return
     st.session_state["uploaded_sessions"].remove(name)
     sid = st.session_state.get("session_ids", {}).pop(name, None)
-    if (
-        sid
-        and "session_df" in st.session_state
-        and not st.session_state["session_df"].empty
-        and "Session ID" in st.session_state["session_df"].columns
-    ):
-        st.session_state["session_df"] = st.session_state["session_df"][
-            st.session_state["session_df"]["Session ID"] != sid
-        ]
-        _refresh_session_views()
+    file_hashes = st.session_state.get("file_hashes", {})
+    for digest in [d for d, s in file_hashes.items() if s == sid]:
+        del file_hashes[digest]
+    if sid and get_shot_store().drop(sid):
+        get_shot_sketches()
     persist_state()
     _rerun()
 
@@ -180,13 +157,23 @@ if st.session_state.get("uploaded_sessions"):
         if cols[1].button("Remove", key=f"rm_{sname}"):
             remove_session(sname)
 
+    with st.expander("Memory usage"):
+        # Shots are stored once, in the compact layout; pages derive views
+        # from the store instead of keeping their own copies.
+        report = get_shot_store().memory_usage()
+        st.caption(
+            f"{report['Bytes'].sum() / 2**20:.1f} MB for {report['Rows'].sum()} shots "
+            f"({(~report['Loaded']).sum()} session(s) not loaded yet)"
+        )
+        st.dataframe(report, use_container_width=True)
+
     if st.button("Clear uploaded sessions"):
         st.session_state.pop("uploaded_sessions", None)
-        st.session_state.pop("session_df", None)
-        st.session_state.pop("df_all", None)
-        st.session_state.pop("club_data", None)
+        st.session_state.pop("shot_store", None)
+        st.session_state.pop("shot_sketches", None)
+        st.session_state.pop("club_stats", None)
         st.session_state.pop("session_ids", None)
-        st.session_state.pop("shot_tags", None)
+        st.session_state.pop("file_hashes", None)
         persist_state()
         _rerun()
 
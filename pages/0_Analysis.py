@@ -1,6 +1,6 @@
 """Combined dashboard and benchmarking analysis page."""
 
-from typing import Union
+from typing import Optional, Union
 
 import pandas as pd
 import plotly.express as px
@@ -8,114 +8,89 @@ import streamlit as st
 
 from utils.logger import logger
 from utils.data_utils import (
-    coerce_numeric,
-    remove_outliers,
-    classify_shots,
+    inlier_mask,
     IsolationForest,
 )
-from utils.constants import COLUMN_NORMALIZATION_MAP
-from utils.page_utils import require_data
+from utils.club_index import ClubIndex
+from utils.club_stats import ClubStats
+from utils.constants import NUMERIC_FIELDS
+from utils.page_utils import (
+    get_shot_sketches,
+    get_shot_store,
+    require_data,
+    select_sessions,
+)
+from utils.sketches import ShotSketches
 from utils.responsive import configure_page
 
 logger.info("📄 Page loaded: Analysis")
 configure_page()
 st.title("📈 Analysis")
 
-# Load and standardise data -------------------------------------------------
-raw_df = require_data().copy()
-
-
-@st.cache_data
-def _standardize(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.rename(
-        columns={k: v for k, v in COLUMN_NORMALIZATION_MAP.items() if k in df.columns}
-    )
-    df = df.loc[:, ~df.columns.duplicated()]
-    if "offline_distance" not in df.columns and "side_distance" in df.columns:
-        df["offline_distance"] = df["side_distance"]
-    for col in [
-        "carry_distance",
-        "total_distance",
-        "ball_speed",
-        "launch_angle",
-        "spin_rate",
-        "apex_height",
-        "side_distance",
-        "offline_distance",
-    ]:
-        if col in df.columns:
-            df[col] = coerce_numeric(df[col])
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    return df
-
+# Columns are canonical from ingest (see ``COLUMN_ALIASES``), so the stored
+# frame is used as-is.
+df = require_data()
+df_filtered = df
+session_names = get_shot_store().catalog["Session Name"].dropna().tolist()
 
-df = _standardize(raw_df)
-df_filtered = df.copy()
-session_names = df["session_name"].dropna().unique().tolist()
 
-
-@st.cache_data
-def _apply_outlier_filter(
-    df: pd.DataFrame,
+@st.cache_data(max_entries=16)
+def _outlier_mask(
+    data_version: int,
+    selection: Optional[tuple[str, ...]],
     cols: tuple[str, ...],
     z: float,
     method: str,
     iqr: float,
     contamination: Union[float, str],
-) -> pd.DataFrame:
-    return remove_outliers(
-        df,
+    _df: pd.DataFrame,
+    _sketch: Optional[ShotSketches] = None,
+) -> pd.Series:
+    # ``_df`` is not hashed: the store's data version and the selected
+    # sessions (``None`` for all) identify its rows, so cache lookups are
+    # O(1).  Quality is filtered after outliers, so tags do not invalidate it.
+    return inlier_mask(
+        _df,
         list(cols),
         z_thresh=z,
         iqr_mult=iqr,
         method=method,
         contamination=contamination,
+        sketch=_sketch,
     )
 
 
-def _session_filter_ui(df: pd.DataFrame, session_names: list[str]) -> pd.DataFrame:
+def _session_filter_ui(
+    df: pd.DataFrame, session_names: list[str]
+) -> tuple[pd.DataFrame, Optional[tuple[str, ...]]]:
+    """Return the selected rows and their session IDs (``None`` for all)."""
+
     session_option = st.selectbox(
         "Choose sessions to analyze",
         ["All Sessions", "Latest Session", "Last 5 Sessions", "Select Sessions"],
     )
-    if session_option == "All Sessions":
-        filtered = df
-    elif session_option == "Latest Session":
-        if "Date" in df.columns and df["Date"].notna().any():
-            latest_session = df.loc[df["Date"].idxmax(), "session_name"]
-        else:
-            latest_session = session_names[-1] if session_names else None
-        filtered = (
-            df[df["session_name"] == latest_session]
-            if latest_session
-            else df.iloc[0:0]
-        )
-    elif session_option == "Last 5 Sessions":
-        if "Date" in df.columns and df["Date"].notna().any():
-            session_order = (
-                df.drop_duplicates("session_name").sort_values("Date")
-            )["session_name"].tolist()
-        else:
-            session_order = session_names
-        last_sessions = session_order[-5:]
-        filtered = df[df["session_name"].isin(last_sessions)]
-    else:
-        chosen = st.multiselect("Select session(s)", session_names)
-        filtered = df[df["session_name"].isin(chosen)] if chosen else df.iloc[0:0]
-
+    chosen = (
+        st.multiselect("Select session(s)", session_names)
+        if session_option == "Select Sessions"
+        else ()
+    )
     exclude = st.multiselect(
         "Exclude sessions from analysis",
         session_names,
         st.session_state.get("exclude_sessions", []),
     )
     st.session_state["exclude_sessions"] = exclude
-    if exclude:
-        filtered = filtered[~filtered["session_name"].isin(exclude)]
-    return filtered
+    if session_option == "All Sessions" and not exclude:
+        return df, None
+    # ``df`` has the store's rows in order, so sessions resolved through the
+    # catalog are sliced out by position.
+    sids = tuple(select_sessions(session_option, chosen, exclude))
+    return df.iloc[get_shot_store().positions(sids)], sids
 
 
-def _outlier_filter_ui(df: pd.DataFrame) -> pd.DataFrame:
+def _outlier_filter_ui(
+    df: pd.DataFrame, selection: Optional[tuple[str, ...]]
+) -> pd.DataFrame:
     filter_outliers = st.checkbox(
         "Remove outliers",
         value=True,
@@ -135,26 +110,22 @@ def _outlier_filter_ui(df: pd.DataFrame) -> pd.DataFrame:
               interquartile range multiplied by this value.
             * **Contamination** – for the adaptive method, approximate fraction of shots
               expected to be outliers.
+            * **Robust** – flags shots whose combination of metrics is unusual for the
+              club (e.g. a normal carry with an extreme spin rate), even when each value
+              looks normal on its own.
             """
         )
-    numeric_cols = (
-        "carry_distance",
-        "total_distance",
-        "ball_speed",
-        "launch_angle",
-        "spin_rate",
-        "apex_height",
-        "side_distance",
-        "offline_distance",
-    )
-    cols_present = [c for c in numeric_cols if c in df.columns]
+    cols_present = [c for c in NUMERIC_FIELDS if c in df.columns]
     col_sel = st.multiselect("Outlier metrics", cols_present, default=cols_present)
     method_choice = st.radio(
         "Outlier detection",
-        ["Statistical", "Adaptive"],
-        help="Statistical uses z-scores/IQR; Adaptive uses Isolation Forest",
+        ["Statistical", "Adaptive", "Robust"],
+        help=(
+            "Statistical uses z-scores/IQR; Adaptive uses Isolation Forest; "
+            "Robust uses a robust Mahalanobis distance across all metrics"
+        ),
     )
-    method = "isolation" if method_choice == "Adaptive" else "mad"
+    method = {"Adaptive": "isolation", "Robust": "robust"}.get(method_choice, "mad")
     if method == "isolation" and IsolationForest is None:
         st.warning(
             "scikit-learn required for adaptive method; using statistical instead",
@@ -177,6 +148,8 @@ def _outlier_filter_ui(df: pd.DataFrame) -> pd.DataFrame:
             1.5,
             help="Multiplier for the interquartile range; lower values are stricter.",
         )
+    elif method == "robust":
+        z_thresh = 3.0
     else:
         z_thresh = 3.0
         contamination = st.slider(
@@ -187,40 +160,47 @@ def _outlier_filter_ui(df: pd.DataFrame) -> pd.DataFrame:
             help="Expected fraction of shots that are outliers for Isolation Forest.",
         )
     if col_sel:
-        before = df.copy()
-        df = _apply_outlier_filter(
-            df, tuple(col_sel), z_thresh, method, iqr_mult, contamination
+        # When every stored shot is selected, the statistical thresholds come
+        # from the per-session sketches instead of sorting the whole history.
+        store = get_shot_store()
+        sketch = None
+        if method == "mad" and selection is None:
+            sketch = get_shot_sketches()
+        keep = _outlier_mask(
+            store.data_version,
+            selection,
+            tuple(col_sel),
+            z_thresh,
+            method,
+            iqr_mult,
+            contamination,
+            df,
+            sketch,
         )
-        removed = before.loc[~before.index.isin(df.index)]
-        if not removed.empty:
-            st.info(f"Removed {len(removed)} shots as outliers")
+        removed = int((~keep).sum())
+        if removed:
+            st.info(f"Removed {removed} shots as outliers")
             with st.expander("Show removed outliers"):
-                st.dataframe(removed)
+                st.dataframe(df[~keep])
+        df = df[keep]
     return df
 
 
 def _quality_filter_ui(df: pd.DataFrame) -> pd.DataFrame:
-    df = classify_shots(
-        df, carry_col="carry_distance", offline_col="offline_distance"
-    )
-    if "shot_tags" in st.session_state:
-        tag_map = st.session_state["shot_tags"]
-        df.loc[df.index.intersection(tag_map.keys()), "Quality"] = df.index.map(
-            tag_map
-        )
     use_quality = st.checkbox(
         "Include only 'good' shots",
         value=False,
         help="Keep shots labelled as 'good' and ignore ones tagged 'miss' or 'outlier'",
     )
-    if use_quality and "Quality" in df.columns:
-        df = df[df["Quality"] == "good"]
-    return df
+    if not use_quality:
+        return df
+    # Labels, including manual tags, are stored with the shots.
+    return df[df["Quality"].eq("good")]
 
 
 with st.expander("Advanced Filters", expanded=False):
-    df_filtered = _session_filter_ui(df, session_names)
-    df_filtered = _outlier_filter_ui(df_filtered)
+    df_filtered, selection = _session_filter_ui(df, session_names)
+    df_filtered = _outlier_filter_ui(df_filtered, selection)
     df_filtered = _quality_filter_ui(df_filtered)
 overview_tab, benchmark_tab = st.tabs(["Overview", "Benchmarking"])
 
@@ -228,48 +208,64 @@ overview_tab, benchmark_tab = st.tabs(["Overview", "Benchmarking"])
 with overview_tab:
     st.subheader("Club Performance Overview")
 
-    club_summary = df_filtered.groupby("club").agg(
-        total_shots=("carry_distance", "count"),
-        avg_carry=("carry_distance", "mean"),
-        median_carry=("carry_distance", "median"),
-        p25_carry=("carry_distance", lambda x: x.quantile(0.25)),
-        p75_carry=("carry_distance", lambda x: x.quantile(0.75)),
-        std_carry=("carry_distance", "std"),
-        avg_ball_speed=("ball_speed", "mean"),
-        median_ball_speed=("ball_speed", "median"),
-        avg_launch_angle=("launch_angle", "mean"),
-        median_launch_angle=("launch_angle", "median"),
-        avg_spin_rate=("spin_rate", "mean"),
-        median_spin_rate=("spin_rate", "median"),
-    ).reset_index()
+    club_stats = ClubStats.from_frame(df_filtered)
+    summary_stats = {
+        "total_shots": ("Carry Distance", "count"),
+        "avg_carry": ("Carry Distance", "mean"),
+        "median_carry": ("Carry Distance", "median"),
+        "p25_carry": ("Carry Distance", "p25"),
+        "p75_carry": ("Carry Distance", "p75"),
+        "std_carry": ("Carry Distance", "std"),
+        "avg_ball_speed": ("Ball Speed", "mean"),
+        "median_ball_speed": ("Ball Speed", "median"),
+        "avg_launch_angle": ("Launch Angle", "mean"),
+        "median_launch_angle": ("Launch Angle", "median"),
+        "avg_spin_rate": ("Spin Rate", "mean"),
+        "median_spin_rate": ("Spin Rate", "median"),
+    }
+    # Metrics missing from the export are left out of the summary.
+    club_summary = (
+        pd.DataFrame(
+            {
+                name: club_stats.table[key]
+                for name, key in summary_stats.items()
+                if key in club_stats.table.columns
+            },
+            index=club_stats.table.index,
+        )
+        .astype({"total_shots": int})
+        .sort_index()
+        .reset_index()
+    )
 
     club_summary = club_summary[club_summary["total_shots"] >= 6]
 
+    formats = {
+        "avg_carry": "{:.1f}",
+        "median_carry": "{:.1f}",
+        "p25_carry": "{:.1f}",
+        "p75_carry": "{:.1f}",
+        "std_carry": "{:.1f}",
+        "avg_ball_speed": "{:.1f}",
+        "median_ball_speed": "{:.1f}",
+        "avg_launch_angle": "{:.1f}",
+        "median_launch_angle": "{:.1f}",
+        "avg_spin_rate": "{:.0f}",
+        "median_spin_rate": "{:.0f}",
+    }
     st.dataframe(
         club_summary.style.format(
-            {
-                "avg_carry": "{:.1f}",
-                "median_carry": "{:.1f}",
-                "p25_carry": "{:.1f}",
-                "p75_carry": "{:.1f}",
-                "std_carry": "{:.1f}",
-                "avg_ball_speed": "{:.1f}",
-                "median_ball_speed": "{:.1f}",
-                "avg_launch_angle": "{:.1f}",
-                "median_launch_angle": "{:.1f}",
-                "avg_spin_rate": "{:.0f}",
-                "median_spin_rate": "{:.0f}",
-            }
+            {col: fmt for col, fmt in formats.items() if col in club_summary.columns}
         )
     )
 
     fig_carry = px.bar(
         club_summary,
-        x="club",
+        x="Club",
         y="avg_carry",
         text="avg_carry",
         title="Average Carry Distance by Club",
-        labels={"avg_carry": "Avg Carry (yds)", "club": "Club"},
+        labels={"avg_carry": "Avg Carry (yds)", "Club": "Club"},
     )
     fig_carry.update_traces(texttemplate="%{text:.1f}", textposition="outside")
     st.plotly_chart(fig_carry, use_container_width=True)
@@ -278,7 +274,7 @@ with overview_tab:
         fig_pie = px.pie(
             club_summary,
             values="total_shots",
-            names="club",
+            names="Club",
             title="Shot Volume by Club",
         )
         st.plotly_chart(fig_pie, use_container_width=True)
@@ -286,7 +282,7 @@ with overview_tab:
     st.markdown("## ⚠️ Inconsistency Warning")
     high_variability = club_summary.sort_values("std_carry", ascending=False).head(3)
     st.dataframe(
-        high_variability[["club", "std_carry"]].style.format({"std_carry": "{:.1f}"})
+        high_variability[["Club", "std_carry"]].style.format({"std_carry": "{:.1f}"})
     )
 
     st.markdown("## 📊 Coach’s Notes")
@@ -307,117 +303,121 @@ with overview_tab:
     for _, row in club_summary.iterrows():
         if row["std_carry"] > carry_warn:
             st.warning(
-                f"**{row['club']}** carry varies {row['std_carry']:.1f} yds. "
+                f"**{row['Club']}** carry varies {row['std_carry']:.1f} yds. "
                 f"Try a [tempo drill](https://www.golfdigest.com/story/golf-tempo-drills) to tighten dispersion."
             )
-        if row["avg_carry"] < wedge_thresh and "wedge" in str(row["club"]).lower():
+        if row["avg_carry"] < wedge_thresh and "wedge" in str(row["Club"]).lower():
             st.info(
-                f"**{row['club']}** carry seems low. Work on [ball-first contact](https://www.golf.com/instruction/solid-contact-drill)."
+                f"**{row['Club']}** carry seems low. Work on [ball-first contact](https://www.golf.com/instruction/solid-contact-drill)."
             )
 
-    for club in club_summary["club"]:
-        club_df = df_filtered[df_filtered["club"] == club]
+    detail_cols = [
+        c
+        for c in ["Carry Distance", "Ball Speed", "Launch Angle", "Spin Rate"]
+        if c in df_filtered.columns
+    ]
+    club_index = ClubIndex.from_frame(df_filtered)
+    for club in club_summary["Club"]:
+        club_df = club_index.rows(df_filtered, club)
         with st.expander(f"{club} details"):
-            st.write(
-                club_df[["carry_distance", "ball_speed", "launch_angle", "spin_rate"]].describe()
-            )
+            st.write(club_df[detail_cols].describe())
 
 # ---------------------------------------------------------------------------
 with benchmark_tab:
     st.subheader("Club Benchmarking")
 
     required = [
-        "club",
-        "session_name",
-        "carry_distance",
-        "ball_speed",
-        "launch_angle",
-        "spin_rate",
+        "Club",
+        "Session Name",
+        "Carry Distance",
+        "Ball Speed",
+        "Launch Angle",
+        "Spin Rate",
     ]
     missing = [c for c in required if c not in df_filtered.columns]
     if missing:
         st.error("❌ Missing required columns: " + ", ".join(missing))
         st.stop()
 
-    clubs = sorted(df_filtered["club"].dropna().unique())
+    clubs = sorted(df_filtered["Club"].dropna().unique())
     selected_club = st.selectbox("Select Club", clubs)
     session_options = ["All Sessions"] + sorted(
-        df_filtered["session_name"].dropna().unique()
+        df_filtered["Session Name"].dropna().unique()
     )
     selected_session_bm = st.selectbox(
         "Filter by Session", session_options, key="bm_session"
     )
-    club_df = df_filtered[df_filtered["club"] == selected_club]
+    club_df = df_filtered[df_filtered["Club"] == selected_club]
     if selected_session_bm != "All Sessions":
-        club_df = club_df[club_df["session_name"] == selected_session_bm]
+        club_df = club_df[club_df["Session Name"] == selected_session_bm]
 
     has_offline = (
-        "offline_distance" in club_df.columns
-        and club_df["offline_distance"].notna().any()
+        "Offline" in club_df.columns
+        and club_df["Offline"].notna().any()
     )
 
     st.markdown("### Shot Metrics")
     metrics = [
         {
             "Metric": "Carry Distance",
-            "Average": club_df["carry_distance"].mean(),
-            "Std Dev": club_df["carry_distance"].std(),
-            "Min": club_df["carry_distance"].min(),
-            "Max": club_df["carry_distance"].max(),
-            "P25": club_df["carry_distance"].quantile(0.25),
-            "P75": club_df["carry_distance"].quantile(0.75),
+            "Average": club_df["Carry Distance"].mean(),
+            "Std Dev": club_df["Carry Distance"].std(),
+            "Min": club_df["Carry Distance"].min(),
+            "Max": club_df["Carry Distance"].max(),
+            "P25": club_df["Carry Distance"].quantile(0.25),
+            "P75": club_df["Carry Distance"].quantile(0.75),
         },
         {
             "Metric": "Ball Speed",
-            "Average": club_df["ball_speed"].mean(),
-            "Std Dev": club_df["ball_speed"].std(),
-            "Min": club_df["ball_speed"].min(),
-            "Max": club_df["ball_speed"].max(),
-            "P25": club_df["ball_speed"].quantile(0.25),
-            "P75": club_df["ball_speed"].quantile(0.75),
+            "Average": club_df["Ball Speed"].mean(),
+            "Std Dev": club_df["Ball Speed"].std(),
+            "Min": club_df["Ball Speed"].min(),
+            "Max": club_df["Ball Speed"].max(),
+            "P25": club_df["Ball Speed"].quantile(0.25),
+            "P75": club_df["Ball Speed"].quantile(0.75),
         },
         {
             "Metric": "Launch Angle",
-            "Average": club_df["launch_angle"].mean(),
-            "Std Dev": club_df["launch_angle"].std(),
-            "Min": club_df["launch_angle"].min(),
-            "Max": club_df["launch_angle"].max(),
-            "P25": club_df["launch_angle"].quantile(0.25),
-            "P75": club_df["launch_angle"].quantile(0.75),
+            "Average": club_df["Launch Angle"].mean(),
+            "Std Dev": club_df["Launch Angle"].std(),
+            "Min": club_df["Launch Angle"].min(),
+            "Max": club_df["Launch Angle"].max(),
+            "P25": club_df["Launch Angle"].quantile(0.25),
+            "P75": club_df["Launch Angle"].quantile(0.75),
         },
         {
             "Metric": "Spin Rate",
-            "Average": club_df["spin_rate"].mean(),
-            "Std Dev": club_df["spin_rate"].std(),
-            "Min": club_df["spin_rate"].min(),
-            "Max": club_df["spin_rate"].max(),
-            "P25": club_df["spin_rate"].quantile(0.25),
-            "P75": club_df["spin_rate"].quantile(0.75),
+            "Average": club_df["Spin Rate"].mean(),
+            "Std Dev": club_df["Spin Rate"].std(),
+            "Min": club_df["Spin Rate"].min(),
+            "Max": club_df["Spin Rate"].max(),
+            "P25": club_df["Spin Rate"].quantile(0.25),
+            "P75": club_df["Spin Rate"].quantile(0.75),
         },
     ]
     if has_offline:
         metrics.append(
             {
                 "Metric": "Offline Distance",
-                "Average": club_df["offline_distance"].mean(),
-                "Std Dev": club_df["offline_distance"].std(),
-                "Min": club_df["offline_distance"].min(),
-                "Max": club_df["offline_distance"].max(),
-                "P25": club_df["offline_distance"].quantile(0.25),
-                "P75": club_df["offline_distance"].quantile(0.75),
+                "Average": club_df["Offline"].mean(),
+                "Std Dev": club_df["Offline"].std(),
+                "Min": club_df["Offline"].min(),
+                "Max": club_df["Offline"].max(),
+                "P25": club_df["Offline"].quantile(0.25),
+                "P75": club_df["Offline"].quantile(0.75),
             }
         )
-    if "total_distance" in club_df:
+    if "Total Distance" in club_df:
         metrics.insert(
             1,
             {
                 "Metric": "Total Distance",
-                "Average": club_df["total_distance"].mean(),
-                "Std Dev": club_df["total_distance"].std(),
-                "Min": club_df["total_distance"].min(),
-                "Max": club_df["total_distance"].max(),
-                "P25": club_df["total_distance"].quantile(0.25),
-                "P75": club_df["total_distance"].quantile(0.75),
+                "Average": club_df["Total Distance"].mean(),
+                "Std Dev": club_df["Total Distance"].std(),
+                "Min": club_df["Total Distance"].min(),
+                "Max": club_df["Total Distance"].max(),
+                "P25": club_df["Total Distance"].quantile(0.25),
+                "P75": club_df["Total Distance"].quantile(0.75),
             },
         )
 
@@ -435,24 +435,24 @@ with benchmark_tab:
 
     fig_hist = px.histogram(
         club_df,
-        x="carry_distance",
+        x="Carry Distance",
         nbins=20,
         title=f"Carry Distance Distribution – {selected_club}",
-        labels={"carry_distance": "Carry Distance (yds)"},
+        labels={"Carry Distance": "Carry Distance (yds)"},
     )
     st.plotly_chart(fig_hist, use_container_width=True)
 
     if has_offline:
         fig_disp = px.scatter(
             club_df,
-            x="offline_distance",
-            y="carry_distance",
+            x="Offline",
+            y="Carry Distance",
             title=f"Dispersion Plot – {selected_club}",
             labels={
-                "offline_distance": "Offline Distance (yds)",
-                "carry_distance": "Carry Distance (yds)",
+                "Offline": "Offline Distance (yds)",
+                "Carry Distance": "Carry Distance (yds)",
             },
-            hover_data=["session_name"],
+            hover_data=["Session Name"],
         )
         fig_disp.update_traces(
             marker=dict(size=8, opacity=0.7, line=dict(width=1, color="DarkSlateGrey"))
@@ -462,21 +462,21 @@ with benchmark_tab:
         st.info("Offline distance data not available for dispersion plot.")
 
     trend = (
-        club_df.groupby("session_name")["carry_distance"].mean().reset_index()
+        club_df.groupby("Session Name", observed=True)["Carry Distance"].mean().reset_index()
     )
     if len(trend) > 1:
         fig_trend = px.line(
             trend,
-            x="session_name",
-            y="carry_distance",
+            x="Session Name",
+            y="Carry Distance",
             title=f"Carry Distance Trend – {selected_club}",
-            labels={"carry_distance": "Avg Carry (yds)", "session_name": "Session"},
+            labels={"Carry Distance": "Avg Carry (yds)", "Session Name": "Session"},
         )
         st.plotly_chart(fig_trend, use_container_width=True)
 
     st.markdown("## 🧠 Coach’s Feedback")
-    carry_std = club_df["carry_distance"].std()
-    offline_std = club_df["offline_distance"].std() if has_offline else None
+    carry_std = club_df["Carry Distance"].std()
+    offline_std = club_df["Offline"].std() if has_offline else None
     carry_thresh = st.slider(
         "Carry consistency threshold (std yds)",
         5.0,
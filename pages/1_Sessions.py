@@ -1,27 +1,47 @@
 """Session viewer and practice log consolidated into a single page."""
 
+import hashlib
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 from datetime import datetime
 
+from utils.constants import QUALITY_LABELS
 from utils.logger import logger
-from utils.page_utils import require_data
+from utils.page_utils import get_shot_store, require_data, select_sessions
 from utils.responsive import configure_page
-from utils.data_utils import classify_shots
-from utils.cache import persist_state
+from utils.cache import record_practice_entry, record_tags
 
 logger.info("📄 Page loaded: Sessions")
 configure_page()
 st.title("📋 Sessions")
 
-df_all = require_data().copy()
+# Columns shown by default in the session viewer, when present.
+VIEWER_COLUMNS = [
+    "Date",
+    "Session Name",
+    "Club",
+    "Carry Distance",
+    "Total Distance",
+    "Ball Speed",
+    "Launch Angle",
+    "Spin Rate",
+    "Offline",
+    "Quality",
+    "Quality Source",
+]
+PAGE_SIZES = [50, 100, 250, 500]
+
+df_all = require_data()
 
 viewer_tab, log_tab = st.tabs(["Viewer", "Practice Log"])
 
 with viewer_tab:
     st.subheader("Session Data")
-    session_names = df_all["Session Name"].dropna().unique().tolist()
+    store = get_shot_store()
+    session_names = store.catalog["Session Name"].dropna().tolist()
     if not session_names:
         st.info("No sessions available.")
     else:
@@ -29,30 +49,14 @@ with viewer_tab:
             "Choose sessions to display",
             ["Latest Session", "Last 5 Sessions", "Select Sessions"],
         )
-
-        if "Date" in df_all.columns:
-            df_all["Date"] = pd.to_datetime(df_all["Date"], errors="coerce")
-
-        if view_option == "Latest Session":
-            if "Date" in df_all.columns and df_all["Date"].notna().any():
-                latest_session = df_all.loc[df_all["Date"].idxmax(), "Session Name"]
-            else:
-                latest_session = session_names[-1]
-            df_view = df_all[df_all["Session Name"] == latest_session]
-        elif view_option == "Last 5 Sessions":
-            if "Date" in df_all.columns and df_all["Date"].notna().any():
-                session_order = (
-                    df_all.drop_duplicates("Session Name").sort_values("Date")
-                )["Session Name"].tolist()
-            else:
-                session_order = session_names
-            last_sessions = session_order[-5:]
-            df_view = df_all[df_all["Session Name"].isin(last_sessions)]
-        else:  # Select Sessions
-            chosen = st.multiselect("Select session(s)", session_names)
-            df_view = (
-                df_all[df_all["Session Name"].isin(chosen)] if chosen else df_all.iloc[0:0]
-            )
+        chosen = (
+            st.multiselect("Select session(s)", session_names)
+            if view_option == "Select Sessions"
+            else ()
+        )
+        # The catalog resolves the choice to sessions, which are sliced out
+        # by position without scanning the other shots.
+        df_view = df_all.iloc[store.positions(select_sessions(view_option, chosen))]
         exclude_sessions = st.multiselect(
             "Exclude sessions from analysis",
             session_names,
@@ -60,45 +64,131 @@ with viewer_tab:
         )
         st.session_state["exclude_sessions"] = exclude_sessions
 
-        df_view = classify_shots(df_view)
         df_view = df_view.reset_index().rename(columns={"index": "_idx"})
 
         bulk_tag = st.selectbox(
             "Bulk set quality for all visible shots",
-            ["", "good", "miss", "outlier"],
+            ["", *QUALITY_LABELS],
         )
         if st.button("Apply tag") and bulk_tag:
+            # Only shots whose label actually changes are tagged and journalled.
+            targets = df_view["_idx"][df_view["Quality"].ne(bulk_tag).to_numpy()]
+            changed = dict.fromkeys(store.shot_ids(targets), bulk_tag)
+            if changed:
+                store.tag(changed)
+                record_tags(changed)
+                st.session_state["tag_editor_version"] = (
+                    st.session_state.get("tag_editor_version", 0) + 1
+                )
             df_view["Quality"] = bulk_tag
 
-        edited = st.data_editor(
-            df_view,
+        # Only one page of the selection is sent to the browser; filtering,
+        # sorting and column projection happen here.
+        columns = [c for c in df_view.columns if c != "_idx"]
+        ctrl = st.columns(4)
+        shown_cols = ctrl[0].multiselect(
+            "Columns",
+            columns,
+            [c for c in VIEWER_COLUMNS if c in columns] or columns,
+        )
+        shown_quality = ctrl[1].multiselect("Quality", QUALITY_LABELS, QUALITY_LABELS)
+        sort_col = ctrl[2].selectbox("Sort by", ["(upload order)", *shown_cols])
+        descending = ctrl[3].checkbox("Descending")
+
+        positions = np.flatnonzero(df_view["Quality"].isin(shown_quality).to_numpy())
+        if sort_col in df_view.columns:
+            order = (
+                df_view[sort_col]
+                .iloc[positions]
+                .reset_index(drop=True)
+                .sort_values(ascending=not descending, kind="stable", na_position="last")
+                .index.to_numpy()
+            )
+            positions = positions[order]
+        page_size = ctrl[0].selectbox("Rows per page", PAGE_SIZES, index=1)
+        n_pages = max(1, -(-len(positions) // page_size))
+        page = int(
+            ctrl[1].number_input("Page", min_value=1, max_value=n_pages, value=1)
+        )
+        ctrl[2].caption(f"{len(positions)} shots, {n_pages} page(s)")
+        page_positions = positions[(page - 1) * page_size : page * page_size]
+        # Quality is always shown since it is the editable column.
+        page_cols = ["_idx", *shown_cols]
+        if "Quality" not in page_cols:
+            page_cols.append("Quality")
+        page_df = df_view.iloc[page_positions][page_cols]
+
+        # Edits are keyed by row position within the page, so the editor state
+        # is tied to the rows and columns shown and starts afresh on another
+        # page.  The version is bumped once edits reach the store, which
+        # clears them from the editor.
+        editor_key = "tag_editor_{}_{}".format(
+            hashlib.blake2b(
+                repr((page_df["_idx"].tolist(), shown_cols)).encode(), digest_size=8
+            ).hexdigest(),
+            st.session_state.get("tag_editor_version", 0),
+        )
+        st.caption(
+            "Automatic labels are set when a session is uploaded, against the "
+            "shot history at that time, and are not updated by later uploads. "
+            "Edit a shot's Quality to override its label."
+        )
+        st.data_editor(
+            page_df,
             hide_index=True,
-            key="tag_editor",
+            key=editor_key,
+            disabled=[c for c in page_df.columns if c != "Quality"],
             column_config={
                 "Quality": st.column_config.SelectboxColumn(
-                    "Quality", options=["good", "miss", "outlier"], default="good"
+                    "Quality", options=QUALITY_LABELS, default="good"
                 )
             },
         )
-        if "shot_tags" not in st.session_state:
-            st.session_state["shot_tags"] = {}
-        for _, row in edited.iterrows():
-            st.session_state["shot_tags"][row["_idx"]] = row.get("Quality", "good")
-        persist_state()
+        # The editor reports its edits as {row position: {column: value}};
+        # only those rows are compared with the stored labels.
+        edited_rows = st.session_state.get(editor_key, {}).get("edited_rows", {})
+        edits = {
+            int(pos): row["Quality"]
+            for pos, row in edited_rows.items()
+            if row.get("Quality") is not None and int(pos) < len(page_positions)
+        }
+        if edits:
+            rows = page_positions[list(edits)]
+            current = df_view["Quality"].iloc[rows].astype(object).tolist()
+            changed = {
+                shot: label
+                for shot, label, old in zip(
+                    store.shot_ids(df_view["_idx"].iloc[rows]), edits.values(), current
+                )
+                if label != old
+            }
+            if changed:
+                # Tags update the stored labels in place; only the changed
+                # tags are journalled.
+                store.tag(changed)
+                record_tags(changed)
+                st.session_state["tag_editor_version"] = (
+                    st.session_state.get("tag_editor_version", 0) + 1
+                )
+                st.rerun()
+            quality = df_view["Quality"].astype(object).to_numpy()
+            quality[rows] = list(edits.values())
+            df_view["Quality"] = quality
 
-        if edited.empty:
+        # Summary metrics cover the whole selection, not just the page.
+        if df_view.empty:
             st.info("No sessions selected.")
         else:
-            total_shots = len(edited)
-            good_pct = (edited["Quality"] == "good").mean() * 100
+            quality_counts = df_view["Quality"].value_counts()
             cols = st.columns(3)
-            cols[0].metric("Shots", total_shots)
-            cols[1].metric("Good %", f"{good_pct:.0f}%")
-            if "Carry Distance" in edited.columns:
+            cols[0].metric("Shots", len(df_view))
+            cols[1].metric(
+                "Good %", f"{quality_counts.get('good', 0) / len(df_view) * 100:.0f}%"
+            )
+            if "Carry Distance" in df_view.columns:
                 cols[2].metric(
-                    "Avg Carry", f"{edited['Carry Distance'].mean():.1f} yds"
+                    "Avg Carry", f"{df_view['Carry Distance'].mean():.1f} yds"
                 )
-            quality_counts = edited["Quality"].value_counts()
             st.bar_chart(quality_counts)
 
 with log_tab:
@@ -115,11 +205,10 @@ with log_tab:
         notes = st.text_area("Session Notes or Drills")
         submitted = st.form_submit_button("Add to Log")
         if submitted:
-            st.session_state.practice_log.append(
-                {"Date": date.strftime("%Y-%m-%d"), "Focus": focus_area, "Notes": notes}
-            )
+            entry = {"Date": date.strftime("%Y-%m-%d"), "Focus": focus_area, "Notes": notes}
+            st.session_state.practice_log.append(entry)
             st.success("✅ Entry added.")
-            persist_state()
+            record_practice_entry(entry)
 
     if st.session_state.practice_log:
         st.markdown("### 📅 Your Practice History")
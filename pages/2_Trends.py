@@ -6,27 +6,22 @@ import streamlit as st
 
 from utils.page_utils import require_data
 from utils.responsive import configure_page
-from utils.data_utils import classify_shots
 
 configure_page()
 st.title("📉 Trends")
 
-df = require_data().copy()
+df = require_data()
 if df.empty:
     st.info("Upload session data to view trends.")
     st.stop()
 
-if "Date" in df.columns:
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-
-df = classify_shots(df)
 use_quality = st.checkbox(
     "Include only 'good' shots",
     value=True,
     help="Keep shots labelled as 'good' and ignore ones tagged 'miss' or 'outlier'",
 )
-if use_quality and "Quality" in df.columns:
-    df = df[df["Quality"] == "good"]
+if use_quality:
+    df = df[df["Quality"].eq("good")]
 
 if df.empty:
     st.info("No data available after filtering.")
@@ -39,7 +34,9 @@ metric_options = [
 ]
 metric = st.selectbox("Metric", metric_options, index=0)
 
-summary = df.groupby(["Session Name", "Club"])[metric].mean().reset_index()
+summary = (
+    df.groupby(["Session Name", "Club"], observed=True)[metric].mean().reset_index()
+)
 
 club_options = sorted(summary["Club"].dropna().unique())
 if not club_options:
@@ -7,11 +7,10 @@ import streamlit as st
 import pandas as pd
 
 from utils.logger import logger
-from utils.data_utils import coerce_numeric
 from utils.ai_feedback import generate_ai_summary, generate_ai_batch_summaries
 from utils.practice_ai import analyze_practice_session
 from utils.drill_recommendations import recommend_drills
-from utils.page_utils import require_data
+from utils.page_utils import get_club_stats, get_shot_store, require_data
 from utils.responsive import configure_page
 
 logger.info("📄 Page loaded: AI Feedback")
@@ -39,18 +38,8 @@ def _save_ai_cache(cache: dict) -> None:
 
 ai_cache = _load_ai_cache()
 
-df = require_data().copy()
-for col in [
-    "Carry Distance",
-    "Carry",
-    "Smash Factor",
-    "Launch Angle",
-    "Backspin",
-    "Spin Rate",
-    "Offline",
-]:
-    if col in df.columns:
-        df[col] = coerce_numeric(df[col])
+# Numeric columns are parsed into floats once at ingest by the session loader.
+df = require_data()
 
 uploaded_sessions = st.session_state.get("uploaded_sessions", [])
 if set(st.session_state.get("ai_sessions_snapshot", [])) != set(uploaded_sessions):
@@ -61,12 +50,16 @@ if set(st.session_state.get("ai_sessions_snapshot", [])) != set(uploaded_session
             del st.session_state[key]
     st.session_state["ai_sessions_snapshot"] = uploaded_sessions
 
-drill_map = recommend_drills(df)
+# Per-club statistics shared by the drills and the AI summaries.
+club_stats = get_club_stats()
+drill_map = recommend_drills(club_stats=club_stats)
 
 insight_tab, session_tab = st.tabs(["Club Insight", "Practice Summary"])
 
 with insight_tab:
-    club_list = sorted(df["Club"].dropna().unique())
+    # Per-club row positions, built once per set of sessions.
+    club_index = get_shot_store().club_index
+    club_list = sorted(club_index.clubs)
     if not club_list:
         st.info("No club data available.")
     else:
@@ -75,9 +68,8 @@ with insight_tab:
 
         def _run_club_summary():
             with st.spinner("Generating AI summary..."):
-                sampled = df[df["Club"] == selected_club].sample(
-                    n=min(25, len(df[df["Club"] == selected_club])), random_state=42
-                )
+                club_shots = club_index.rows(df, selected_club)
+                sampled = club_shots.sample(n=min(25, len(club_shots)), random_state=42)
                 summary, stats = generate_ai_summary(selected_club, sampled)
                 st.session_state[f"ai_{selected_club}"] = {
                     "summary": summary,
@@ -120,7 +112,7 @@ with session_tab:
     if st.button("Generate Practice Summary"):
         with st.spinner("Analyzing practice session..."):
             base_stats = analyze_practice_session(df, with_summary=False)
-            summaries = generate_ai_batch_summaries(df)
+            summaries = generate_ai_batch_summaries(df, club_stats)
             for entry in base_stats:
                 club = entry["club"]
                 if club in summaries:
@@ -0,0 +1,239 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+from utils import cache
+from utils.data_utils import compact_frame
+from utils.shot_store import ShotStore
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "session_cache"
+    monkeypatch.setattr(cache, "CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(cache, "MANIFEST_PATH", str(cache_dir / "manifest.json"))
+    monkeypatch.setattr(cache, "SEGMENT_DIR", str(cache_dir / "segments"))
+    monkeypatch.setattr(cache, "JOURNAL_PATH", str(cache_dir / "journal.jsonl"))
+    monkeypatch.setattr(cache, "LEGACY_CACHE_PATH", str(tmp_path / "session_cache.json"))
+    monkeypatch.setattr(cache, "PERSIST_DEBOUNCE_SECONDS", 0.01)
+    monkeypatch.setattr(cache, "_journal_records", 0)
+    session_state = {}
+    monkeypatch.setattr(st, "session_state", session_state)
+    yield session_state
+    # Let the writer finish before the patched paths are restored.
+    cache.flush()
+
+
+def _session(sid: str, name: str, carries: list[float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Date": pd.to_datetime(["2025-08-01 10:00"] * len(carries)),
+            "Club": ["7 Iron"] * len(carries),
+            "Carry Distance": carries,
+            "Session Name": name,
+            "Session ID": sid,
+        }
+    )
+
+
+def test_persist_round_trips_segments_and_metadata(state):
+    store = ShotStore([_session("a", "S1", [150.0, 152.0]), _session("b", "S2", [149.0])])
+    store.drop("a")
+    store.append(_session("c", "S3", [155.0]))
+    store.tag({"b:0": "miss"})
+    state.update(
+        shot_store=store,
+        uploaded_sessions=["S2", "S3"],
+        practice_log=[{"Date": "2025-08-01", "Focus": "Driving", "Notes": ""}],
+    )
+    cache.persist_state()
+    cache.flush()
+
+    restored = cache.load_persisted_state()
+    assert restored["sessions"] == ["S2", "S3"]
+    assert restored["shot_tags"] == {"b:0": "miss"}
+    new_store = restored["store"]
+    assert restored["sketches"].stats("Carry Distance").count == 2
+    assert not new_store.is_loaded("b")
+    assert len(new_store) == 2
+    # Segments are read back in the compact layout.
+    pd.testing.assert_frame_equal(new_store.frame(), compact_frame(store.frame()))
+    new_store.append(_session("d", "S4", [140.0]))
+    assert new_store.frame().index.tolist() == [2, 3, 4]
+
+
+def test_automatic_quality_labels_survive_a_reload(state):
+    store = ShotStore([_session("a", "S1", [150.0, 151.0, 190.0]), _session("b", "S2", [1.0])])
+    store.set_quality("a", pd.Series(["good", "miss", "outlier"], index=[0, 1, 2]))
+    state["shot_store"] = store
+    cache.persist_state()
+    cache.flush()
+
+    restored = cache.load_persisted_state()["store"]
+    assert restored.unclassified() == ["b"]
+    assert restored.quality_codes("a").tolist() == store.quality_codes("a").tolist()
+    assert not restored.is_loaded("a")
+    assert restored.frame()["Quality"].tolist()[:3] == ["good", "miss", "outlier"]
+
+
+def test_persist_only_writes_new_segments(state):
+    store = ShotStore([_session("a", "S1", [150.0])])
+    state["shot_store"] = store
+    cache.persist_state()
+    cache.flush()
+    seg_a = os.path.join(cache.SEGMENT_DIR, "a.parquet")
+    mtime = os.stat(seg_a).st_mtime_ns
+
+    store.append(_session("b", "S2", [151.0]))
+    cache.persist_state()
+    cache.flush()
+    assert os.stat(seg_a).st_mtime_ns == mtime
+    assert sorted(os.listdir(cache.SEGMENT_DIR)) == [
+        "a.parquet",
+        "a.sketch.parquet",
+        "b.parquet",
+        "b.sketch.parquet",
+    ]
+
+    store.drop("a")
+    cache.persist_state()
+    cache.flush()
+    assert sorted(os.listdir(cache.SEGMENT_DIR)) == ["b.parquet", "b.sketch.parquet"]
+
+
+def test_legacy_json_cache_is_migrated(state):
+    import json
+
+    df = _session("a", "S1", [150.0])
+    with open(cache.LEGACY_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"sessions": ["S1"], "df": df.to_json(orient="split")}, f)
+
+    restored = cache.load_persisted_state()
+    assert restored["store"].frame()["Carry Distance"].tolist() == [150.0]
+    assert restored["store"].frame()["Date"].dtype == "datetime64[ns]"
+    assert restored["store"].frame()["Carry Distance"].dtype == "float32"
+    assert isinstance(restored["store"].frame()["Club"].dtype, pd.CategoricalDtype)
+
+    state["shot_store"] = restored["store"]
+    cache.persist_state()
+    cache.flush()
+    assert not os.path.exists(cache.LEGACY_CACHE_PATH)
+    assert cache.load_persisted_state()["store"].session_ids == ["a"]
+
+
+def test_load_without_cache_returns_none(state):
+    assert cache.load_persisted_state() is None
+
+
+def test_journal_replays_tags_and_log_entries(state):
+    store = ShotStore([_session("a", "S1", [150.0, 151.0])])
+    store.tag({"a:0": "good"})
+    state["shot_store"] = store
+    cache.persist_state()
+    cache.flush()
+    manifest_mtime = os.stat(cache.MANIFEST_PATH).st_mtime_ns
+
+    cache.record_tags({"a:1": "miss"})
+    cache.record_tags({"a:0": "outlier"})
+    cache.record_practice_entry({"Date": "2025-08-02", "Focus": "Putting", "Notes": ""})
+    cache.flush()
+    assert os.stat(cache.MANIFEST_PATH).st_mtime_ns == manifest_mtime
+
+    restored = cache.load_persisted_state()
+    assert restored["shot_tags"] == {"a:0": "outlier", "a:1": "miss"}
+    assert restored["practice_log"][-1]["Focus"] == "Putting"
+
+
+def test_legacy_index_label_tags_are_keyed_by_shot_id(state):
+    import json
+
+    df = pd.concat([_session("a", "S1", [150.0]), _session("b", "S2", [149.0, 148.0])])
+    df = df.reset_index(drop=True)
+    with open(cache.LEGACY_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "sessions": ["S1", "S2"],
+                "df": df.to_json(orient="split"),
+                "shot_tags": {"2": "miss", "7": "miss"},
+            },
+            f,
+        )
+    restored = cache.load_persisted_state()
+    assert restored["shot_tags"] == {"b:1": "miss"}
+
+
+def test_journal_ignores_torn_record(state):
+    state["shot_store"] = ShotStore([_session("a", "S1", [150.0])])
+    cache.persist_state()
+    cache.flush()
+    cache.record_tags({"a:0": "miss"})
+    cache.flush()
+    with open(cache.JOURNAL_PATH, "a", encoding="utf-8") as f:
+        f.write('{"op": "tag", "sh')
+    assert cache.load_persisted_state()["shot_tags"] == {"a:0": "miss"}
+
+
+def test_journal_is_compacted_into_manifest(state, monkeypatch):
+    monkeypatch.setattr(cache, "JOURNAL_COMPACT_THRESHOLD", 3)
+    store = ShotStore([_session("a", "S1", [150.0, 151.0, 152.0])])
+    state["shot_store"] = store
+    cache.persist_state()
+    cache.flush()
+    for row in range(3):
+        store.tag({f"a:{row}": "miss"})
+        cache.record_tags({f"a:{row}": "miss"})
+    cache.flush()
+    assert not os.path.exists(cache.JOURNAL_PATH)
+    assert cache.load_persisted_state()["shot_tags"] == {
+        "a:0": "miss",
+        "a:1": "miss",
+        "a:2": "miss",
+    }
+
+
+def test_writes_are_coalesced_in_background(state, monkeypatch):
+    writes = []
+    monkeypatch.setattr(cache, "PERSIST_DEBOUNCE_SECONDS", 60)
+    monkeypatch.setattr(cache, "_write_snapshot", lambda snap: writes.append(("snapshot", snap)))
+    monkeypatch.setattr(cache, "_write_journal", lambda recs: writes.append(("journal", recs)))
+    store = ShotStore([_session("a", "S1", [150.0])])
+    state["shot_store"] = store
+
+    cache.record_tags({"a:0": "miss"})
+    cache.persist_state()
+    store.tag({"a:0": "good"})
+    cache.persist_state()
+    cache.record_tags({"a:0": "outlier"})
+    cache.record_practice_entry({"Date": "2025-08-02", "Focus": "Putting", "Notes": ""})
+    assert writes == []
+
+    assert cache.flush(timeout=5)
+    assert [kind for kind, _ in writes] == ["snapshot", "journal"]
+    assert writes[0][1]["shot_tags"] == {"a:0": "good"}
+    assert len(writes[1][1]) == 2
+
+
+def test_writer_survives_unexpected_errors(state, monkeypatch):
+    writes = []
+
+    def _write_journal(records):
+        if not writes:
+            writes.append("failed")
+            raise RuntimeError("disk on fire")
+        writes.append(records)
+
+    monkeypatch.setattr(cache, "PERSIST_DEBOUNCE_SECONDS", 60)
+    monkeypatch.setattr(cache, "_write_journal", _write_journal)
+    cache.record_tags({"a:0": "miss"})
+    assert cache.flush(timeout=5)
+    assert writes == ["failed"]
+
+    # The served flush does not carry over: the next batch is debounced.
+    cache.record_tags({"a:0": "good"})
+    time.sleep(0.2)
+    assert writes == ["failed"]
+    assert cache.flush(timeout=5)
+    assert writes[1] == [{"op": "tag", "shot": "a:0", "quality": "good"}]
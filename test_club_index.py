@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.club_index import ClubIndex
+from utils.shot_store import ShotStore
+
+
+def test_positions_group_shots_by_club_in_frame_order():
+    df = pd.DataFrame(
+        {
+            "Club": pd.Categorical(["Driver", "7 Iron", None, "Driver", "7 Iron", "Driver"]),
+            "Carry Distance": [230, 150, 140, 232, 151, 228],
+        },
+        index=[10, 11, 12, 13, 14, 15],
+    )
+    index = ClubIndex.from_frame(df)
+    assert index.clubs == df["Club"].dropna().unique().tolist()
+    assert index.positions("Driver").tolist() == [0, 3, 5]
+    assert index.count("7 Iron") == 2
+    assert index.positions("Wedge").tolist() == []
+    pd.testing.assert_frame_equal(index.rows(df, "7 Iron"), df[df["Club"] == "7 Iron"])
+    assert {club: len(rows) for club, rows in index.groups(df)} == {"Driver": 3, "7 Iron": 2}
+    with pytest.raises(ValueError):
+        index.rows(df.iloc[:2], "Driver")
+
+
+def test_store_club_index_is_built_once_per_dataset():
+    seg = pd.DataFrame({"Session ID": "a", "Club": ["Driver", "PW"], "Carry Distance": [230, 110]})
+    store = ShotStore([seg])
+    index = store.club_index
+    store.set_quality("a", pd.Series(["good", "miss"], index=[0, 1]))
+    assert store.club_index is index
+    store.append(seg.assign(**{"Session ID": "b"}))
+    assert store.club_index is not index
+    assert np.array_equal(store.club_index.positions("PW"), [1, 3])
+    assert ClubIndex.from_frame(pd.DataFrame({"x": [1]})).clubs == []
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from utils.benchmarks import check_benchmark
+from utils.club_stats import ClubStats
+from utils.drill_recommendations import recommend_drills
+
+
+def _shots():
+    return pd.DataFrame(
+        {
+            "Club Type": ["7 Iron", "Driver", "7 Iron", None, "Driver", "7 Iron"],
+            "Carry Distance": [150, 230, 152, 1, np.nan, 148],
+            "Offline": [3, -2, -1, 0, 5, np.nan],
+            "Smash Factor": [1.1, 1.45, np.nan, 1.0, 1.6, 1.3],
+        }
+    )
+
+
+def test_club_stats_match_per_club_pandas_aggregates():
+    df = _shots()
+    stats = ClubStats.from_frame(df)
+    assert stats.clubs == ["7 Iron", "Driver"]
+    assert stats.metrics == ["Carry Distance", "Offline", "Smash Factor"]
+    assert stats.count("7 Iron") == 3 and stats.count("Putter") == 0
+    iron = df[df["Club Type"] == "7 Iron"]
+    carry = iron["Carry Distance"]
+    assert stats.get("7 Iron", "Carry Distance") == carry.mean()
+    assert stats.get("7 Iron", "Carry Distance", "p75") == carry.quantile(0.75)
+    assert np.isclose(stats.std("7 Iron", "Carry Distance", ddof=0), carry.std(ddof=0))
+    assert stats.std("Driver", "Carry Distance", ddof=0) == 0.0
+    assert np.isnan(stats.get("Driver", "Carry Distance", "std"))
+    # Bias is a share of all shots, strike rates of measured strikes only.
+    assert np.isclose(stats.get("7 Iron", "Offline", "left_bias"), 100 / 3)
+    assert stats.get("7 Iron", "Smash Factor", "fat_rate") == 0.5
+    assert np.isnan(stats.get("7 Iron", "Launch Angle"))
+    assert ClubStats.from_frame(df.drop(columns="Club Type")).clubs == []
+
+
+def test_utilities_accept_shared_club_stats():
+    df = _shots()
+    stats = ClubStats.from_frame(df)
+    assert recommend_drills(club_stats=stats).keys() == recommend_drills(df).keys()
+    assert check_benchmark("7 Iron", stats) == check_benchmark(
+        "7 Iron", {"Carry": 150.0, "Smash Factor": 1.2}
+    )
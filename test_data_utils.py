@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 import pytest
-from utils.data_utils import remove_outliers, derive_offline_distance, classify_shots
+from utils.data_utils import remove_outliers, classify_shots, shot_quality
+from utils.data_utils import _grouped_robust_stats, apply_shot_schema, normalize_columns
 
 def test_remove_outliers_drops_extreme_values():
     df = pd.DataFrame({'Metric': [1, 2, 3, 100]})
@@ -53,6 +55,53 @@ def test_remove_outliers_isolation_forest():
     assert 50 not in filtered['Metric'].values
 
 
+def test_isolation_scores_are_reused_across_contamination(monkeypatch):
+    sklearn = pytest.importorskip("sklearn.ensemble")
+    from utils import data_utils
+
+    fits = []
+
+    class CountingForest(sklearn.IsolationForest):
+        def fit(self, X, y=None, sample_weight=None):
+            fits.append(len(X))
+            return super().fit(X, y, sample_weight)
+
+    monkeypatch.setattr(data_utils, "IsolationForest", CountingForest)
+    monkeypatch.setattr(data_utils, "_isolation_scores", data_utils.OrderedDict())
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Club': ['Driver'] * 40 + ['Wedge'] * 30,
+        'carry': np.concatenate([rng.normal(230, 8, 40), rng.normal(90, 4, 30)]),
+    })
+    for contamination in (0.05, 0.2, 'auto'):
+        filtered = remove_outliers(df, ['carry'], method='isolation', contamination=contamination)
+        expected = []
+        for _, club_df in df.groupby('Club'):
+            model = sklearn.IsolationForest(contamination=contamination, random_state=0)
+            expected.extend(club_df.index[model.fit_predict(club_df[['carry']]) == 1])
+        assert sorted(filtered.index) == sorted(expected)
+    assert sorted(fits) == [30, 40]
+
+
+def test_remove_outliers_robust_catches_joint_anomaly():
+    rng = np.random.default_rng(0)
+    carry = rng.normal(150, 10, 200)
+    df = pd.DataFrame({'Club': '7 Iron', 'carry': carry, 'spin': carry * 40 + rng.normal(0, 150, 200)})
+    # Typical carry and typical spin on their own, but not together.
+    df.loc[0, ['carry', 'spin']] = [140, 6400]
+    df.loc[1, 'spin'] = np.nan
+    assert 0 in remove_outliers(df, ['carry', 'spin']).index
+    filtered = remove_outliers(df, ['carry', 'spin'], method='robust')
+    assert 0 not in filtered.index
+    assert 1 in filtered.index
+    assert len(filtered) >= 190
+
+
+def test_remove_outliers_robust_keeps_small_clubs():
+    df = pd.DataFrame({'Club': ['Driver'] * 4, 'carry': [230, 240, 235, 400], 'spin': [2500, 2400, 2600, 2500]})
+    assert len(remove_outliers(df, ['carry', 'spin'], method='robust')) == 4
+
+
 def test_remove_outliers_iqr_multiplier():
     df = pd.DataFrame({'Metric': [1, 1, 1, 2, 100]})
     tight = remove_outliers(df, ['Metric'], z_thresh=3.0, iqr_mult=1.0)
@@ -61,18 +110,36 @@ def test_remove_outliers_iqr_multiplier():
     assert 100 in loose['Metric'].values
 
 
-def test_derive_offline_distance_from_side():
-    df = pd.DataFrame({"Side Distance": [5, -3]})
-    result = derive_offline_distance(df)
-    assert "Offline" in result.columns
-    assert result["Offline"].tolist() == [5, -3]
+def test_grouped_robust_stats_match_pandas():
+    rng = np.random.default_rng(0)
+    values = np.round(rng.normal(150, 20, 500))
+    values[rng.random(500) < 0.1] = np.nan
+    codes = rng.integers(-1, 6, 500)
+    median, mad, q1, q3 = _grouped_robust_stats(values, codes, 7)
 
+    s = pd.Series(values)[codes >= 0]
+    grouped = s.groupby(codes[codes >= 0])
+    expected_median = grouped.median().reindex(range(7))
+    expected_mad = (s - grouped.transform("median")).abs().groupby(codes[codes >= 0]).median()
+    np.testing.assert_array_equal(median, expected_median.to_numpy())
+    np.testing.assert_array_equal(mad, expected_mad.reindex(range(7)).to_numpy())
+    np.testing.assert_array_equal(q1, grouped.quantile(0.25).reindex(range(7)).to_numpy())
+    np.testing.assert_array_equal(q3, grouped.quantile(0.75).reindex(range(7)).to_numpy())
+    # Group 6 never occurs.
+    assert np.isnan(median[6])
 
-def test_derive_offline_distance_from_side_column():
-    df = pd.DataFrame({"Side": [4, -2]})
-    result = derive_offline_distance(df)
-    assert "Offline" in result.columns
-    assert result["Offline"].tolist() == [4, -2]
+
+def test_remove_outliers_drops_rows_without_club():
+    df = pd.DataFrame({'Club': ['7 Iron', '7 Iron', None, '7 Iron'], 'carry': [150, 151, 150, None]})
+    filtered = remove_outliers(df, ['carry'])
+    assert filtered.index.tolist() == [0, 1, 3]
+
+
+@pytest.mark.parametrize("alias", ["Side Distance", "Side"])
+def test_side_columns_become_offline(alias):
+    result = normalize_columns(pd.DataFrame({alias: [5, -3]}))
+    assert list(result.columns) == ["Offline"]
+    assert result["Offline"].tolist() == [5, -3]
 
 
 def test_classify_shots_labels_quality():
@@ -82,3 +149,28 @@ def test_classify_shots_labels_quality():
     })
     result = classify_shots(df)
     assert result['Quality'].tolist() == ['good', 'outlier', 'good']
+
+
+def test_shot_quality_uses_per_club_statistics():
+    df = pd.DataFrame({
+        'Club': ['Driver'] * 5 + ['Wedge'] * 5,
+        'Carry Distance': [230, 232, 228, 231, 229, 90, 92, 88, 91, 60],
+    })
+    quality = shot_quality(df)
+    assert isinstance(quality.dtype, pd.CategoricalDtype)
+    assert list(quality.cat.categories) == ['good', 'miss', 'outlier']
+    # A global median would put every shot of both clubs far from "typical".
+    assert quality.tolist() == ['good'] * 9 + ['outlier']
+
+
+def test_normalize_columns_renames_aliases_once():
+    df = pd.DataFrame({
+        'Club Type': ['Driver'], 'Club Name': ['Big Dog'], 'Backspin': ['2500'],
+        'Side': [3], 'Offline Distance': [4],
+    })
+    result = apply_shot_schema(df)
+    # The first alias present wins; the others are left alone.
+    assert list(result.columns) == ['Club Type', 'Club', 'Spin Rate', 'Side', 'Offline']
+    assert result['Club'].tolist() == ['Big Dog']
+    assert result['Spin Rate'].dtype == 'float64'
+    assert normalize_columns(result) is result
@@ -87,3 +87,17 @@ def test_duplicate_club_type_columns_are_handled():
     recs = recommend_drills(df_dup)
     issues = [r.issue for r in recs['Driver']]
     assert "Low smash factor" in issues
+
+
+def test_custom_club_name_uses_club_type_benchmark():
+    df = pd.DataFrame({
+        'Club Name': ['My Big Stick', 'My Big Stick'],
+        'Club Type': ['Driver', 'Driver'],
+        'Carry Distance': [230, 232],
+        'Smash Factor': [1.40, 1.46],
+        'Launch Angle': [22, 23],
+    })
+    recs = recommend_drills(df)
+    issues = [r.issue for r in recs['My Big Stick']]
+    assert "Low smash factor" in issues
+    assert "Poor launch angle" in issues
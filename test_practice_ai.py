@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from utils.practice_ai import analyze_club_stats, analyze_practice_session
 
@@ -54,3 +55,30 @@ def test_analyze_practice_session_skips_clubs_with_few_shots():
     results = analyze_practice_session(df)
     clubs = [r["club"] for r in results]
     assert "7 Iron" in clubs and "Driver" not in clubs
+
+
+def test_analyze_practice_session_matches_per_club_analysis():
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame({
+        "Club": rng.choice(["Driver", "7 Iron", "PW", "Putter"], n, p=[0.4, 0.4, 0.18, 0.02]),
+        "Carry Distance": rng.normal(150, 25, n),
+        "Smash Factor": rng.normal(1.25, 0.12, n),
+        "Launch Angle": rng.normal(15, 6, n),
+        "Offline": rng.normal(-4, 12, n),
+    })
+    df.loc[:5, "Carry Distance"] = 400
+    for filter_outliers in (True, False):
+        batch = analyze_practice_session(df, filter_outliers=filter_outliers, with_summary=False)
+        expected = [
+            analyze_club_stats(df, club, filter_outliers=filter_outliers, with_summary=False)
+            for club in df["Club"].unique()
+        ]
+        expected = [r for r in expected if r is not None]
+        assert [r["club"] for r in batch] == [r["club"] for r in expected]
+        for got, want in zip(batch, expected):
+            assert got["issues"] == want["issues"]
+            np.testing.assert_allclose(
+                [got["avg_carry"], got["avg_offline"], got["max_good_carry"]],
+                [want["avg_carry"], want["avg_offline"], want["max_good_carry"]],
+            )
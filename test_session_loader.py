@@ -1,7 +1,20 @@
+import gzip
 import io
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import pandas as pd
+import pytest
+
+from utils import session_loader
+from utils.session_loader import file_digest, load_archive, load_sessions
+
 
-from utils.session_loader import load_sessions
+@pytest.fixture(autouse=True)
+def _isolated_parse_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_loader, "PARSE_CACHE_DIR", str(tmp_path / "parse_cache"))
 
 
 def _make_file(content: str, name: str):
@@ -38,3 +51,190 @@ def test_load_sessions_club_fallback():
     df = load_sessions([f])
     assert "Club" in df.columns
     assert df.loc[0, "Club"] == "Driver"
+
+
+def test_load_sessions_parses_schema_columns_once():
+    """Known columns arrive in their declared dtypes.
+
+    Unit rows such as ``[yds]`` are kept, with their values coerced to NaN.
+    """
+
+    f = _make_file(
+        "Date,Club Type,Carry Distance,Backspin\n"
+        ",,[yds],[rpm]\n"
+        "2025-08-01 10:00:00,Driver,230,2500\n"
+        "2025-08-01 10:01,Driver,232.5,\n",
+        "units.csv",
+    )
+    df = load_sessions([f])
+    # Metrics are stored as float32 and text columns as categoricals.
+    assert df["Carry Distance"].dtype == "float32"
+    # Aliases are renamed to the canonical columns at ingest.
+    assert df["Spin Rate"].dtype == "float32"
+    assert "Backspin" not in df.columns and "Club Type" not in df.columns
+    assert df["Date"].dtype == "datetime64[ns]"
+    assert df["Club"].dtype == "category"
+    assert df["Session ID"].dtype == "category"
+    assert df[["Date", "Carry Distance", "Spin Rate"]].iloc[0].isna().all()
+    assert df["Carry Distance"].tolist()[1:] == [230.0, 232.5]
+    assert df["Session Name"].iloc[0] == "2025-08-01 Session 1"
+
+
+def test_load_sessions_replaces_undecodable_bytes():
+    buf = io.BytesIO(b"Date,Club Type\n2025-08-01 10:00,Dr\xffiver\n")
+    buf.name = "latin.csv"
+    df = load_sessions([buf])
+    assert df.loc[0, "Club"] == "Dr�iver"
+
+
+def test_file_digest_ignores_name_and_rewinds():
+    a = _make_file("Date,Club\n2025-08-01 10:00,Driver\n", "a.csv")
+    b = _make_file("Date,Club\n2025-08-01 10:00,Driver\n", "copy of a.csv")
+    c = _make_file("Date,Club\n2025-08-01 10:00,7 Iron\n", "a.csv")
+    assert file_digest(a) == file_digest(b)
+    assert file_digest(a) != file_digest(c)
+    assert a.tell() == 0
+
+
+def test_load_sessions_reuses_parse_cache(monkeypatch):
+    content = "Date,Club Type,Carry Distance\n2025-08-01 10:00,Driver,230\n"
+    first = load_sessions([_make_file(content, "a.csv")])
+
+    def _fail(file):
+        raise AssertionError("cached file was parsed again")
+
+    monkeypatch.setattr(session_loader, "_parse_file", _fail)
+    again = load_sessions([_make_file(content, "renamed.csv")])
+    assert again["Source Hash"].iloc[0] == first["Source Hash"].iloc[0]
+    assert again["Source File"].iloc[0] == "renamed.csv"
+    assert again["Carry Distance"].tolist() == [230.0]
+
+
+def test_process_backend_matches_thread_backend(tmp_path, monkeypatch):
+    contents = [
+        ("late.csv", "Date,Club Type,Carry Distance\n2025-08-01 15:00,Driver,230\n"),
+        ("early.csv", "Date,Club Type,Carry Distance\n2025-08-01 09:00,7 Iron,150\n"),
+        ("next.csv", "Date,Club Type,Carry Distance\n2025-08-02 09:00,PW,110\n"),
+    ]
+    threaded = load_sessions([_make_file(c, n) for n, c in contents], backend="thread")
+    monkeypatch.setattr(session_loader, "PARSE_CACHE_DIR", str(tmp_path / "pooled"))
+    pooled = load_sessions([_make_file(c, n) for n, c in contents], backend="process")
+    cols = ["Session Name", "Source File", "Club", "Carry Distance", "Date"]
+    pd.testing.assert_frame_equal(threaded[cols], pooled[cols])
+    assert pooled["Session Name"].tolist() == [
+        "2025-08-01 Session 1",
+        "2025-08-01 Session 2",
+        "2025-08-02 Session 1",
+    ]
+
+
+def test_process_backend_falls_back_when_workers_fail(monkeypatch):
+    def _broken(data):
+        raise BrokenProcessPool("worker died")
+
+    # Threads stand in for worker processes so the patched worker is used.
+    monkeypatch.setattr(
+        session_loader, "_process_pool", lambda n: ThreadPoolExecutor(max_workers=n)
+    )
+    monkeypatch.setattr(session_loader, "_parse_bytes_to_ipc", _broken)
+    monkeypatch.setattr(session_loader, "PROCESS_POOL_READ_AHEAD", 1)
+    header = "Date,Club Type,Carry Distance\n"
+    files = [
+        _make_file(f"{header}2025-08-0{i} 10:00,Driver,{200 + i}\n", f"{i}.csv")
+        for i in range(1, 6)
+    ]
+    df = load_sessions(files, backend="process")
+    assert df["Carry Distance"].tolist() == [201.0, 202.0, 203.0, 204.0, 205.0]
+
+
+def test_gzipped_csv_is_a_session_not_an_archive():
+    assert session_loader.is_archive("exports.tar.gz")
+    assert session_loader.is_archive("exports.TGZ")
+    assert not session_loader.is_archive("round.csv.gz")
+    csv = b"Date,Club Type,Carry Distance\n2025-08-01 10:00,Driver,230\n"
+    buf = io.BytesIO(gzip.compress(csv))
+    buf.name = "round.csv.gz"
+    df = load_sessions([buf])
+    assert df["Club"].tolist() == ["Driver"]
+    assert df["Carry Distance"].tolist() == [230.0]
+
+
+def test_auto_backend_switches_on_file_count(monkeypatch):
+    monkeypatch.setattr(session_loader, "PROCESS_POOL_MIN_FILES", 2)
+    monkeypatch.setattr(session_loader.os, "cpu_count", lambda: 4)
+    files = [_make_file("Date,Club\n2025-08-01 10:00,Driver\n", f"{i}.csv") for i in range(2)]
+    assert session_loader._choose_backend(files[:1]) == "thread"
+    assert session_loader._choose_backend(files) == "process"
+
+
+def _archive_bytes(kind: str, members: dict[str, str]) -> io.BytesIO:
+    buf = io.BytesIO()
+    if kind == "zip":
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, content in members.items():
+                zf.writestr(name, content)
+    else:
+        with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+            for name, content in members.items():
+                data = content.encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+    buf.seek(0)
+    buf.name = f"exports.{'zip' if kind == 'zip' else 'tar.gz'}"
+    return buf
+
+
+@pytest.mark.parametrize("kind", ["zip", "tar.gz"])
+def test_load_archive_streams_csv_members(kind):
+    archive = _archive_bytes(
+        kind,
+        {
+            "exports/late.csv": "Date,Club\n2025-08-01 15:00,Driver\n",
+            "exports/early.csv": "Date,Club\n2025-08-01 09:00,7 Iron\n",
+            "exports/notes.txt": "not a session",
+            "__MACOSX/exports/._early.csv": "junk",
+        },
+    )
+    df = load_archive(archive)
+    assert df["Session Name"].drop_duplicates().tolist() == [
+        "2025-08-01 Session 1",
+        "2025-08-01 Session 2",
+    ]
+    assert df["Source File"].tolist() == ["early.csv", "late.csv"]
+
+
+def test_load_archive_skips_known_members():
+    early = "Date,Club\n2025-08-01 09:00,7 Iron\n"
+    archive = _archive_bytes(
+        "zip",
+        {"early.csv": early, "copy.csv": early, "late.csv": "Date,Club\n2025-08-01 15:00,Driver\n"},
+    )
+    known = {file_digest(_make_file(early, "x.csv"))}
+    df = load_archive(archive, skip_digests=known)
+    assert df["Source File"].tolist() == ["late.csv"]
+
+
+def test_loose_files_and_archives_are_named_together():
+    loose = _make_file("Date,Club\n2025-08-01 15:00,Driver\n", "a.csv")
+    archive = _archive_bytes(
+        "zip",
+        {
+            "b.csv": "Date,Club\n2025-08-01 09:00,7 Iron\n",
+            # Same content as the loose file: loaded once.
+            "a_copy.csv": "Date,Club\n2025-08-01 15:00,Driver\n",
+        },
+    )
+    df = load_sessions([loose], archives=[archive])
+    assert df["Source File"].tolist() == ["b.csv", "a.csv"]
+    assert df["Session Name"].tolist() == [
+        "2025-08-01 Session 1",
+        "2025-08-01 Session 2",
+    ]
+    assert df["Session ID"].nunique() == 2
+
+
+def test_load_archive_rejects_garbage():
+    buf = io.BytesIO(b"definitely not an archive")
+    buf.name = "broken.zip"
+    assert load_archive(buf).empty
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.shot_store import ShotStore, parse_shot_id, shot_id
+
+
+def _session(sid: str, carries: list[float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Session ID": [sid] * len(carries),
+            "Club": ["7 Iron"] * len(carries),
+            "Carry Distance": carries,
+        }
+    )
+
+
+def test_append_creates_one_segment_per_session():
+    store = ShotStore()
+    added = store.append(pd.concat([_session("a", [150, 152]), _session("b", [148])]))
+    assert added == ["a", "b"]
+    assert store.session_ids == ["a", "b"]
+    assert len(store) == 3
+    assert store.segment("b")["Carry Distance"].tolist() == [148]
+    assert store.frame().index.tolist() == [0, 1, 2]
+
+
+def test_drop_keeps_labels_of_remaining_shots():
+    store = ShotStore([_session("a", [150, 152]), _session("b", [148])])
+    assert store.drop("a")
+    assert not store.drop("a")
+    store.append(_session("c", [155]))
+    frame = store.frame()
+    assert frame["Session ID"].tolist() == ["b", "c"]
+    assert frame.index.tolist() == [2, 3]
+
+
+def test_frame_is_cached_until_changed():
+    store = ShotStore([_session("a", [150])])
+    first = store.frame()
+    assert store.frame() is first
+    store.append(_session("b", [151]))
+    assert store.frame() is not first
+    assert len(store.frame()) == 2
+
+
+def test_from_frame_round_trips_index_and_rejects_duplicates():
+    df = pd.concat([_session("a", [150]), _session("b", [151])])
+    df.index = [5, 9]
+    store = ShotStore.from_frame(df)
+    pd.testing.assert_frame_equal(store.frame(), df)
+    with pytest.raises(ValueError):
+        store.append(_session("a", [149]))
+    store.append(_session("c", [152]))
+    assert store.frame().index.tolist() == [5, 9, 10]
+
+
+def test_empty_store():
+    store = ShotStore()
+    assert store.empty
+    assert store.frame().empty
+    store.append(pd.DataFrame())
+    assert store.empty
+
+
+def test_version_changes_on_every_mutation():
+    store = ShotStore()
+    seen = {store.version}
+    store.append(_session("a", [150]))
+    seen.add(store.version)
+    store.drop("a")
+    seen.add(store.version)
+    assert len(seen) == 3
+    assert store.data_version == store.version
+    assert ShotStore().version not in seen
+
+
+def test_quality_is_stored_and_tags_update_it_in_place():
+    store = ShotStore([_session("a", [150, 152]), _session("b", [148])])
+    store.tag({"b:0": "miss", "gone:0": "miss"})
+    store.set_quality("a", pd.Series(["good", "outlier"], index=[0, 1]))
+    frame = store.frame()
+    assert frame["Quality"].dtype == "category"
+    assert frame["Quality"].tolist()[:2] == ["good", "outlier"]
+    assert store.unclassified() == ["b"]
+
+    store.set_quality("b", pd.Series(["good"], index=[2]))
+    version, data_version = store.version, store.data_version
+    store.tag({"a:0": "miss"})
+    assert store.version != version
+    assert store.data_version == data_version
+    frame = store.frame()
+    assert frame["Quality"].tolist() == ["miss", "outlier", "miss"]
+    assert frame["Quality Source"].tolist() == ["manual", "auto", "manual"]
+    assert store.tags == {"a:0": "miss", "b:0": "miss"}
+
+    with pytest.raises(ValueError):
+        store.tag({"a:1": "great"})
+    store.drop("a")
+    assert store.tags == {"b:0": "miss"}
+
+
+def test_shot_ids_are_stable_across_removals():
+    store = ShotStore([_session("a", [150, 152]), _session("b", [148, 149])])
+    assert store.shot_ids([3, 0, 99]) == ["b:1", "a:0", None]
+    store.drop("a")
+    store.append(_session("c", [151]))
+    assert store.shot_ids([3, 4]) == ["b:1", "c:0"]
+    assert shot_id("b", 1) == "b:1"
+    assert parse_shot_id("b:1") == ("b", 1)
+
+
+def test_catalog_describes_sessions_and_resolves_positions():
+    a = _session("a", [150, 152]).assign(
+        **{"Session Name": "S1", "Date": pd.to_datetime(["2025-08-02", "2025-08-03"])}
+    )
+    b = _session("b", [148]).assign(**{"Session Name": "S2", "Date": pd.Timestamp("2025-08-01")})
+    store = ShotStore([a, b, _session("c", [140, 141])])
+    catalog = store.catalog
+    assert catalog.index.tolist() == ["a", "b", "c"]
+    assert catalog.loc["a", "Last Shot"] == pd.Timestamp("2025-08-03")
+    assert catalog["Start"].tolist() == [0, 2, 3]
+    assert catalog.loc["c", "Clubs"] == {"7 Iron": 2}
+    assert store.positions(["c", "a"]).tolist() == [0, 1, 3, 4]
+
+    restored = ShotStore()
+    restored.attach("a", lambda: pytest.fail("segment loaded"), **store.segment_info("a"))
+    assert restored.catalog.loc["a", "Session Name"] == "S1"
+
+
+def test_frame_keeps_categoricals_and_shares_segment_memory():
+    a = _session("a", [150, 152]).astype({"Club": "category", "Session ID": "category"})
+    b = _session("b", [148]).assign(Club="Driver")
+    b = b.astype({"Club": "category", "Session ID": "category"})
+    store = ShotStore([a, b])
+    frame = store.frame()
+    assert list(frame["Club"].cat.categories) == ["7 Iron", "Driver"]
+    assert frame["Session ID"].dtype == "category"
+    assert store.segment("b")["Club"].tolist() == ["Driver"]
+    assert np.shares_memory(
+        store.segment("b")["Carry Distance"].to_numpy(), frame["Carry Distance"].to_numpy()
+    )
+
+    report = store.memory_usage()
+    assert report.index.tolist() == ["a", "b"]
+    assert report["Rows"].tolist() == [2, 1]
+    assert (report["Bytes"] > 0).all()
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_utils import remove_outliers, shot_quality
+from utils.shot_store import ShotStore
+from utils.sketches import SegmentSketch, ShotSketches
+
+
+def _session(sid: str, rng, n: int = 400) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Club": rng.choice(["Driver", "7 Iron"], n),
+            "Carry Distance": np.round(rng.normal(150, 12, n), 1),
+            "Offline": rng.normal(0, 6, n),
+            "Session ID": sid,
+        }
+    )
+
+
+def test_single_segment_quartiles_are_exact():
+    df = _session("a", np.random.default_rng(0))
+    sketches = ShotSketches()
+    sketches.add("a", SegmentSketch.from_frame(df))
+    stats = sketches.stats("Carry Distance", "Driver")
+    carry = df.loc[df["Club"] == "Driver", "Carry Distance"]
+    assert stats.count == len(carry)
+    assert stats.median == pytest.approx(carry.median())
+    assert stats.q1 == pytest.approx(carry.quantile(0.25))
+    assert stats.q3 == pytest.approx(carry.quantile(0.75))
+
+
+def test_merged_stats_are_within_rank_error():
+    rng = np.random.default_rng(1)
+    store = ShotStore([_session(sid, rng) for sid in "abcdef"])
+    sketches = ShotSketches().sync(store)
+    carry = store.frame().loc[lambda d: d["Club"] == "7 Iron", "Carry Distance"]
+    stats = sketches.stats("Carry", "7 Iron")
+    for q, value in ((0.25, stats.q1), (0.5, stats.median), (0.75, stats.q3)):
+        rank = (carry <= value).mean()
+        assert abs(rank - q) <= sketches.rank_error
+    mad = (carry - carry.median()).abs().median()
+    assert abs(stats.mad - mad) / mad < 0.05
+
+
+def test_sync_tracks_added_and_dropped_segments():
+    rng = np.random.default_rng(2)
+    store = ShotStore([_session("a", rng)])
+    sketches = ShotSketches().sync(store)
+    store.append(_session("b", rng, n=100))
+    store.drop("a")
+    sketches.sync(store)
+    assert [sid for sid, _ in sketches.snapshot()] == ["b"]
+    assert sketches.stats("Carry Distance").count == 100
+
+
+def test_filters_use_sketch_thresholds():
+    rng = np.random.default_rng(3)
+    store = ShotStore([_session(sid, rng) for sid in "abc"])
+    df = store.frame()
+    sketches = ShotSketches().sync(store)
+    exact = remove_outliers(df, ["Carry Distance", "Offline"])
+    approx = remove_outliers(df, ["Carry Distance", "Offline"], sketch=sketches)
+    assert len(approx.index.symmetric_difference(exact.index)) <= len(df) * 0.01
+    labels = shot_quality(df, sketch=sketches)
+    assert (labels == shot_quality(df)).mean() > 0.99
+
+
+def test_shot_quality_uses_sketches_despite_a_unit_row():
+    rng = np.random.default_rng(3)
+    history = ShotStore([_session(sid, rng) for sid in "abc"])
+    sketches = ShotSketches().sync(history)
+    # A new session that runs long, preceded by a club-less unit row.
+    seg = _session("d", rng, n=40)
+    seg["Carry Distance"] += 8
+    unit_row = pd.DataFrame({"Club": [np.nan], "Carry Distance": [np.nan], "Offline": [np.nan]})
+    with_units = pd.concat([unit_row, seg], ignore_index=True)
+
+    labels = shot_quality(with_units, sketch=sketches)
+    assert labels.iloc[0] == "good"
+    expected = shot_quality(seg, sketch=sketches).tolist()
+    assert labels.iloc[1:].tolist() == expected
+    assert expected != shot_quality(seg).tolist()
@@ -1,13 +1,14 @@
 """Helpers for generating natural language feedback via OpenAI APIs."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import pandas as pd
-from .data_utils import coerce_numeric
+from .club_stats import ClubStats
+from .data_utils import apply_shot_schema
 from .openai_utils import get_openai_client
 
 
-def generate_ai_summary(club_name, df):
+def generate_ai_summary(club_name, df, club_stats: Optional[ClubStats] = None):
     """Return a short coaching-style summary and stats for ``club_name``.
 
     The function calculates a few aggregate statistics for the selected club
@@ -15,28 +16,24 @@ def generate_ai_summary(club_name, df):
     returned summary contains a friendly warning instead of raising an
     exception. Both the text summary and the underlying stats are returned so
     callers can display the numbers that informed the model's response.
+    ``club_stats`` may hold precomputed :class:`~utils.club_stats.ClubStats`
+    of ``df``; otherwise the club's shots are summarised here.
     """
 
-    shots = df[df["Club"] == club_name]
-    if shots.empty:
+    if club_stats is None:
+        df = apply_shot_schema(df)
+        club_stats = ClubStats.from_frame(df[df["Club"] == club_name])
+    if club_name not in club_stats:
         return "No data for this club.", {}
 
-    carry_col = "Carry Distance" if "Carry Distance" in shots.columns else "Carry"
-    shots = shots.copy()
-    # Coerce numeric columns to floats; missing columns result in NaN values so
-    # that formatting below does not raise ``TypeError``.
-    if carry_col in shots.columns:
-        shots[carry_col] = coerce_numeric(shots[carry_col])
-    for col in ["Smash Factor", "Launch Angle", "Backspin"]:
-        if col in shots.columns:
-            shots[col] = coerce_numeric(shots[col])
-
-    carry = shots[carry_col].mean() if carry_col in shots.columns else float("nan")
-    smash = shots["Smash Factor"].mean() if "Smash Factor" in shots.columns else float("nan")
-    launch = shots["Launch Angle"].mean() if "Launch Angle" in shots.columns else float("nan")
-    backspin = shots["Backspin"].mean() if "Backspin" in shots.columns else float("nan")
-    std_dev = shots[carry_col].std() if carry_col in shots.columns else float("nan")
-    shot_count = len(shots)
+    # Missing columns result in NaN values so that formatting below does not
+    # raise ``TypeError``.
+    carry = club_stats.get(club_name, "Carry Distance")
+    smash = club_stats.get(club_name, "Smash Factor")
+    launch = club_stats.get(club_name, "Launch Angle")
+    backspin = club_stats.get(club_name, "Spin Rate")
+    std_dev = club_stats.get(club_name, "Carry Distance", "std")
+    shot_count = club_stats.count(club_name)
 
     prompt = f"""
 You're a golf performance coach trained in Jon Sherman's Four Foundations. I use a Garmin R10. Give me a short, actionable summary for my {club_name} based on these stats:
@@ -73,20 +70,21 @@ Explain what this means for my consistency and what to do in practice. Be specif
     return summary, stats
 
 
-def generate_ai_batch_summaries(df) -> Dict[str, Dict[str, Any]]:
+def generate_ai_batch_summaries(
+    df, club_stats: Optional[ClubStats] = None
+) -> Dict[str, Dict[str, Any]]:
     """Generate AI feedback for multiple clubs.
 
     Returns a mapping of club name to a dictionary containing the ``summary``
     text and the ``stats`` used to produce it. Each club is processed
     sequentially but callers only need to make a single function call.
+    Statistics come from ``club_stats`` when given, computed once otherwise.
     """
 
-    if "Club" not in df.columns:
-        return {}
-
-    clubs = df["Club"].dropna().unique().tolist()
+    if club_stats is None:
+        club_stats = ClubStats.from_frame(df)
     summaries: Dict[str, Dict[str, Any]] = {}
-    for club in clubs:
-        summary, stats = generate_ai_summary(club, df)
+    for club in club_stats.clubs:
+        summary, stats = generate_ai_summary(club, df, club_stats)
         summaries[club] = {"summary": summary, "stats": stats}
     return summaries
@@ -32,8 +32,14 @@ def get_benchmarks():
     }
 
 def check_benchmark(club_name, stats):
-    """Compare ``stats`` for ``club_name`` against benchmark ranges."""
+    """Compare ``stats`` for ``club_name`` against benchmark ranges.
 
+    ``stats`` maps benchmark metrics to the player's values, or is a
+    :class:`~utils.club_stats.ClubStats` table to read the club's means from.
+    """
+
+    if hasattr(stats, "benchmark_stats"):
+        stats = stats.benchmark_stats(club_name)
     benchmarks = get_benchmarks()
     result_lines = []
 
@@ -1,41 +1,411 @@
+"""Persistence of uploaded sessions and user metadata between reloads.
+
+State is stored under :data:`CACHE_DIR` as one compressed Parquet file per
+session segment plus a small JSON manifest holding everything else (session
+names, tags, the practice log).  Segments never change once written, so a save
+only writes segments that are new and deletes ones that were removed.
+
+Small edits (shot tags and practice-log entries) are appended to a journal
+instead of rewriting the manifest.  :func:`load_persisted_state` replays the
+journal on top of the manifest and every full :func:`persist_state` folds it
+back in.
+
+All writes happen on a background thread; call :func:`flush` to wait for them.
+"""
+
+import atexit
+import io
 import json
 import os
-from threading import Lock
+import uuid
+from functools import partial
+from threading import Condition, Lock, Thread
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from .data_utils import apply_shot_schema, compact_frame
 from .logger import logger
+from .page_utils import get_shot_sketches, get_shot_store
+from .shot_store import ShotStore
+from .sketches import SegmentSketch, ShotSketches
 
-CACHE_PATH = os.path.join("sample_data", "session_cache.json")
+CACHE_DIR = os.path.join("sample_data", "session_cache")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+SEGMENT_DIR = os.path.join(CACHE_DIR, "segments")
+JOURNAL_PATH = os.path.join(CACHE_DIR, "journal.jsonl")
+# Fold the journal into the manifest once it holds this many records.
+JOURNAL_COMPACT_THRESHOLD = 500
+# Single JSON document used by earlier versions; read once and migrated.
+LEGACY_CACHE_PATH = os.path.join("sample_data", "session_cache.json")
+MANIFEST_VERSION = 1
+# Seconds the background writer waits for more changes before writing, so a
+# burst of widget interactions results in a single write.
+PERSIST_DEBOUNCE_SECONDS = float(os.getenv("PERSIST_DEBOUNCE_SECONDS", "0.5"))
 _persist_lock = Lock()
+_journal_records = 0
+
+
+def _segment_path(session_id: str) -> str:
+    return os.path.join(SEGMENT_DIR, f"{session_id}.parquet")
+
+
+def _write_segment(session_id: str, segment: pd.DataFrame) -> None:
+    path = _segment_path(session_id)
+    tmp_path = f"{path}.tmp"
+    # Segments are written compact so they load without conversion.
+    compact_frame(segment).to_parquet(tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+def _read_segment(session_id: str) -> pd.DataFrame:
+    """Load one persisted segment, memory-mapping the Parquet file."""
+
+    return pd.read_parquet(_segment_path(session_id), memory_map=True)
+
+
+def _sketch_path(session_id: str) -> str:
+    return os.path.join(SEGMENT_DIR, f"{session_id}.sketch.parquet")
+
+
+def _write_sketch(session_id: str, sketch: SegmentSketch) -> None:
+    path = _sketch_path(session_id)
+    tmp_path = f"{path}.tmp"
+    sketch.table.to_parquet(tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+def _read_sketch(session_id: str) -> SegmentSketch:
+    return SegmentSketch(pd.read_parquet(_sketch_path(session_id)))
+
+
+def _write_json(path: str, payload: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _encode_quality(codes: np.ndarray) -> str:
+    """Return automatic label ``codes`` as a string of digits, one per shot."""
+
+    return (codes + ord("0")).astype(np.uint8).tobytes().decode("ascii")
+
+
+def _decode_quality(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("ascii"), dtype=np.uint8) - ord("0")
+
+
+def _write_snapshot(snapshot: dict) -> None:
+    """Write a state snapshot taken by :func:`persist_state` (writer thread)."""
+
+    segments = snapshot.pop("_segments")
+    quality = snapshot.pop("_quality")
+    sketches = snapshot.pop("_sketches")
+    os.makedirs(SEGMENT_DIR, exist_ok=True)
+    written = 0
+    for sid, segment, info in segments:
+        if not os.path.exists(_segment_path(sid)):
+            if segment is None:
+                logger.warning("Segment file for session %s disappeared", sid)
+                continue
+            _write_segment(sid, segment)
+            written += 1
+        entry = {"session_id": sid, **info}
+        if quality.get(sid) is not None:
+            entry["quality"] = _encode_quality(quality[sid])
+        snapshot["segments"].append(entry)
+    for sid, sketch in sketches:
+        if sketch is not None and not os.path.exists(_sketch_path(sid)):
+            _write_sketch(sid, sketch)
+    _write_json(MANIFEST_PATH, snapshot)
+    # The manifest now includes every journalled edit.
+    if os.path.exists(JOURNAL_PATH):
+        os.remove(JOURNAL_PATH)
+
+    keep = {f"{sid}.parquet" for sid, _, _ in segments}
+    keep |= {f"{sid}.sketch.parquet" for sid, _ in sketches}
+    for name in os.listdir(SEGMENT_DIR):
+        if name.endswith(".parquet") and name not in keep:
+            os.remove(os.path.join(SEGMENT_DIR, name))
+    if os.path.exists(LEGACY_CACHE_PATH):
+        os.remove(LEGACY_CACHE_PATH)
+    logger.info(
+        "State persisted with %d session(s), %d segment(s) written",
+        len(snapshot["sessions"]),
+        written,
+    )
+
+
+def _write_journal(records: list[dict]) -> None:
+    """Append ``records`` to the journal as JSON lines (writer thread)."""
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(rec) + "\n" for rec in records))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class _PersistWriter:
+    """Background thread that performs all cache writes.
+
+    The script thread only queues work: full snapshots and journal records.
+    Work arriving within :data:`PERSIST_DEBOUNCE_SECONDS` of the first pending
+    item is coalesced.  A new snapshot supersedes everything queued before it,
+    and consecutive journal records are written with a single ``fsync``.
+    """
+
+    def __init__(self) -> None:
+        self._cond = Condition()
+        self._ops: list[tuple[str, object]] = []
+        self._submitted = 0
+        self._completed = 0
+        self._flush_requested = False
+        self._thread: Optional[Thread] = None
+
+    def submit(self, kind: str, payload: object) -> None:
+        with self._cond:
+            if kind == "snapshot":
+                self._ops = [(kind, payload)]
+            else:
+                self._ops.append((kind, payload))
+            self._submitted += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(
+                    target=self._run, name="persist-writer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until all queued work is written; return ``False`` on timeout."""
+
+        with self._cond:
+            if self._completed < self._submitted:
+                self._flush_requested = True
+                self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: self._completed >= self._submitted, timeout
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: bool(self._ops))
+                self._cond.wait_for(
+                    lambda: self._flush_requested, PERSIST_DEBOUNCE_SECONDS
+                )
+                ops, self._ops = self._ops, []
+                target = self._submitted
+                self._flush_requested = False
+            try:
+                self._write(ops)
+            except Exception:  # keep the writer alive so flush() cannot hang
+                logger.exception("Unexpected error while persisting state")
+            finally:
+                with self._cond:
+                    self._completed = target
+                    # A flush requested while this batch was written has now
+                    # been served; later batches are debounced again.
+                    if self._completed >= self._submitted:
+                        self._flush_requested = False
+                    self._cond.notify_all()
+
+    @staticmethod
+    def _write(ops: list[tuple[str, object]]) -> None:
+        records: list[dict] = []
+        try:
+            with _persist_lock:
+                for kind, payload in ops:
+                    if kind == "snapshot":
+                        _write_snapshot(payload)
+                    else:
+                        records.extend(payload)
+                if records:
+                    _write_journal(records)
+        except (OSError, TypeError, ValueError, ImportError) as exc:  # pragma: no cover
+            logger.warning("Failed to persist state: %s", exc)
+
+
+_writer = _PersistWriter()
+
+
+def flush(timeout: Optional[float] = None) -> bool:
+    """Wait for pending background writes; mainly useful in tests."""
+
+    return _writer.flush(timeout)
+
+
+atexit.register(flush, 10.0)
+
+
+def _append_journal(records: list[dict]) -> None:
+    """Queue ``records`` for the journal, compacting it when it grows large.
+
+    Only the changed values are written, so the cost does not depend on how
+    many shots are stored.
+    """
+
+    global _journal_records
+    if not records:
+        return
+    _writer.submit("records", records)
+    _journal_records += len(records)
+    if _journal_records >= JOURNAL_COMPACT_THRESHOLD:
+        persist_state()
+
+
+def record_tags(tags: dict) -> None:
+    """Journal changed shot tags (shot ID -> quality)."""
+
+    _append_journal(
+        [{"op": "tag", "shot": str(shot), "quality": label} for shot, label in tags.items()]
+    )
+
+
+def record_practice_entry(entry: dict) -> None:
+    """Journal a new practice-log entry."""
+
+    _append_journal([{"op": "log", "entry": dict(entry)}])
+
+
+def _replay_journal(data: dict) -> None:
+    """Apply journalled edits to manifest ``data`` in place."""
+
+    global _journal_records
+    if not os.path.exists(JOURNAL_PATH):
+        return
+    tags = data.setdefault("shot_tags", {})
+    log = data.setdefault("practice_log", [])
+    count = 0
+    with open(JOURNAL_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted write; ignore it.
+                logger.warning("Skipping corrupt journal record")
+                continue
+            if rec.get("op") == "tag":
+                tags[str(rec["shot"])] = rec["quality"]
+            elif rec.get("op") == "log":
+                log.append(rec["entry"])
+            count += 1
+    _journal_records = count
+
 
 def persist_state() -> None:
-    """Persist uploaded sessions, dataframe and metadata to disk."""
-    data = {
-        "sessions": st.session_state.get("uploaded_sessions", []),
-        "df": st.session_state.get("session_df", pd.DataFrame()),
-        "shot_tags": st.session_state.get("shot_tags", {}),
-        "practice_log": st.session_state.get("practice_log", []),
-        "session_ids": st.session_state.get("session_ids", {}),
+    """Queue a full save of sessions, shot segments and metadata.
+
+    The state is captured on the calling thread and written by the background
+    writer, so the Streamlit script never waits on disk I/O.  Segments are
+    immutable and shared by reference; the small metadata containers are
+    copied.
+    """
+
+    global _journal_records
+    store = get_shot_store()
+    snapshot = {
+        "version": MANIFEST_VERSION,
+        "sessions": list(st.session_state.get("uploaded_sessions", [])),
+        "shot_tags": store.tags,
+        "practice_log": list(st.session_state.get("practice_log", [])),
+        "session_ids": dict(st.session_state.get("session_ids", {})),
+        "file_hashes": dict(st.session_state.get("file_hashes", {})),
+        "segments": [],
+        "_segments": store.snapshot(),
+        "_quality": {sid: store.quality_codes(sid) for sid in store.session_ids},
+        "_sketches": get_shot_sketches().snapshot(),
+    }
+    _writer.submit("snapshot", snapshot)
+    _journal_records = 0
+
+
+def _load_legacy(data: dict) -> ShotStore:
+    """Return a store for the single-document JSON cache format."""
+
+    df = pd.DataFrame()
+    df_json = data.get("df")
+    if df_json:
+        try:
+            df = apply_shot_schema(pd.read_json(io.StringIO(df_json), orient="split"))
+        except ValueError as exc:  # pragma: no cover - rarely triggered
+            logger.warning("Failed to parse cached dataframe: %s", exc)
+
+    # Very old caches predate session IDs; generate them per session name.
+    if not df.empty and "Session ID" not in df.columns:
+        sid_map = {sname: uuid.uuid4().hex for sname in df["Session Name"].unique()}
+        df["Session ID"] = df["Session Name"].map(sid_map)
+        data["session_ids"] = sid_map
+    if not data.get("file_hashes") and "Source Hash" in df.columns:
+        data["file_hashes"] = dict(
+            df[["Source Hash", "Session ID"]].dropna().drop_duplicates().values
+        )
+    # Match the compact layout of segments restored from Parquet.
+    store = ShotStore.from_frame(compact_frame(df))
+    # This format keyed tags by index label; re-key them by shot ID.
+    tags = data.get("shot_tags", {})
+    ids = store.shot_ids(int(key) for key in tags)
+    data["shot_tags"] = {
+        new_key: label for new_key, label in zip(ids, tags.values()) if new_key is not None
     }
+    return store
+
+
+def load_persisted_state() -> Optional[dict]:
+    """Return the persisted state or ``None`` if nothing has been saved.
+
+    The returned dict mirrors the manifest and carries the restored
+    :class:`~utils.shot_store.ShotStore` under ``"store"`` and its
+    :class:`~utils.sketches.ShotSketches` under ``"sketches"``.  Segments and
+    sketches are attached lazily, so their Parquet files are only read when a
+    page first needs them.  Segments saved without a sketch are sketched on
+    first use.  Automatic quality labels are restored as saved, so restored
+    sessions are not classified again.
+    """
+
+    path = MANIFEST_PATH if os.path.exists(MANIFEST_PATH) else LEGACY_CACHE_PATH
+    if not os.path.exists(path):
+        return None
     try:
-        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
-        tmp_path = f"{CACHE_PATH}.tmp"
-        with _persist_lock, open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "sessions": data["sessions"],
-                    "df": data["df"].to_json(orient="split"),
-                    "shot_tags": data["shot_tags"],
-                    "practice_log": data["practice_log"],
-                    "session_ids": data["session_ids"],
-                },
-                f,
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as exc:  # pragma: no cover - rare
+        logger.warning("Failed to load cached state: %s", exc)
+        return None
+
+    sketches = ShotSketches()
+    if path == LEGACY_CACHE_PATH:
+        data["store"] = _load_legacy(data)
+    else:
+        store = ShotStore()
+        for entry in data.get("segments", []):
+            sid = entry["session_id"]
+            if not os.path.exists(_segment_path(sid)):
+                logger.warning("Cached segment for session %s is missing", sid)
+                continue
+            store.attach(
+                sid,
+                partial(_read_segment, sid),
+                rows=entry["rows"],
+                next_label=entry["next_label"],
+                catalog=entry.get("catalog"),
             )
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp_path, CACHE_PATH)
-        logger.info("State persisted with %d session(s)", len(data["sessions"]))
-    except (OSError, TypeError, ValueError) as exc:  # pragma: no cover
-        logger.warning("Failed to persist state: %s", exc)
+            # Labels are restored as saved rather than recomputed against
+            # the current history.
+            if "quality" in entry:
+                store.set_quality(sid, _decode_quality(entry["quality"]))
+            if os.path.exists(_sketch_path(sid)):
+                sketches.attach(sid, partial(_read_sketch, sid))
+        data["store"] = store
+    data["sketches"] = sketches
+    try:
+        _replay_journal(data)
+    except OSError as exc:  # pragma: no cover - rare
+        logger.warning("Failed to replay edit journal: %s", exc)
+    return data
@@ -0,0 +1,88 @@
+"""Per-club row positions for a shot table.
+
+Selecting one club with ``df[df["Club"] == club]`` scans every shot, so
+per-club loops cost O(clubs × N).  :class:`ClubIndex` groups the row
+positions by club once, after which each club's rows are taken directly.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class ClubIndex:
+    """Row positions of each club, built in one pass over a ``Club`` column.
+
+    The index only holds positions, so it applies to any frame that is
+    row-for-row aligned with the one it was built from (for example the
+    store's frame before and after quality labels change).  Clubs are kept
+    in order of first appearance, like ``df["Club"].dropna().unique()``;
+    shots without a club belong to none.
+    """
+
+    def __init__(self, clubs: pd.Series) -> None:
+        codes, uniques = pd.factorize(clubs)
+        # A stable sort keeps each club's shots in frame order; shots without
+        # a club (code -1) sort first and are skipped by the offsets below.
+        self._order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        ends = int((codes < 0).sum()) + np.cumsum(counts)
+        self._slices: Dict[str, Tuple[int, int]] = {
+            club: (int(end - count), int(end))
+            for club, count, end in zip(uniques, counts, ends)
+        }
+        self._length = len(codes)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ClubIndex":
+        """Index the ``Club`` column of ``df`` (empty if there is none)."""
+
+        if "Club" not in df.columns:
+            return cls(pd.Series([np.nan] * len(df), dtype=object))
+        return cls(df["Club"])
+
+    @property
+    def clubs(self) -> List[str]:
+        """Indexed clubs in order of first appearance."""
+
+        return list(self._slices)
+
+    def __contains__(self, club: object) -> bool:
+        return club in self._slices
+
+    def __len__(self) -> int:
+        return self._length
+
+    def count(self, club: str) -> int:
+        """Return the number of shots hit with ``club``."""
+
+        start, end = self._slices.get(club, (0, 0))
+        return end - start
+
+    def positions(self, club: str) -> np.ndarray:
+        """Return the row positions of ``club``'s shots, in frame order.
+
+        The result is a read-only view into the index; unknown clubs give an
+        empty array.
+        """
+
+        start, end = self._slices.get(club, (0, 0))
+        positions = self._order[start:end]
+        positions.flags.writeable = False
+        return positions
+
+    def rows(self, df: pd.DataFrame, club: str) -> pd.DataFrame:
+        """Return the shots of ``club`` from ``df`` (aligned with the index)."""
+
+        if len(df) != self._length:
+            raise ValueError("Frame is not aligned with the club index")
+        return df.iloc[self.positions(club)]
+
+    def groups(self, df: pd.DataFrame) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Yield ``(club, rows)`` for every indexed club."""
+
+        for club in self._slices:
+            yield club, self.rows(df, club)
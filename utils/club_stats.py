@@ -0,0 +1,180 @@
+"""Per-club statistics shared by the drill, summary and feedback utilities.
+
+Drill recommendations, practice feedback, AI summaries and benchmark checks
+all describe a club by the same handful of aggregates.  :class:`ClubStats`
+computes them for every club with one grouped pass over the shots so each
+utility reads them from a shared table instead of re-filtering and
+re-aggregating the rows itself.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .constants import NUMERIC_FIELDS
+from .data_utils import apply_shot_schema
+
+# Metrics summarised per club, when present.
+STAT_FIELDS = [*NUMERIC_FIELDS, "Smash Factor"]
+
+# Smash factors below ``FAT_SMASH`` count as fat strikes and above
+# ``THIN_SMASH`` as thin ones.
+FAT_SMASH = 1.2
+THIN_SMASH = 1.5
+
+_QUANTILES = {"p25": 0.25, "median": 0.5, "p75": 0.75}
+
+# Benchmark keys (see :mod:`utils.benchmarks`) and the metric means they
+# compare against.
+_BENCHMARK_FIELDS = {
+    "Carry": "Carry Distance",
+    "Smash Factor": "Smash Factor",
+    "Launch Angle": "Launch Angle",
+    "Backspin": "Spin Rate",
+}
+
+
+class ClubStats:
+    """Aggregates of each metric per club.
+
+    :attr:`table` is indexed by club, in order of first appearance, with
+    ``(metric, stat)`` columns.  Every metric of :data:`STAT_FIELDS` present
+    in the shots has ``count``, ``mean``, ``std`` (``ddof=1``), ``min``,
+    ``max``, ``p25``, ``median`` and ``p75``.  ``Offline`` also has
+    ``left_bias`` and ``right_bias`` (percent of the club's shots left or
+    right of target) and ``Smash Factor`` has ``fat_rate`` and ``thin_rate``
+    (fraction of measured strikes beyond :data:`FAT_SMASH` or
+    :data:`THIN_SMASH`).  :attr:`shots` counts every shot of the club.
+    :attr:`types` maps each club to its ``Club Type`` when the shots name
+    clubs separately from their type (for example a custom ``Club Name``).
+    """
+
+    def __init__(
+        self,
+        table: pd.DataFrame,
+        shots: pd.Series,
+        types: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.table = table
+        self.shots = shots
+        self.types = types or {}
+        # Plain lookups for :meth:`get`, which callers use once per club and
+        # statistic; ``DataFrame.at`` on a MultiIndex is comparatively slow.
+        self._positions = {club: i for i, club in enumerate(table.index)}
+        self._columns = {
+            col: table[col].to_numpy(dtype=np.float64) for col in table.columns
+        }
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ClubStats":
+        """Compute the statistics of every club in ``df``.
+
+        Shots without a club are ignored.  A frame without a ``Club`` column
+        has no clubs.
+        """
+
+        df = apply_shot_schema(df)
+        if "Club" not in df.columns:
+            clubs = pd.Index([], dtype=object, name="Club")
+            return cls(pd.DataFrame(index=clubs), pd.Series(index=clubs, dtype=np.int64))
+        metrics = [c for c in STAT_FIELDS if c in df.columns]
+        # Aggregate in float64 even though stored metrics are float32.
+        values = df[metrics].astype(np.float64)
+        flags = {}
+        if "Offline" in values.columns:
+            offline = values["Offline"]
+            flags[("Offline", "left_bias")] = (offline < 0) * 100.0
+            flags[("Offline", "right_bias")] = (offline > 0) * 100.0
+        if "Smash Factor" in values.columns:
+            smash = values["Smash Factor"]
+            measured = smash.notna()
+            flags[("Smash Factor", "fat_rate")] = (smash < FAT_SMASH).where(measured) * 1.0
+            flags[("Smash Factor", "thin_rate")] = (smash > THIN_SMASH).where(measured) * 1.0
+
+        grouped = values.groupby(df["Club"], observed=True, sort=False)
+        shots = grouped.size()
+        parts = [pd.DataFrame(index=shots.index)]
+        if metrics:
+            parts.append(grouped.agg(["count", "mean", "std", "min", "max"]))
+            quantiles = grouped.quantile(list(_QUANTILES.values())).unstack()
+            parts.append(
+                quantiles.rename(
+                    columns={q: name for name, q in _QUANTILES.items()}, level=1
+                )
+            )
+        if flags:
+            flag_frame = pd.DataFrame(flags, index=df.index)
+            parts.append(flag_frame.groupby(df["Club"], observed=True, sort=False).mean())
+        table = pd.concat(parts, axis=1).reindex(shots.index)
+        # Group the columns by metric, in STAT_FIELDS order.
+        columns = [col for m in metrics for col in table.columns if col[0] == m]
+        table = table[columns].set_axis(
+            pd.MultiIndex.from_tuples(columns, names=["metric", "stat"])
+            if columns
+            else pd.MultiIndex.from_arrays([[], []], names=["metric", "stat"]),
+            axis=1,
+        )
+        table.index = pd.Index(table.index.astype(object), name="Club")
+        shots.index = table.index
+        types = None
+        if "Club Type" in df.columns:
+            first = df["Club Type"].groupby(df["Club"], observed=True, sort=False).first()
+            types = {club: str(t) for club, t in first.dropna().items()}
+        return cls(table, shots.astype(np.int64), types)
+
+    # ------------------------------------------------------------------
+    @property
+    def clubs(self) -> List[str]:
+        """Clubs in order of first appearance."""
+
+        return self.table.index.tolist()
+
+    @property
+    def metrics(self) -> List[str]:
+        """Metrics that were present in the shots."""
+
+        return list(dict.fromkeys(self.table.columns.get_level_values(0)))
+
+    def __contains__(self, club: object) -> bool:
+        return club in self._positions
+
+    def club_type(self, club: str) -> Optional[str]:
+        """Return the ``Club Type`` of ``club`` (``None`` if not recorded)."""
+
+        return self.types.get(club)
+
+    def count(self, club: str) -> int:
+        """Return the number of shots hit with ``club`` (``0`` if unknown)."""
+
+        return int(self.shots.get(club, 0))
+
+    def get(self, club: str, metric: str, stat: str = "mean") -> float:
+        """Return ``stat`` of ``metric`` for ``club`` (NaN if not available)."""
+
+        pos = self._positions.get(club)
+        values = self._columns.get((metric, stat))
+        if pos is None or values is None:
+            return float("nan")
+        return float(values[pos])
+
+    def std(self, club: str, metric: str, ddof: int = 1) -> float:
+        """Return the standard deviation of ``metric`` for ``club``."""
+
+        n = self.get(club, metric, "count")
+        if not n > ddof:
+            return float("nan")
+        if n == 1:
+            return 0.0
+        return self.get(club, metric, "std") * float(np.sqrt((n - 1) / (n - ddof)))
+
+    def benchmark_stats(self, club: str) -> Dict[str, float]:
+        """Return ``club``'s means keyed like :func:`~utils.benchmarks.get_benchmarks`."""
+
+        return {
+            key: self.get(club, metric)
+            for key, metric in _BENCHMARK_FIELDS.items()
+            if metric in self.metrics
+        }
@@ -1,25 +1,80 @@
 """Shared constants for column normalisation and other utilities."""
 
-# Mapping of various Garmin export column names to a normalised snake_case form
-# used throughout the application. This allows pages and utilities to rely on
-# consistent column names regardless of the source CSV variations.
-COLUMN_NORMALIZATION_MAP = {
-    "Session Name": "session_name",
-    "Club": "club",
-    "Club Type": "club",
-    "Carry Distance": "carry_distance",
-    "Carry": "carry_distance",
-    "Total Distance": "total_distance",
-    "Ball Speed": "ball_speed",
-    "Launch Angle": "launch_angle",
-    "Backspin": "spin_rate",
-    "Spin Rate": "spin_rate",
-    "Apex Height": "apex_height",
-    "Apex": "apex_height",
-    "Side": "side_distance",
-    "Side Distance": "side_distance",
-    "Offline Distance": "offline_distance",
-    "Offline": "offline_distance",
-    "Session ID": "session_id",
-    "Source File": "source_file",
+# Canonical shot columns and the other spellings Garmin exports use for them.
+# Columns are renamed to the canonical name once at ingest (the first alias
+# present wins, and only if the canonical column is missing), so pages and
+# utilities use these names without renaming or fallbacks.  See
+# :func:`utils.data_utils.normalize_columns`.
+COLUMN_ALIASES = {
+    "Club": ["Club Name", "Club Type"],
+    "Carry Distance": ["Carry"],
+    "Spin Rate": ["Backspin"],
+    "Apex Height": ["Apex"],
+    "Offline": ["Offline Distance", "Side Distance", "Side"],
 }
+
+# Canonical columns that hold launch-monitor measurements, in display order.
+NUMERIC_FIELDS = [
+    "Carry Distance",
+    "Total Distance",
+    "Ball Speed",
+    "Launch Angle",
+    "Spin Rate",
+    "Apex Height",
+    "Offline",
+]
+
+# Declared dtypes for known Garmin export columns.  The session loader parses
+# each of these exactly once at ingest so pages and utilities can rely on the
+# final dtypes instead of re-coercing on every render.  Columns not listed here
+# are left as inferred by the CSV reader.
+SHOT_SCHEMA = {
+    **{
+        col: "float64"
+        for field in NUMERIC_FIELDS
+        for col in [field, *COLUMN_ALIASES.get(field, [])]
+    },
+    "Club Speed": "float64",
+    "Attack Angle": "float64",
+    "Club Path": "float64",
+    "Club Face": "float64",
+    "Face to Path": "float64",
+    "Smash Factor": "float64",
+    "Launch Direction": "float64",
+    "Sidespin": "float64",
+    "Spin Axis": "float64",
+    "Carry Deviation Angle": "float64",
+    "Carry Deviation Distance": "float64",
+    "Total Deviation Angle": "float64",
+    "Total Deviation Distance": "float64",
+    "Date": "datetime64[ns]",
+    "Club": "object",
+    "Club Name": "object",
+    "Club Type": "object",
+    "Player": "object",
+}
+
+# Text columns that repeat a handful of values on every shot.  Stored shot
+# data keeps them as categoricals (one small integer code per row) and the
+# SHOT_SCHEMA metrics as float32; see :func:`utils.data_utils.compact_frame`.
+CATEGORICAL_COLUMNS = [
+    "Club",
+    "Club Name",
+    "Club Type",
+    "Player",
+    "Session Name",
+    "Source File",
+    "Session ID",
+    "Source Hash",
+]
+
+# Shot quality labels in category order; ``Quality`` columns are categoricals
+# with exactly these categories.
+QUALITY_LABELS = ["good", "miss", "outlier"]
+
+# Where a stored ``Quality`` label came from (``Quality Source`` column).
+QUALITY_SOURCES = ["auto", "manual"]
+
+# Garmin writes ISO-8601 timestamps (``2025-08-01 10:00:00``).  Parsing with
+# an explicit format avoids pandas' per-element format inference.
+DATE_FORMAT = "ISO8601"
@@ -1,14 +1,49 @@
 """Utility helpers for working with Garmin shot data."""
 
-from typing import Union
-
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import TYPE_CHECKING, Optional, Union
+
+import numpy as np
 import pandas as pd
 
+from .constants import (
+    CATEGORICAL_COLUMNS,
+    COLUMN_ALIASES,
+    DATE_FORMAT,
+    QUALITY_LABELS,
+    SHOT_SCHEMA,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .sketches import ShotSketches
+
+# Filters return views and masks instead of defensive copies; copy-on-write
+# guarantees that writing to a derived frame never touches the shot store.
+pd.set_option("mode.copy_on_write", True)
+
 try:  # scikit-learn is optional
     from sklearn.ensemble import IsolationForest
 except Exception:  # pragma: no cover - handled at runtime
     IsolationForest = None
 
+# Isolation Forest scores keyed by a fingerprint of the rows they were fitted
+# on.  The forest itself does not depend on ``contamination``, so changing it
+# only re-thresholds the cached scores.
+ISOLATION_CACHE_SIZE = 64
+_isolation_scores: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_isolation_lock = Lock()
+
+# Standard normal quantile of the chi-square cutoff used by ``method="robust"``.
+ROBUST_CUTOFF_Z = 1.959963984540054  # 97.5%
+
+_CANONICAL = {
+    alias: canonical for canonical, aliases in COLUMN_ALIASES.items() for alias in aliases
+}
+
 
 def coerce_numeric(series, errors: str = "coerce"):
     """Return numeric values for ``series`` even if duplicates exist.
@@ -22,9 +57,118 @@ def coerce_numeric(series, errors: str = "coerce"):
 
     if isinstance(series, pd.DataFrame):
         series = series.iloc[:, 0]
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(
+        series
+    ):
+        # Already parsed at ingest; avoid another pass over the values.
+        return series
     return pd.to_numeric(series, errors=errors)
 
 
+def parse_dates(series: pd.Series) -> pd.Series:
+    """Return ``series`` as ``datetime64[ns]`` using :data:`DATE_FORMAT`.
+
+    Values that are already datetimes are only cast to nanosecond precision.
+    If the explicit format matches none of the values (e.g. a locale-specific
+    export) the parser falls back to pandas' per-element inference.
+    """
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if getattr(series.dt, "tz", None) is not None:
+            series = series.dt.tz_localize(None)
+        return series.astype("datetime64[ns]")
+    parsed = pd.to_datetime(series, format=DATE_FORMAT, errors="coerce")
+    if parsed.isna().all() and series.notna().any():
+        parsed = pd.to_datetime(series, format="mixed", errors="coerce")
+    return parsed
+
+
+def canonical_column(name: str) -> str:
+    """Return the canonical name of column ``name`` (``Backspin`` -> ``Spin Rate``)."""
+
+    return _CANONICAL.get(name, name)
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with canonical column names from :data:`COLUMN_ALIASES`.
+
+    For each canonical column that is missing, the first alias present is
+    renamed to it; other aliases are left alone.  Repeated column names keep
+    their first occurrence.  A frame that is already canonical is returned
+    as-is, so calling this on stored shots costs nothing.
+    """
+
+    if df.columns.has_duplicates:
+        df = df.loc[:, ~df.columns.duplicated()]
+    renames = {}
+    for canonical, aliases in COLUMN_ALIASES.items():
+        if canonical in df.columns:
+            continue
+        alias = next((a for a in aliases if a in df.columns), None)
+        if alias is not None:
+            renames[alias] = canonical
+    return df.rename(columns=renames) if renames else df
+
+
+def apply_shot_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with canonical names and :data:`SHOT_SCHEMA` dtypes.
+
+    This is the single place where raw CSV values are parsed.  Columns are
+    first renamed by :func:`normalize_columns`.  Columns that already have
+    their final dtype are left untouched so the function is cheap to call on
+    data restored from the persisted cache, or by utilities that accept
+    arbitrary frames. Unknown columns are passed through as-is and ``df`` is
+    not modified in place.
+    """
+
+    df = normalize_columns(df)
+    converted = {}
+    for col, dtype in SHOT_SCHEMA.items():
+        if col not in df.columns or isinstance(df[col], pd.DataFrame):
+            continue
+        series = df[col]
+        if dtype == "float64":
+            # Compacted float32 columns are final too.
+            if not pd.api.types.is_float_dtype(series):
+                converted[col] = coerce_numeric(series).astype("float64")
+        elif dtype == "datetime64[ns]":
+            if series.dtype != "datetime64[ns]":
+                converted[col] = parse_dates(series)
+        elif series.dtype != object and not isinstance(series.dtype, pd.CategoricalDtype):
+            # Text columns read through the pyarrow engine arrive as the
+            # nullable ``string`` dtype; store plain objects with NaN so the
+            # rest of the app sees the same values as the C parser produces.
+            converted[col] = pd.Series(
+                series.to_numpy(dtype=object, na_value=np.nan),
+                index=series.index,
+                name=col,
+            )
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` in the compact in-memory layout used for stored shots.
+
+    :data:`~utils.constants.CATEGORICAL_COLUMNS` become categoricals with
+    sorted categories and the ``float64`` metrics of :data:`SHOT_SCHEMA`
+    become ``float32``, which is well within launch-monitor precision.
+    Columns already compact are left untouched.
+    """
+
+    converted = {}
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            converted[col] = df[col].astype("category")
+    for col, dtype in SHOT_SCHEMA.items():
+        if dtype == "float64" and col in df.columns and df[col].dtype == np.float64:
+            converted[col] = df[col].astype(np.float32)
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
 def remove_outliers(
     df: pd.DataFrame,
     cols: list[str],
@@ -33,6 +177,7 @@ def remove_outliers(
     iqr_mult: float = 1.5,
     method: str = "mad",
     contamination: Union[float, str] = "auto",
+    sketch: Optional["ShotSketches"] = None,
 ) -> pd.DataFrame:
     """Return ``df`` with outliers removed for the given ``cols``.
 
@@ -51,10 +196,19 @@ def remove_outliers(
     method:
         Outlier detection approach. ``"mad"`` applies a robust z-score rule
         with an IQR fallback. ``"isolation"`` uses an Isolation Forest for
-        adaptive, multivariate detection.
+        adaptive, multivariate detection. ``"robust"`` flags shots whose
+        robust Mahalanobis distance (Minimum Covariance Determinant estimate)
+        exceeds the 97.5% chi-square quantile, catching unusual combinations
+        of values that look normal column by column.
     contamination:
         Proportion of outliers in the data when using the Isolation Forest
         method. Defaults to ``"auto"``.
+    sketch:
+        Optional :class:`~utils.sketches.ShotSketches` of the stored history.
+        With ``method="mad"`` the thresholds are read from the sketches
+        (approximate, see :attr:`~utils.sketches.ShotSketches.rank_error`)
+        instead of sorting ``df``.  Columns or clubs the sketches do not cover
+        fall back to exact statistics.
 
     When a club column (``club`` or ``Club``) is present the outlier rule is
     evaluated within each club.  Rows falling outside the acceptable range for
@@ -62,147 +216,456 @@ def remove_outliers(
     ignored. ``df`` is not modified in place.
     """
 
-    filtered = df.copy()
-    cols = [c for c in cols if c in filtered.columns]
+    return df[
+        inlier_mask(
+            df,
+            cols,
+            z_thresh=z_thresh,
+            iqr_mult=iqr_mult,
+            method=method,
+            contamination=contamination,
+            sketch=sketch,
+        )
+    ]
+
+
+def inlier_mask(
+    df: pd.DataFrame,
+    cols: list[str],
+    *,
+    z_thresh: float = 3.0,
+    iqr_mult: float = 1.5,
+    method: str = "mad",
+    contamination: Union[float, str] = "auto",
+    sketch: Optional["ShotSketches"] = None,
+) -> pd.Series:
+    """Return a boolean mask over ``df.index`` of rows :func:`remove_outliers` keeps.
+
+    Parameters are the same as for :func:`remove_outliers`.  ``df`` is not
+    copied, so callers can combine several masks and count removed rows
+    (``(~mask).sum()``) without materialising intermediate frames.
+    """
+
+    cols = [c for c in cols if c in df.columns]
     if not cols:
-        return filtered
+        return pd.Series(True, index=df.index)
 
-    numeric = filtered[cols].apply(coerce_numeric)
-    group_col = next((c for c in ("club", "Club") if c in filtered.columns), None)
+    numeric = df[cols].apply(coerce_numeric)
+    group_col = next((c for c in ("club", "Club") if c in df.columns), None)
 
     if method == "isolation":
         if IsolationForest is None:
             raise ImportError(
                 "scikit-learn is required for adaptive outlier detection"
             )
-        mask = pd.Series(True, index=filtered.index)
         if group_col:
-            for _, idx in numeric.groupby(filtered[group_col]).groups.items():
-                subset = numeric.loc[idx]
-                if len(subset) < 2:
-                    continue
-                model = IsolationForest(
-                    contamination=contamination, random_state=0
-                )
-                preds = model.fit_predict(subset)
-                mask.loc[idx] = preds == 1
+            positions = list(
+                numeric.groupby(df[group_col], observed=True).indices.values()
+            )
+        else:
+            positions = [np.arange(len(numeric))]
+        positions = [pos for pos in positions if len(pos) >= 2]
+        keep = np.ones(len(df), dtype=bool)
+        if positions:
+            subsets = [numeric.iloc[pos] for pos in positions]
+            max_workers = max(1, min(len(subsets), os.cpu_count() or 1))
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                scores = list(pool.map(_isolation_forest_scores, subsets))
+            for pos, club_scores in zip(positions, scores):
+                keep[pos] = _isolation_inliers(club_scores, contamination)
+        return pd.Series(keep, index=df.index)
+
+    if method == "robust":
+        if group_col:
+            positions = numeric.groupby(df[group_col], observed=True).indices.values()
         else:
-            if len(numeric) >= 2:
-                model = IsolationForest(
-                    contamination=contamination, random_state=0
-                )
-                preds = model.fit_predict(numeric)
-                mask = preds == 1
-        return filtered[mask]
+            positions = [np.arange(len(numeric))]
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        keep = np.ones(len(df), dtype=bool)
+        for pos in positions:
+            keep[pos] = _robust_distance_inliers(values[pos])
+        return pd.Series(keep, index=df.index)
 
     # default: robust z-score with IQR fallback
     if group_col:
-        groups = filtered[group_col]
+        codes, uniques = pd.factorize(df[group_col])
+        clubs = list(uniques)
+    else:
+        codes = np.zeros(len(df), dtype=np.intp)
+        clubs = [None]
+
+    keep = np.ones(len(df), dtype=bool)
+    for col in cols:
+        values = numeric[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        stats = sketch.group_stats(col, clubs) if sketch is not None else None
+        keep &= _robust_keep_mask(
+            values,
+            codes,
+            len(clubs),
+            z_thresh=z_thresh,
+            iqr_mult=iqr_mult,
+            stats=stats,
+        )
+    return pd.Series(keep, index=df.index)
+
+
+def _frame_fingerprint(frame: pd.DataFrame) -> str:
+    """Return a digest of the column names and values of ``frame``."""
+
+    digest = hashlib.blake2b(repr(list(frame.columns)).encode(), digest_size=16)
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _isolation_forest_scores(frame: pd.DataFrame) -> np.ndarray:
+    """Return Isolation Forest ``score_samples`` for the rows of ``frame``.
+
+    Scores are cached by :func:`_frame_fingerprint`, so a club whose shots
+    have not changed is never refitted.  Only the scores are kept: they are
+    all that is needed to classify the training rows.
+    """
 
-        def _mad(x: pd.Series) -> float:
-            return (x - x.median()).abs().median()
+    key = _frame_fingerprint(frame)
+    with _isolation_lock:
+        scores = _isolation_scores.get(key)
+        if scores is not None:
+            _isolation_scores.move_to_end(key)
+            return scores
+    model = IsolationForest(random_state=0).fit(frame)
+    scores = model.score_samples(frame)
+    with _isolation_lock:
+        _isolation_scores[key] = scores
+        while len(_isolation_scores) > ISOLATION_CACHE_SIZE:
+            _isolation_scores.popitem(last=False)
+    return scores
+
+
+def _isolation_inliers(
+    scores: np.ndarray, contamination: Union[float, str]
+) -> np.ndarray:
+    """Threshold ``scores`` the way ``IsolationForest.fit_predict`` does."""
+
+    if contamination == "auto":
+        offset = -0.5
+    elif 0.0 < contamination <= 0.5:
+        offset = np.percentile(scores, 100.0 * contamination)
+    else:
+        raise ValueError("contamination must be 'auto' or in (0, 0.5]")
+    return scores - offset >= 0
 
-        _mad.__name__ = "mad"  # naming for groupby.agg
 
-        def _q1(x: pd.Series) -> float:
-            return x.quantile(0.25)
+def _chi2_quantile(dof: int, z: float) -> float:
+    """Return the chi-square quantile for standard normal quantile ``z``.
 
-        _q1.__name__ = "q1"
+    Uses the Wilson-Hilferty approximation so the robust method does not need
+    SciPy; it is within a few percent of the exact value for ``dof >= 1``.
+    """
 
-        def _q3(x: pd.Series) -> float:
-            return x.quantile(0.75)
+    k = 2.0 / (9.0 * dof)
+    return dof * (1.0 - k + z * np.sqrt(k)) ** 3
 
-        _q3.__name__ = "q3"
 
-        stats = numeric.groupby(groups).agg(["median", _mad, _q1, _q3])
-        stats.columns = [f"{col}_{stat}" for col, stat in stats.columns]
-        stats = stats.reindex(groups).set_index(filtered.index)
-        median = stats[[f"{c}_median" for c in cols]]
-        median.columns = cols
-        mad = stats[[f"{c}_mad" for c in cols]]
-        mad.columns = cols
-        q1 = stats[[f"{c}_q1" for c in cols]]
-        q1.columns = cols
-        q3 = stats[[f"{c}_q3" for c in cols]]
-        q3.columns = cols
-    else:
-        median = numeric.median()
-        mad = (numeric - median).abs().median()
-        q1 = numeric.quantile(0.25)
-        q3 = numeric.quantile(0.75)
+def _mcd_distances(x: np.ndarray, *, n_starts: int = 8, max_steps: int = 30) -> np.ndarray:
+    """Return squared robust Mahalanobis distances of the rows of ``x``.
+
+    The location and scatter are a reweighted Minimum Covariance Determinant
+    estimate found with concentration steps (the "C-steps" of FastMCD): from
+    each start, the ``h`` rows closest to the current fit are refitted until
+    the covariance determinant stops shrinking.  Starts are iterated together
+    as batched NumPy arrays.  ``x`` must not contain NaN and its
+    columns must not be constant.
+    """
+
+    n, p = x.shape
+    h = (n + p + 1) // 2
+    center = np.median(x, axis=0)
+    z = (x - center) / np.median(np.abs(x - center), axis=0)
+    ridge = 1e-9 * np.eye(p)
+
+    def _fit(points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        loc = points.mean(axis=-2)
+        dev = points - loc[..., None, :]
+        cov = (np.swapaxes(dev, -1, -2) @ dev) / (points.shape[-2] - 1)
+        return loc, cov + ridge
+
+    def _distances(loc: np.ndarray, cov: np.ndarray) -> np.ndarray:
+        diff = z - loc[..., None, :]
+        return ((diff @ np.linalg.inv(cov)) * diff).sum(axis=-1)
+
+    # One deterministic start (the rows nearest the coordinate-wise median)
+    # plus random elemental subsets of p + 1 rows.
+    rng = np.random.default_rng(0)
+    fits = [_fit(z[np.argpartition((z**2).sum(axis=1), h - 1)[:h]])]
+    fits += [
+        _fit(z[rng.choice(n, p + 1, replace=False)]) for _ in range(n_starts - 1)
+    ]
+    loc = np.stack([f[0] for f in fits])
+    cov = np.stack([f[1] for f in fits])
+    log_det = np.full(len(fits), np.inf)
+    for step in range(max_steps):
+        subsets = np.argpartition(_distances(loc, cov), h - 1, axis=1)[:, :h]
+        loc, cov = _fit(z[subsets])
+        new_log_det = np.linalg.slogdet(cov)[1]
+        if np.allclose(new_log_det, log_det):
+            break
+        log_det = new_log_det
+        if step == 1:
+            # As in FastMCD, only the two most promising starts are iterated
+            # to convergence.
+            best = np.argsort(log_det)[:2]
+            loc, cov, log_det = loc[best], cov[best], log_det[best]
+    best = int(np.argmin(log_det))
+    loc, cov = loc[best], cov[best]
+
+    # Reweight using the rows inside the cutoff.  Both fits are rescaled so
+    # the median distance matches the chi-square median (consistency
+    # correction for normally distributed shots).
+    median = _chi2_quantile(p, 0.0)
+    dist = _distances(loc, cov)
+    dist *= median / np.median(dist)
+    loc, cov = _fit(z[dist <= _chi2_quantile(p, ROBUST_CUTOFF_Z)])
+    dist = _distances(loc, cov)
+    return dist * (median / np.median(dist))
+
+
+def _robust_distance_inliers(x: np.ndarray) -> np.ndarray:
+    """Return which rows of ``x`` lie inside the robust distance cutoff.
+
+    Rows with missing values, and all rows of groups too small for a stable
+    covariance estimate, are kept.  Columns that are (mostly) constant carry
+    no shape information and are left out of the estimate.
+    """
+
+    keep = np.ones(len(x), dtype=bool)
+    complete = ~np.isnan(x).any(axis=1)
+    sample = x[complete]
+    if len(sample):
+        center = np.median(sample, axis=0)
+        sample = sample[:, np.median(np.abs(sample - center), axis=0) > 0]
+    n, p = sample.shape
+    if p == 0 or n < 2 * (p + 1):
+        return keep
+    dist = _mcd_distances(sample)
+    keep[complete] = dist <= _chi2_quantile(p, ROBUST_CUTOFF_Z)
+    return keep
 
-    z = 0.6745 * (numeric - median) / mad.replace(0, pd.NA)
-    z_mask = z.abs().le(z_thresh)
 
-    iqr = q3 - q1
-    lower = q1 - iqr_mult * iqr
-    upper = q3 + iqr_mult * iqr
-    iqr_mask = (numeric >= lower) & (numeric <= upper)
+def _lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Linear interpolation computed exactly as :func:`numpy.quantile` does."""
 
-    mask = z_mask | (mad.eq(0) & iqr_mask) | numeric.isna()
-    return filtered[mask.all(axis=1)]
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
 
 
-def derive_offline_distance(df: pd.DataFrame) -> pd.DataFrame:
-    """Return ``df`` with an ``Offline`` column if possible.
+def _sort_within_groups(values: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Return ``values`` sorted by ``(codes, values)``.
 
-    Garmin CSV exports are inconsistent in naming lateral dispersion metrics.
-    Some provide ``Side`` or ``Side Distance`` instead of ``Offline``.  This
-    helper inspects these alternate columns and, when found, copies the values
-    into a new ``Offline`` column.  The input dataframe is not modified in
-    place.
+    Sorting by value first and then stably by the small integer group codes
+    lets NumPy use radix sort for the second pass, which is several times
+    faster than :func:`numpy.lexsort` on float keys.
     """
 
-    df = df.copy()
-    offline_present = any(col in df.columns for col in ("Offline", "Offline Distance"))
-    if offline_present:
-        return df
+    order = np.argsort(values)
+    keys = codes[order].astype(np.min_scalar_type(codes.max(initial=0)))
+    return values[order[np.argsort(keys, kind="stable")]]
 
-    for col in ("Side Distance", "Side"):
-        if col in df.columns:
-            df["Offline"] = coerce_numeric(df[col])
-            break
 
-    return df
+def grouped_quantiles(
+    values: np.ndarray, codes: np.ndarray, n_groups: int, probs: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return per-group value counts and linear quantiles at ``probs``.
+
+    ``codes`` assigns each value to a group in ``range(n_groups)``; negative
+    codes and NaN values are ignored.  The result is ``(counts, quantiles)``
+    where ``quantiles`` has shape ``(n_groups, len(probs))`` and matches
+    :func:`numpy.quantile`; rows of empty groups are NaN.
+    """
+
+    valid = (codes >= 0) & ~np.isnan(values)
+    grp = codes[valid]
+    counts = np.bincount(grp, minlength=n_groups)
+    quantiles = np.full((n_groups, len(probs)), np.nan)
+    present = counts > 0
+    if present.any():
+        sorted_vals = _sort_within_groups(values[valid], grp)
+        n = counts[present][:, None]
+        start = (np.cumsum(counts) - counts)[present][:, None]
+        pos = (n - 1) * np.asarray(probs)[None, :]
+        below = np.floor(pos).astype(np.intp)
+        upper = np.minimum(below + 1, n - 1)
+        quantiles[present] = _lerp(
+            sorted_vals[start + below], sorted_vals[start + upper], pos - below
+        )
+    return counts, quantiles
+
+
+def _grouped_robust_stats(
+    values: np.ndarray, codes: np.ndarray, n_groups: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return per-group median, MAD, first and third quartile of ``values``.
+
+    ``codes`` assigns each value to a group in ``range(n_groups)``; negative
+    codes and NaN values are ignored.  Values are sorted once by
+    ``(group, value)`` and the order statistics of every group are read from
+    its contiguous slice, so no Python code runs per group.  Results match
+    pandas' ``median`` and linear ``quantile`` exactly; groups without values
+    get NaN.
+    """
+
+    valid = (codes >= 0) & ~np.isnan(values)
+    vals = values[valid]
+    grp = codes[valid]
+    counts = np.bincount(grp, minlength=n_groups)
+    present = counts > 0
+    n = counts[present]
+    start = (np.cumsum(counts) - counts)[present]
+
+    def _median(sorted_vals: np.ndarray) -> np.ndarray:
+        return (sorted_vals[start + (n - 1) // 2] + sorted_vals[start + n // 2]) / 2
+
+    def _quantile(sorted_vals: np.ndarray, q: float) -> np.ndarray:
+        pos = (n - 1) * q
+        below = np.floor(pos).astype(np.intp)
+        upper = np.minimum(below + 1, n - 1)
+        return _lerp(sorted_vals[start + below], sorted_vals[start + upper], pos - below)
+
+    def _expand(stat: np.ndarray) -> np.ndarray:
+        full = np.full(n_groups, np.nan)
+        full[present] = stat
+        return full
+
+    sorted_vals = _sort_within_groups(vals, grp)
+    median = _expand(_median(sorted_vals))
+    dev = np.abs(vals - median[grp])
+    mad = _expand(_median(_sort_within_groups(dev, grp)))
+    q1 = _expand(_quantile(sorted_vals, 0.25))
+    q3 = _expand(_quantile(sorted_vals, 0.75))
+    return median, mad, q1, q3
+
+
+def _robust_keep_mask(
+    values: np.ndarray,
+    codes: np.ndarray,
+    n_groups: int,
+    *,
+    z_thresh: float,
+    iqr_mult: float,
+    stats: Optional[tuple[np.ndarray, ...]] = None,
+) -> np.ndarray:
+    """Return which ``values`` pass the MAD rule (IQR rule when MAD is zero).
+
+    Missing values always pass.  Values whose group code is negative (missing
+    club) have no statistics and only pass when missing.  ``stats`` supplies
+    precomputed per-group ``(median, mad, q1, q3)`` arrays.
+    """
+
+    if stats is None:
+        stats = _grouped_robust_stats(values, codes, n_groups)
+    median, mad, q1, q3 = stats
+    # Append a NaN slot so rows without a group pick up missing statistics.
+    idx = np.where(codes >= 0, codes, n_groups)
+
+    def _per_row(stat: np.ndarray) -> np.ndarray:
+        return np.append(stat, np.nan)[idx]
+
+    row_median, row_mad = _per_row(median), _per_row(mad)
+    row_q1, row_q3 = _per_row(q1), _per_row(q3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = 0.6745 * (values - row_median) / np.where(row_mad == 0, np.nan, row_mad)
+    z_mask = np.abs(z) <= z_thresh
+
+    iqr = row_q3 - row_q1
+    lower = row_q1 - iqr_mult * iqr
+    upper = row_q3 + iqr_mult * iqr
+    iqr_mask = (values >= lower) & (values <= upper)
+
+    return z_mask | ((row_mad == 0) & iqr_mask) | np.isnan(values)
+
+
+def shot_quality(
+    df: pd.DataFrame,
+    carry_col: str = "Carry Distance",
+    offline_col: str = "Offline",
+    *,
+    sketch: Optional["ShotSketches"] = None,
+) -> pd.Series:
+    """Return the quality label (``good``/``miss``/``outlier``) of each shot.
+
+    This is the label array behind :func:`classify_shots`; ``df`` is neither
+    copied nor modified.  The result is a categorical with
+    :data:`~utils.constants.QUALITY_LABELS` as categories.
+
+    Carry consistency is judged against the median and MAD of the shot's own
+    club (``club`` or ``Club`` column, shots without a club form one group),
+    computed for all clubs in a single vectorised pass.  When ``sketch``
+    covers ``carry_col`` for every club the statistics are read from it
+    instead.  Offline limits are absolute distances.
+    """
+
+    outlier = np.zeros(len(df), dtype=bool)
+    miss = np.zeros(len(df), dtype=bool)
+    if carry_col in df.columns:
+        group_col = next((c for c in ("club", "Club") if c in df.columns), None)
+        if group_col:
+            codes, clubs = pd.factorize(df[group_col])
+            clubs = list(clubs)
+        else:
+            codes, clubs = np.zeros(len(df), dtype=np.intp), [None]
+        # Shots without a club (such as an export's unit row) form one extra
+        # group after the clubs.  Sketches only cover named clubs, so that
+        # group always uses the exact statistics of this frame.
+        no_club = len(clubs)
+        codes = np.where(codes < 0, no_club, codes)
+        carry = coerce_numeric(df[carry_col]).to_numpy(dtype=np.float64, na_value=np.nan)
+        stats = sketch.group_stats(carry_col, clubs) if sketch is not None else None
+        if stats is None:
+            stats = _grouped_robust_stats(carry, codes, no_club + 1)
+        else:
+            rest = codes == no_club
+            extra = _grouped_robust_stats(carry[rest], np.zeros(rest.sum(), dtype=np.intp), 1)
+            stats = tuple(np.append(a, b) for a, b in zip(stats, extra))
+        median, mad = stats[0][codes], stats[1][codes]
+        deviation = np.abs(carry - median)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = 0.6745 * (carry - median) / mad
+        outlier |= (mad > 0) & (np.abs(z) > 3)
+        miss |= deviation > 10
+    if offline_col in df.columns:
+        offline_abs = coerce_numeric(df[offline_col]).abs().to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        outlier |= offline_abs > 15
+        miss |= offline_abs > 7
+
+    codes = np.where(outlier, 2, np.where(miss, 1, 0))
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=QUALITY_LABELS),
+        index=df.index,
+        name="Quality",
+    )
 
 
 def classify_shots(
     df: pd.DataFrame,
     carry_col: str = "Carry Distance",
     offline_col: str = "Offline",
+    *,
+    sketch: Optional["ShotSketches"] = None,
 ) -> pd.DataFrame:
     """Return ``df`` with a ``Quality`` column describing shot quality.
 
     Shots are labelled ``good``, ``miss`` or ``outlier`` based on simple
-    heuristics of carry distance consistency and lateral dispersion. Existing
+    heuristics of carry distance consistency within each club and lateral
+    dispersion (see :func:`shot_quality`). Existing
     ``Quality`` values are overwritten. The input dataframe is not modified in
-    place.
+    place; use :func:`shot_quality` when only the labels are needed.
+    ``sketch`` is passed through to :func:`shot_quality`.
     """
 
-    df = df.copy()
-    df["Quality"] = "good"
-
-    median = mad = None
-    if carry_col in df.columns:
-        df[carry_col] = coerce_numeric(df[carry_col])
-        median = df[carry_col].median()
-        mad = (df[carry_col] - median).abs().median()
-
-    offline_abs = None
-    if offline_col in df.columns:
-        df[offline_col] = coerce_numeric(df[offline_col])
-        offline_abs = df[offline_col].abs()
-        df.loc[offline_abs > 15, "Quality"] = "outlier"
-
-    if carry_col in df.columns and mad is not None and mad > 0:
-        z = 0.6745 * (df[carry_col] - median) / mad
-        df.loc[z.abs() > 3, "Quality"] = "outlier"
-
-    miss_mask = pd.Series(False, index=df.index)
-    if carry_col in df.columns:
-        miss_mask |= (df[carry_col] - median).abs() > 10
-    if offline_abs is not None:
-        miss_mask |= offline_abs > 7
-
-    df.loc[miss_mask & df["Quality"].eq("good"), "Quality"] = "miss"
-    return df
+    updates = {
+        col: coerce_numeric(df[col])
+        for col in (carry_col, offline_col)
+        if col in df.columns
+    }
+    updates["Quality"] = shot_quality(df, carry_col, offline_col, sketch=sketch)
+    return df.assign(**updates)
@@ -8,12 +8,12 @@ loosely inspired by Jon Sherman style practice routines.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pandas as pd
 
 from .benchmarks import get_benchmarks
-from .data_utils import coerce_numeric
+from .club_stats import ClubStats
 
 
 @dataclass
@@ -48,88 +48,83 @@ _DRILLS: Dict[str, Recommendation] = {
 }
 
 
-def _match_benchmark(club: str) -> Dict[str, float]:
-    """Return benchmark dict matching ``club`` by name (case-insensitive)."""
+def _match_benchmark(club: str, club_type: Optional[str] = None) -> Dict[str, float]:
+    """Return benchmark dict matching ``club`` by name (case-insensitive).
 
-    club_lower = club.lower()
-    aliases = {"pitching wedge": "pw", "sand wedge": "sw"}
-    for alias, repl in aliases.items():
-        if alias in club_lower:
-            club_lower = club_lower.replace(alias, repl)
-            break
+    Clubs with a custom name (``"My Big Stick"``) fall back to their
+    ``club_type``.
+    """
 
-    for name, bench in get_benchmarks().items():
-        if name.lower() in club_lower:
-            return bench
+    for label in (club, club_type):
+        if not label:
+            continue
+        label_lower = label.lower()
+        aliases = {"pitching wedge": "pw", "sand wedge": "sw"}
+        for alias, repl in aliases.items():
+            if alias in label_lower:
+                label_lower = label_lower.replace(alias, repl)
+                break
+
+        for name, bench in get_benchmarks().items():
+            if name.lower() in label_lower:
+                return bench
     return {}
 
 
-def recommend_drills(df: pd.DataFrame) -> Dict[str, List[Recommendation]]:
+def recommend_drills(
+    df: Optional[pd.DataFrame] = None, club_stats: Optional[ClubStats] = None
+) -> Dict[str, List[Recommendation]]:
     """Generate drill recommendations for each club in ``df``.
 
     Parameters
     ----------
     df:
-        DataFrame containing club shot data.  A ``Club Type`` column is
-        expected, but if only ``Club`` is present it will be used instead.
+        DataFrame containing club shot data.  Column aliases such as
+        ``Club Type`` or ``Backspin`` are normalised to the canonical names.
+    club_stats:
+        Precomputed :class:`~utils.club_stats.ClubStats` of the shots, used
+        instead of ``df`` when given.
 
     Returns
     -------
     dict
         Mapping of club name to a list of :class:`Recommendation` objects.
+        Benchmarks and wedge checks also consider the club's ``Club Type``.
     """
 
-    df = df.copy()
-    df = df.loc[:, ~df.columns.duplicated()]
-    if "Club Type" not in df.columns and "Club" in df.columns:
-        df = df.rename(columns={"Club": "Club Type"})
-    if "Club Type" not in df.columns:
-        return {}
+    if club_stats is None:
+        club_stats = ClubStats.from_frame(df)
 
     recommendations: Dict[str, List[Recommendation]] = {}
 
-    for club, club_df in df.groupby("Club Type"):
+    # Missing metrics read as NaN, which fails every comparison below.
+    for club in sorted(club_stats.clubs):
         recs: List[Recommendation] = []
-        bench = _match_benchmark(club)
-        club_lower = club.lower()
+        club_type = club_stats.club_type(club)
+        bench = _match_benchmark(club, club_type)
+        club_lower = f"{club} {club_type or ''}".lower()
         wedge_keywords = ["wedge", "pw", "sw", "gw", "lw", "aw"]
         is_wedge = any(keyword in club_lower for keyword in wedge_keywords)
+        mean_launch = club_stats.get(club, "Launch Angle")
 
-        # Work on a copy and coerce relevant columns to numeric to avoid
-        # ``TypeError`` when the source data contains strings or duplicate
-        # column names.
-        club_df = club_df.copy()
-        for col in ["Smash Factor", "Carry Distance", "Launch Angle", "Backspin"]:
-            if col in club_df.columns:
-                club_df[col] = coerce_numeric(club_df[col])
-
-        if bench.get("Smash Factor") is not None and "Smash Factor" in club_df.columns:
-            if club_df["Smash Factor"].min() < bench["Smash Factor"]:
+        if bench.get("Smash Factor") is not None:
+            if club_stats.get(club, "Smash Factor", "min") < bench["Smash Factor"]:
                 recs.append(_DRILLS["low_smash"])
 
-        if "Carry Distance" in club_df.columns:
-            carry_std = club_df["Carry Distance"].std(ddof=0)
-            if pd.notna(carry_std) and carry_std > 8:
-                recs.append(_DRILLS["inconsistent_carry"])
+        if club_stats.std(club, "Carry Distance", ddof=0) > 8:
+            recs.append(_DRILLS["inconsistent_carry"])
 
-        if bench.get("Launch Angle") is not None and "Launch Angle" in club_df.columns:
-            mean_launch = club_df["Launch Angle"].mean()
+        if bench.get("Launch Angle") is not None:
             low, high = bench["Launch Angle"]
             if mean_launch < low or mean_launch > high:
                 recs.append(_DRILLS["poor_launch"])
 
         if is_wedge:
-            if "Launch Angle" in club_df.columns:
-                mean_launch = club_df["Launch Angle"].mean()
-                if mean_launch > 40:
-                    recs.append(_DRILLS["high_wedge_launch"])
-            if (
-                bench.get("Backspin") is not None
-                and "Backspin" in club_df.columns
-            ):
-                mean_spin = club_df["Backspin"].mean()
+            if mean_launch > 40:
+                recs.append(_DRILLS["high_wedge_launch"])
+            if bench.get("Backspin") is not None:
                 _, high_spin = bench["Backspin"]
-                if mean_spin > high_spin:
+                if club_stats.get(club, "Spin Rate") > high_spin:
                     recs.append(_DRILLS["high_wedge_spin"])
 
         recommendations[club] = recs
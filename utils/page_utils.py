@@ -1,16 +1,113 @@
 """Shared Streamlit helpers for page-level operations."""
 
+from typing import Iterable, List, Optional
+
 import streamlit as st
 
+from .club_stats import ClubStats
+from .data_utils import shot_quality
+from .shot_store import ShotStore
+from .sketches import ShotSketches
+
+
+def get_shot_store() -> ShotStore:
+    """Return the session's :class:`ShotStore`, creating an empty one if needed."""
+
+    store = st.session_state.get("shot_store")
+    if store is None:
+        store = ShotStore()
+        st.session_state["shot_store"] = store
+    return store
+
+
+def get_shot_sketches() -> ShotSketches:
+    """Return the session's :class:`ShotSketches`, synced with the shot store.
+
+    Only segments added since the last call are sketched.
+    """
+
+    sketches = st.session_state.get("shot_sketches")
+    if sketches is None:
+        sketches = ShotSketches()
+        st.session_state["shot_sketches"] = sketches
+    return sketches.sync(get_shot_store())
+
+
+def get_club_stats() -> ClubStats:
+    """Return :class:`ClubStats` of every stored shot.
+
+    The table is computed once per store data version, so tagging shots
+    keeps it, and shared by the pages and utilities that describe clubs.
+    """
+
+    store = get_shot_store()
+    cached = st.session_state.get("club_stats")
+    if cached is None or cached[0] != store.data_version:
+        cached = (store.data_version, ClubStats.from_frame(store.frame()))
+        st.session_state["club_stats"] = cached
+    return cached[1]
+
+
+def classify_sessions(session_ids: Optional[Iterable[str]] = None) -> None:
+    """Store automatic quality labels for ``session_ids``.
+
+    By default every session without labels is classified.  Thresholds are
+    per club over the whole history (from the sketches), but only the given
+    sessions' shots are labelled, so ingest cost follows the new rows.
+
+    Labels are frozen once stored: sessions added later shift the
+    thresholds but do not relabel earlier shots.  Pass ``session_ids``
+    explicitly to relabel sessions; manual tags always take precedence.
+    """
+
+    store = get_shot_store()
+    pending = store.unclassified() if session_ids is None else list(session_ids)
+    if not pending:
+        return
+    sketches = get_shot_sketches()
+    for sid in pending:
+        store.set_quality(sid, shot_quality(store.segment(sid), sketch=sketches))
+
+
+def select_sessions(
+    option: str, chosen: Iterable[str] = (), exclude: Iterable[str] = ()
+) -> List[str]:
+    """Resolve a session picker choice to session IDs using the catalog.
+
+    ``option`` is one of ``"All Sessions"``, ``"Latest Session"``, ``"Last 5
+    Sessions"`` or ``"Select Sessions"`` (which uses the ``chosen`` names).
+    Sessions named in ``exclude`` are left out.  Sessions are ordered by
+    their shot timestamps when known and by upload order otherwise.
+    """
+
+    catalog = get_shot_store().catalog
+    dated = catalog["Last Shot"].notna().any()
+    if option == "All Sessions":
+        sids = catalog.index
+    elif option == "Latest Session":
+        sids = catalog.index[-1:]
+        if dated:
+            sids = catalog.index[[catalog["Last Shot"].argmax()]]
+    elif option == "Last 5 Sessions":
+        order = catalog.sort_values("First Shot", kind="stable") if dated else catalog
+        sids = order.index[-5:]
+    else:
+        sids = catalog.index[catalog["Session Name"].isin(list(chosen))]
+    excluded = set(catalog.index[catalog["Session Name"].isin(list(exclude))])
+    return [sid for sid in sids if sid not in excluded]
+
+
 def require_data():
     """Return the session dataframe or stop with a warning.
 
     Many pages depend on data uploaded on the home page. This helper ensures
-    that a dataframe is present in ``st.session_state`` and halts execution with
-    a friendly message if not.
+    that the shot store in ``st.session_state`` holds data and halts execution
+    with a friendly message if not.  The returned frame carries the stored
+    ``Quality`` labels.
     """
-    df = st.session_state.get("session_df")
-    if df is None or df.empty:
+    store = get_shot_store()
+    if store.empty:
         st.warning("📤 Please upload CSV files on the home page first.")
         st.stop()
-    return df
+    classify_sessions()
+    return store.frame()
@@ -2,8 +2,8 @@
 
 The main entry point is :func:`summarize_performance` which accepts a
 ``pandas.DataFrame`` of shot data. The function looks for common columns
-produced by Garmin R10 exports (``Club``/``Club Type``, ``Carry Distance`` or
-``Carry``, ``Offline`` etc.) and produces a brief natural-language summary.
+produced by Garmin R10 exports (``Club``, ``Carry Distance``, ``Offline``
+etc., or their aliases) and produces a brief natural-language summary.
 No network access is required – the summary is based purely on simple
 heuristics and the existing drill recommendation utilities.
 """
@@ -11,13 +11,14 @@ heuristics and the existing drill recommendation utilities.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional
 
 import pandas as pd
 
 from .drill_recommendations import Recommendation, recommend_drills
 from .benchmarks import get_benchmarks
-from .data_utils import coerce_numeric
+from .club_stats import ClubStats
+from .data_utils import apply_shot_schema
 
 
 @dataclass
@@ -46,19 +47,16 @@ class MissCounts:
         return miss if count > 0 else None
 
 
-def _determine_miss(row, carry_col: str) -> tuple[str | None, str | None]:
-    """Return ``(distance, direction)`` miss labels for ``row``.
-
-    ``carry_col`` is the column name containing carry distance.
-    """
+def _determine_miss(row) -> tuple[str | None, str | None]:
+    """Return ``(distance, direction)`` miss labels for ``row``."""
 
     distance_miss = None
     direction_miss = None
 
-    club = str(row.get("Club") or row.get("Club Type") or "")
+    club = str(row.get("Club") or "")
     benchmarks = get_benchmarks()
 
-    carry_val = row.get(carry_col)
+    carry_val = row.get("Carry Distance")
     try:
         carry_val = float(carry_val)
     except (TypeError, ValueError):
@@ -91,30 +89,24 @@ def _determine_miss(row, carry_col: str) -> tuple[str | None, str | None]:
     return distance_miss, direction_miss
 
 
-def summarize_performance(df: pd.DataFrame) -> str:
-    """Return a natural-language performance summary for ``df``."""
+def summarize_performance(
+    df: pd.DataFrame, club_stats: Optional[ClubStats] = None
+) -> str:
+    """Return a natural-language performance summary for ``df``.
+
+    ``club_stats`` may hold precomputed :class:`~utils.club_stats.ClubStats`
+    of ``df`` for the drill recommendations.
+    """
 
     if df.empty:
         return "No shot data available."
 
-    df = df.copy()
-    if "Club" not in df.columns and "Club Type" in df.columns:
-        df["Club"] = df["Club Type"]
-
-    carry_col = None
-    for option in ("Carry Distance", "Carry"):
-        if option in df.columns:
-            carry_col = option
-            df[carry_col] = coerce_numeric(df[carry_col])
-            break
-
-    if "Offline" in df.columns:
-        df["Offline"] = coerce_numeric(df["Offline"])
+    df = apply_shot_schema(df)
 
     misses = MissCounts()
-    if carry_col or "Offline" in df.columns:
-        for row in df.itertuples(index=False):
-            distance, direction = _determine_miss(row._asdict(), carry_col or "Carry Distance")
+    if "Carry Distance" in df.columns or "Offline" in df.columns:
+        for row in df.to_dict("records"):
+            distance, direction = _determine_miss(row)
             if distance == "short" and direction == "right":
                 misses.short_right += 1
             elif distance == "short" and direction == "left":
@@ -129,10 +121,7 @@ def summarize_performance(df: pd.DataFrame) -> str:
                 misses.right += 1
     miss_desc = misses.most_common()
 
-    drill_df = df.copy()
-    if "Club Type" not in drill_df.columns and "Club" in drill_df.columns:
-        drill_df = drill_df.rename(columns={"Club": "Club Type"})
-    drill_map: Dict[str, list[Recommendation]] = recommend_drills(drill_df)
+    drill_map: Dict[str, list[Recommendation]] = recommend_drills(df, club_stats)
     drill_suggestion = None
     if drill_map:
         club_name, recs = max(
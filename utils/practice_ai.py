@@ -2,11 +2,25 @@
 
 import pandas as pd
 import numpy as np
-from .data_utils import coerce_numeric, remove_outliers
+from .club_stats import FAT_SMASH, THIN_SMASH, ClubStats
+from .data_utils import apply_shot_schema, remove_outliers
 from .benchmarks import get_benchmarks
 from .openai_utils import get_openai_client
 
 
+# Metrics checked for outliers before a club is analysed.
+FEEDBACK_FIELDS = [
+    "Carry Distance",
+    "Launch Angle",
+    "Spin Rate",
+    "Smash Factor",
+    "Offline",
+]
+
+# Clubs with fewer shots (after outlier removal) are not analysed.
+MIN_CLUB_SHOTS = 6
+
+
 def analyze_club_stats(
     df: pd.DataFrame,
     club: str,
@@ -22,75 +36,50 @@ def analyze_club_stats(
     expensive OpenAI call and return only detected issues and stats.
     """
 
-    feedback = []
-    club_df = df[df["Club"] == club].copy()
+    df = apply_shot_schema(df)
+    club_df = df[df["Club"] == club]
 
     if club_df.empty:
         return {"club": club, "issues": ["No data"], "summary": "No data available."}
 
-    numeric_cols = [
-        "Carry Distance",
-        "Launch Angle",
-        "Spin Rate",
-        "Smash Factor",
-        "Offline",
-    ]
-
-    # Clean and cast existing columns only
-    for col in numeric_cols:
-        if col in club_df.columns:
-            club_df[col] = coerce_numeric(club_df[col])
-
     # Remove outliers so a few wild shots don't skew statistics
     if filter_outliers:
-        club_df = remove_outliers(club_df, numeric_cols)
+        club_df = remove_outliers(club_df, FEEDBACK_FIELDS)
 
     # Skip clubs without enough data to be meaningful
-    if len(club_df) < 6:
+    if len(club_df) < MIN_CLUB_SHOTS:
         return None
 
-    def _left_bias(x):
-        return (x < 0).mean() * 100
+    return _club_feedback(club, ClubStats.from_frame(club_df), with_summary=with_summary)
 
-    def _right_bias(x):
-        return (x > 0).mean() * 100
 
-    _left_bias.__name__ = "left_bias"
-    _right_bias.__name__ = "right_bias"
+def _club_feedback(club: str, stats: ClubStats, *, with_summary: bool) -> dict:
+    """Return the feedback dict of :func:`analyze_club_stats` from ``stats``."""
 
-    agg_map = {
-        "Smash Factor": "mean",
-        "Launch Angle": "mean",
-        "Spin Rate": "mean",
-        "Carry Distance": ["mean", "std"],
-        "Offline": ["mean", _left_bias, _right_bias],
-    }
-    agg_map = {k: v for k, v in agg_map.items() if k in club_df.columns}
-    stats = club_df.agg(agg_map) if agg_map else pd.DataFrame()
-    avg_smash = stats.at["mean", "Smash Factor"] if "Smash Factor" in stats.columns else np.nan
-    avg_launch = stats.at["mean", "Launch Angle"] if "Launch Angle" in stats.columns else np.nan
-    avg_spin = stats.at["mean", "Spin Rate"] if "Spin Rate" in stats.columns else np.nan
-    avg_carry = stats.at["mean", "Carry Distance"] if "Carry Distance" in stats.columns else np.nan
-    std_carry = stats.at["std", "Carry Distance"] if "Carry Distance" in stats.columns else np.nan
-    avg_offline = stats.at["mean", "Offline"] if "Offline" in stats.columns else np.nan
-    left_bias = stats.at["left_bias", "Offline"] if ("Offline" in stats.columns and "left_bias" in stats.index) else 0
-    right_bias = stats.at["right_bias", "Offline"] if ("Offline" in stats.columns and "right_bias" in stats.index) else 0
+    feedback = []
+    avg_smash = stats.get(club, "Smash Factor")
+    avg_launch = stats.get(club, "Launch Angle")
+    avg_spin = stats.get(club, "Spin Rate")
+    avg_carry = stats.get(club, "Carry Distance")
+    std_carry = stats.get(club, "Carry Distance", "std")
+    avg_offline = stats.get(club, "Offline")
+    left_bias = stats.get(club, "Offline", "left_bias")
+    right_bias = stats.get(club, "Offline", "right_bias")
 
     # Contact trends via smash factor
-    if "Smash Factor" in club_df:
-        smash = club_df["Smash Factor"].dropna()
-        fat_rate = (smash < 1.2).mean() if not smash.empty else 0
-        thin_rate = (smash > 1.5).mean() if not smash.empty else 0
+    if "Smash Factor" in stats.metrics:
+        fat_rate = np.nan_to_num(stats.get(club, "Smash Factor", "fat_rate"))
+        thin_rate = np.nan_to_num(stats.get(club, "Smash Factor", "thin_rate"))
         if fat_rate > 0.3:
             feedback.append(f"{fat_rate*100:.0f}% of shots were fat or chunked.")
         if thin_rate > 0.3:
             feedback.append(f"{thin_rate*100:.0f}% of shots were thin strikes.")
         if fat_rate <= 0.3 and thin_rate <= 0.3:
-            if avg_smash < 1.2:
+            if avg_smash < FAT_SMASH:
                 feedback.append(
                     "Low smash factor suggests poor contact (fat or off-center hits)."
                 )
-            elif avg_smash > 1.5:
+            elif avg_smash > THIN_SMASH:
                 feedback.append(
                     "High smash factor might mean thin or toe strikes."
                 )
@@ -130,19 +119,15 @@ def analyze_club_stats(
             benchmark_carry = vals["Carry"]
             break
 
-    max_good_carry = np.nan
-    if "Carry Distance" in club_df:
-        carries = club_df["Carry Distance"].dropna()
-        if benchmark_carry is not None:
-            good_shots = carries[carries >= 0.9 * benchmark_carry]
+    # The longest carry counts as good if it reaches 90% of the benchmark.
+    max_good_carry = stats.get(club, "Carry Distance", "max")
+    if benchmark_carry is not None:
+        if max_good_carry >= 0.9 * benchmark_carry:
+            feedback.append(
+                f"Best good carry: {max_good_carry:.0f} yds (target {benchmark_carry} yds)."
+            )
         else:
-            good_shots = carries
-        if not good_shots.empty:
-            max_good_carry = good_shots.max()
-            if benchmark_carry is not None:
-                feedback.append(
-                    f"Best good carry: {max_good_carry:.0f} yds (target {benchmark_carry} yds)."
-                )
+            max_good_carry = np.nan
 
     if (
         benchmark_carry is not None
@@ -197,19 +182,24 @@ def analyze_practice_session(
     ``filter_outliers`` mirrors the argument in :func:`analyze_club_stats` and
     controls whether per-club analysis removes outliers.  ``with_summary`` can be
     set to ``False`` to avoid calling OpenAI when only the issues or statistics
-    are needed.
+    are needed.  The results are those of :func:`analyze_club_stats` for each
+    club in order of first appearance, skipping clubs it returns ``None`` for.
     """
     # ``df`` may come from arbitrary CSVs.  Guard against the ``Club`` column
     # being missing to avoid ``KeyError``s when the caller supplies malformed
     # data.
+    df = apply_shot_schema(df)
     if "Club" not in df.columns:
         return []
     clubs = df["Club"].dropna().unique()
-    results: list[dict] = []
-    for club in clubs:
-        stats = analyze_club_stats(
-            df, club, filter_outliers=filter_outliers, with_summary=with_summary
-        )
-        if stats is not None:
-            results.append(stats)
-    return results
+    # Every club is analysed in one pass: outlier thresholds are already per
+    # club, so filtering the whole session equals filtering each club, and
+    # one grouped aggregate gives every club's statistics.
+    if filter_outliers:
+        df = remove_outliers(df, FEEDBACK_FIELDS)
+    stats = ClubStats.from_frame(df)
+    return [
+        _club_feedback(club, stats, with_summary=with_summary)
+        for club in clubs
+        if stats.count(club) >= MIN_CLUB_SHOTS
+    ]
@@ -1,64 +1,299 @@
 """Utilities for loading and normalising Garmin session CSV files."""
 
-from typing import List
+from typing import Collection, Dict, Iterable, Iterator, List, Optional
 
+import hashlib
+import io
+import multiprocessing
 import os
+import tarfile
+import zipfile
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
 import pandas as pd
 
-from .data_utils import derive_offline_distance
+from .constants import SHOT_SCHEMA
+from .data_utils import apply_shot_schema, compact_frame, normalize_columns
 from .logger import logger
 
+try:  # pyarrow is optional but parses large CSVs considerably faster
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
 
-def load_sessions(files: List[object]) -> pd.DataFrame:
-    """Return a concatenated dataframe from uploaded CSV ``files``.
+    CSV_ENGINE = "pyarrow"
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+    CSV_ENGINE = "c"
 
-    Sessions are named using the earliest timestamp in each file.  If multiple
-    files share the same date, a session number is appended based on the
-    chronological order of their timestamps (e.g. ``2025-08-01 Session 1`` and
-    ``2025-08-01 Session 2``).  The original file name is preserved in the
-    ``Source File`` column so files can still be removed individually later.
+PARSE_CACHE_DIR = os.path.join("sample_data", "parse_cache")
+# Bump when parsing or normalisation changes so stale cached frames are ignored.
+_PARSE_CACHE_VERSION = b"1"
+
+# Batches at or above either threshold are parsed in a process pool.
+PROCESS_POOL_MIN_FILES = 24
+PROCESS_POOL_MIN_BYTES = 16 * 1024 * 1024
+# Files read ahead per process-pool worker while earlier ones are parsed.
+PROCESS_POOL_READ_AHEAD = 2
+
+_LOAD_ERRORS = (OSError, pd.errors.ParserError, UnicodeError, AttributeError)
 
-    Each file is read into a dataframe, normalised so that a ``Club`` column is
-    always present and annotated with session metadata. Any files that fail to
-    parse are skipped with a logged warning so errors are captured in
-    ``app.log``.
+# Only tarballs count as gzipped archives; a gzipped export (``.csv.gz``) is
+# parsed like any other CSV.
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+# Text columns are declared up front so the pyarrow reader validates their
+# encoding instead of silently returning raw bytes.
+_TEXT_DTYPES = {col: "string" for col, dtype in SHOT_SCHEMA.items() if dtype == "object"}
+
+
+def _read_csv(file: object, compression: Optional[str] = None) -> pd.DataFrame:
+    """Read ``file`` with the fastest available CSV engine.
+
+    The pyarrow engine is used when installed. Files it cannot decode (for
+    example exports with stray non UTF-8 bytes) are re-read with the C engine,
+    which replaces undecodable characters instead of failing.
     """
 
-    def _load(file: object):
+    if CSV_ENGINE == "pyarrow":
         try:
+            return pd.read_csv(
+                file,
+                engine="pyarrow",
+                dtype=_TEXT_DTYPES,
+                on_bad_lines="error",
+                compression=compression,
+            )
+        except pd.errors.ParserError:
+            raise
+        except (UnicodeError, ValueError, TypeError) as exc:
+            logger.debug("pyarrow CSV engine failed, falling back: %s", exc)
             if hasattr(file, "seek"):
                 file.seek(0)
-            df = pd.read_csv(
-                file, encoding="utf-8", encoding_errors="replace", on_bad_lines="error"
-            )
-            if "Club" not in df.columns:
-                if "Club Name" in df.columns:
-                    df["Club"] = df["Club Name"]
-                elif "Club Type" in df.columns:
-                    df["Club"] = df["Club Type"]
-            df = derive_offline_distance(df)
-
-            first_dt = pd.NaT
-            if "Date" in df.columns:
-                df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-                first_dt = df["Date"].min()
-
-            return {
-                "df": df,
-                "first_dt": first_dt,
-                "file_name": getattr(file, "name", "Unknown"),
-            }
-        except (OSError, pd.errors.ParserError, UnicodeError, AttributeError) as e:
-            logger.warning(
-                "Failed to load %s: %s", getattr(file, "name", "unknown"), e
-            )
-            return None
+    return pd.read_csv(
+        file,
+        encoding="utf-8",
+        encoding_errors="replace",
+        on_bad_lines="error",
+        compression=compression,
+    )
+
+
+def _compression(file: object) -> Optional[str]:
+    """Return ``"gzip"`` if ``file`` is gzipped (e.g. a ``.csv.gz`` export).
+
+    Uploads are buffers, so pandas cannot infer compression from a path;
+    the gzip magic number is checked instead.
+    """
+
+    if not hasattr(file, "seek"):
+        return None
+    file.seek(0)
+    head = file.read(2)
+    file.seek(0)
+    return "gzip" if head == b"\x1f\x8b" else None
+
+
+def file_digest(file: object) -> str:
+    """Return a content hash of ``file`` without keeping a copy of its bytes.
+
+    The file is read in chunks and rewound afterwards so it can still be
+    parsed. Identical exports produce the same digest regardless of their
+    upload name, which lets callers skip files that are already loaded.
+    """
+
+    h = hashlib.blake2b(_PARSE_CACHE_VERSION, digest_size=16)
+    if hasattr(file, "seek"):
+        file.seek(0)
+    while True:
+        chunk = file.read(1 << 20)
+        if not chunk:
+            break
+        h.update(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return h.hexdigest()
+
+
+def _cache_path(digest: str) -> str:
+    return os.path.join(PARSE_CACHE_DIR, f"{digest}.parquet")
+
+
+def _read_cached(digest: str) -> Optional[pd.DataFrame]:
+    """Return the parsed frame stored for ``digest`` or ``None`` on a miss."""
+
+    path = _cache_path(digest)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError, ImportError) as exc:
+        logger.warning("Ignoring unreadable parse cache %s: %s", path, exc)
+        return None
+
+
+def _write_cached(digest: str, df: pd.DataFrame) -> None:
+    """Store a parsed, normalised frame for ``digest`` (best effort)."""
+
+    path = _cache_path(digest)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError, TypeError, ImportError) as exc:
+        logger.info("Not caching parsed file %s: %s", digest, exc)
+
+
+def _parse_file(file: object) -> pd.DataFrame:
+    """Parse one Garmin export into a typed, normalised dataframe."""
+
+    # ``_compression`` rewinds ``file``.  Aliases such as ``Club Type`` or
+    # ``Side`` are renamed to the canonical ``Club`` and ``Offline`` columns
+    # while parsing.
+    return apply_shot_schema(_read_csv(file, _compression(file)))
+
+
+def _file_size(file: object) -> int:
+    """Return the size of ``file`` in bytes without reading it."""
+
+    size = getattr(file, "size", None)
+    if size is not None:
+        return int(size)
+    if hasattr(file, "seek") and hasattr(file, "tell"):
+        pos = file.tell()
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(pos)
+        return size
+    return 0
+
+
+def _read_bytes(file: object) -> bytes:
+    if hasattr(file, "seek"):
+        file.seek(0)
+    data = file.read()
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+def _choose_backend(files: List[object]) -> str:
+    """Return ``"process"`` for bulk imports and ``"thread"`` otherwise.
+
+    Parsing is mostly GIL-bound, so large batches benefit from one process per
+    core. Small uploads stay on threads where process start-up would dominate.
+    """
+
+    if pa is None or (os.cpu_count() or 1) < 2:
+        return "thread"
+    if len(files) >= PROCESS_POOL_MIN_FILES:
+        return "process"
+    if sum(_file_size(f) for f in files) >= PROCESS_POOL_MIN_BYTES:
+        return "process"
+    return "thread"
+
+
+def _parse_bytes_to_ipc(data: bytes) -> bytes | pd.DataFrame:
+    """Process-pool worker: parse CSV ``data`` and return an Arrow IPC stream.
+
+    Shipping the frame as an Arrow buffer is far cheaper than pickling a
+    dataframe. Frames Arrow cannot represent (e.g. mixed-type object columns)
+    are returned as-is and pickled instead.
+    """
+
+    df = _parse_file(io.BytesIO(data))
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return df
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _frame_from_ipc(payload: bytes | pd.DataFrame) -> pd.DataFrame:
+    if isinstance(payload, pd.DataFrame):
+        return payload
+    return pa.ipc.open_stream(payload).read_all().to_pandas()
+
+
+def _process_pool(max_workers: int) -> ProcessPoolExecutor:
+    methods = multiprocessing.get_all_start_methods()
+    # ``fork`` is unsafe in the multi-threaded Streamlit server.
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context(method)
+    )
+
+
+def _parse_misses(files: List[object], backend: str) -> List[object]:
+    """Parse ``files`` with ``backend`` returning a frame or exception each.
+
+    With the process backend at most :data:`PROCESS_POOL_READ_AHEAD` files per
+    worker are read and queued at a time, so the parent does not hold every
+    file in memory at once. A file whose worker fails for any other reason
+    than a parse error (including a broken pool) is parsed in-process instead.
+    """
 
     max_workers = max(1, min(len(files), (os.cpu_count() or 1)))
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        sessions = [s for s in pool.map(_load, files) if s]
+
+    def _parse(file: object):
+        try:
+            return _parse_file(file)
+        except _LOAD_ERRORS as exc:
+            return exc
+
+    if backend != "process":
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_parse, files))
+
+    results: List[object] = [None] * len(files)
+    pending: Dict[Future, int] = {}
+
+    def _fallback(i: int, exc: BaseException) -> None:
+        logger.warning(
+            "Parsing %s in a worker failed, parsing in-process: %r",
+            getattr(files[i], "name", "unknown"),
+            exc,
+        )
+        results[i] = _parse(files[i])
+
+    def _collect(done) -> None:
+        for future in done:
+            i = pending.pop(future)
+            try:
+                results[i] = _frame_from_ipc(future.result())
+            except _LOAD_ERRORS as exc:
+                results[i] = exc
+            except Exception as exc:  # includes BrokenProcessPool
+                _fallback(i, exc)
+
+    with _process_pool(max_workers) as pool:
+        for i, file in enumerate(files):
+            if len(pending) >= PROCESS_POOL_READ_AHEAD * max_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+            try:
+                data = _read_bytes(file)
+            except _LOAD_ERRORS as exc:
+                results[i] = exc
+                continue
+            try:
+                pending[pool.submit(_parse_bytes_to_ipc, data)] = i
+            except BrokenProcessPool as exc:
+                _fallback(i, exc)
+        _collect(list(pending))
+    return results
+
+
+def _name_sessions(sessions: List[dict]) -> pd.DataFrame:
+    """Annotate parsed ``sessions`` with names and IDs and concatenate them."""
 
     if not sessions:
         return pd.DataFrame()
@@ -89,6 +324,206 @@ def load_sessions(files: List[object]) -> pd.DataFrame:
         df["Session Name"] = session_name
         df["Source File"] = file_name
         df["Session ID"] = session_id
+        df["Source Hash"] = session["digest"]
         dfs.append(df)
 
-    return pd.concat(dfs, ignore_index=True)
+    return compact_frame(pd.concat(dfs, ignore_index=True))
+
+
+def _session_record(df: pd.DataFrame, file_name: str, digest: str) -> dict:
+    # Frames from the parse cache may predate canonical column names.
+    df = normalize_columns(df)
+    first_dt = df["Date"].min() if "Date" in df.columns else pd.NaT
+    return {"df": df, "first_dt": first_dt, "file_name": file_name, "digest": digest}
+
+
+def load_sessions(
+    files: List[object],
+    digests: Optional[List[str]] = None,
+    *,
+    backend: str = "auto",
+    archives: Iterable[object] = (),
+    skip_digests: Collection[str] = (),
+) -> pd.DataFrame:
+    """Return a concatenated dataframe from uploaded CSV ``files``.
+
+    Sessions are named using the earliest timestamp in each file.  If multiple
+    files share the same date, a session number is appended based on the
+    chronological order of their timestamps (e.g. ``2025-08-01 Session 1`` and
+    ``2025-08-01 Session 2``).  The original file name is preserved in the
+    ``Source File`` column so files can still be removed individually later.
+
+    Each file is read into a dataframe, parsed into the dtypes declared by
+    :data:`utils.constants.SHOT_SCHEMA`, renamed to the canonical columns of
+    :data:`utils.constants.COLUMN_ALIASES` (so a ``Club`` column is present
+    whenever the export names the club) and annotated with session metadata.
+    The result uses the compact layout of
+    :func:`utils.data_utils.compact_frame`.  Any files that fail to parse are
+    skipped with a logged warning so errors are captured in ``app.log``.
+
+    Parsed frames are cached on disk under :data:`PARSE_CACHE_DIR`, keyed by
+    :func:`file_digest`, so re-uploading an export skips parsing entirely.
+    ``digests`` may be passed when the caller has already hashed ``files``.
+    The digest of each file is recorded in the ``Source Hash`` column.
+
+    ``backend`` selects how cache misses are parsed: ``"thread"``,
+    ``"process"`` or ``"auto"`` (the default), which switches to a process pool
+    once the batch reaches :data:`PROCESS_POOL_MIN_FILES` files or
+    :data:`PROCESS_POOL_MIN_BYTES` bytes.
+
+    ``archives`` are zip or tar uploads whose CSV members are loaded as by
+    :func:`load_archive`.  They are named in the same pass as ``files``, so
+    same-date sessions get distinct numbers whichever upload they came
+    from.  Members whose digest is in ``skip_digests`` or matches one of
+    ``files`` are skipped without parsing.
+    """
+
+    sessions = _file_records(files, digests, backend)
+    seen = set(skip_digests) | {session["digest"] for session in sessions}
+    for archive in archives:
+        sessions += _archive_records(archive, seen)
+    return _name_sessions(sessions)
+
+
+def _file_records(
+    files: List[object], digests: Optional[List[str]], backend: str
+) -> List[dict]:
+    """Return the session records of uploaded CSV ``files`` (unnamed)."""
+
+    if not files:
+        return []
+    if digests is None:
+        digests = [None] * len(files)
+    names = [getattr(f, "name", "Unknown") for f in files]
+
+    def _lookup(item: tuple[object, Optional[str]]):
+        file, digest = item
+        try:
+            if digest is None:
+                digest = file_digest(file)
+            return digest, _read_cached(digest)
+        except _LOAD_ERRORS as e:
+            logger.warning("Failed to load %s: %s", getattr(file, "name", "unknown"), e)
+            return None, None
+
+    max_workers = max(1, min(len(files), (os.cpu_count() or 1)))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        lookups = list(pool.map(_lookup, zip(files, digests)))
+
+    frames: List[Optional[pd.DataFrame]] = [df for _, df in lookups]
+    misses = [i for i, (digest, df) in enumerate(lookups) if digest and df is None]
+    if misses:
+        miss_files = [files[i] for i in misses]
+        if backend == "auto":
+            backend = _choose_backend(miss_files)
+        for i, result in zip(misses, _parse_misses(miss_files, backend)):
+            if isinstance(result, Exception):
+                logger.warning("Failed to load %s: %s", names[i], result)
+                continue
+            frames[i] = result
+            _write_cached(lookups[i][0], result)
+
+    return [
+        _session_record(df, name, digest)
+        for df, name, (digest, _) in zip(frames, names, lookups)
+        if df is not None
+    ]
+
+
+def is_archive(name: str) -> bool:
+    """Return ``True`` if ``name`` looks like a zip or tar archive."""
+
+    return name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _is_session_member(path: str) -> bool:
+    base = os.path.basename(path)
+    return (
+        base.lower().endswith(".csv")
+        and not base.startswith(".")
+        and "__MACOSX/" not in path
+    )
+
+
+def iter_archive_members(archive: object) -> Iterator[io.BytesIO]:
+    """Yield the CSV members of a zip or tar ``archive`` one at a time.
+
+    Members are decompressed straight from the uploaded stream: nothing is
+    extracted to disk and only the member currently being yielded is held in
+    memory. Tar archives are read in streaming mode (``r|*``) so gzip, bz2 and
+    xz compression are all supported. Each yielded buffer carries the member's
+    base name in ``name`` like an uploaded file.
+    """
+
+    if hasattr(archive, "seek"):
+        archive.seek(0)
+    if zipfile.is_zipfile(archive):
+        archive.seek(0)
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not _is_session_member(info.filename):
+                    continue
+                with zf.open(info) as member:
+                    buf = io.BytesIO(member.read())
+                buf.name = os.path.basename(info.filename)
+                yield buf
+        return
+
+    if hasattr(archive, "seek"):
+        archive.seek(0)
+    with tarfile.open(fileobj=archive, mode="r|*") as tf:
+        for info in tf:
+            if not info.isfile() or not _is_session_member(info.name):
+                continue
+            member = tf.extractfile(info)
+            if member is None:
+                continue
+            buf = io.BytesIO(member.read())
+            buf.name = os.path.basename(info.name)
+            yield buf
+
+
+def load_archive(
+    archive: object, skip_digests: Collection[str] = ()
+) -> pd.DataFrame:
+    """Return sessions loaded from the CSV exports inside ``archive``.
+
+    This is the bulk counterpart to :func:`load_sessions` for a single zip or
+    tar(.gz) upload. Members are streamed through
+    :func:`iter_archive_members` and hashed, looked up in the parse cache and
+    parsed one by one, so memory use is bounded by the largest member rather
+    than the archive. Members whose digest is in ``skip_digests`` (or repeats
+    within the archive) are skipped without parsing. Sessions are named exactly
+    as :func:`load_sessions` names them; pass archives to :func:`load_sessions`
+    to name them together with other uploads.
+    """
+
+    return _name_sessions(_archive_records(archive, set(skip_digests)))
+
+
+def _archive_records(archive: object, seen: set) -> List[dict]:
+    """Return the session records of ``archive``'s members (unnamed).
+
+    Members whose digest is in ``seen`` are skipped; loaded ones are added.
+    """
+
+    archive_name = getattr(archive, "name", "archive")
+    sessions = []
+    try:
+        for member in iter_archive_members(archive):
+            try:
+                digest = file_digest(member)
+                if digest in seen:
+                    continue
+                seen.add(digest)
+                df = _read_cached(digest)
+                if df is None:
+                    df = _parse_file(member)
+                    _write_cached(digest, df)
+            except _LOAD_ERRORS as e:
+                logger.warning("Failed to load %s from %s: %s", member.name, archive_name, e)
+                continue
+            sessions.append(_session_record(df, member.name, digest))
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+        logger.warning("Failed to read archive %s: %s", archive_name, e)
+    return sessions
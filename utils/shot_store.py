@@ -0,0 +1,530 @@
+"""Segment-per-session storage for uploaded shot data.
+
+All shots used to live in a single dataframe that was re-concatenated on every
+upload and rebuilt with a boolean filter on every removal.  :class:`ShotStore`
+instead keeps one immutable segment per ``Session ID`` so adding or dropping a
+session only touches that session's rows.  Readers get the combined table from
+:meth:`ShotStore.frame`, which is concatenated lazily and cached until the next
+change.
+
+Shot quality labels are the one mutable part of the store.  Automatic labels
+are stored per segment by :meth:`ShotStore.set_quality` when a session is
+ingested, as one ``uint8`` code per shot.  Manual tags are a sparse override
+map keyed by stable shot ID (``"<session ID>:<row>"``, see :func:`shot_id`)
+and are applied in place through :meth:`ShotStore.tag`.
+:meth:`ShotStore.frame` exposes both as ``Quality`` and ``Quality Source``
+categorical columns.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .club_index import ClubIndex
+from .constants import QUALITY_LABELS, QUALITY_SOURCES
+
+_QUALITY_DTYPE = pd.CategoricalDtype(QUALITY_LABELS)
+_SOURCE_DTYPE = pd.CategoricalDtype(QUALITY_SOURCES)
+_QUALITY_CODES = {label: code for code, label in enumerate(QUALITY_LABELS)}
+
+
+def _catalog_entry(segment: pd.DataFrame) -> Dict[str, object]:
+    """Summarise a segment for the session catalog (JSON-serialisable)."""
+
+    def first(col: str) -> Optional[str]:
+        values = segment[col].dropna() if col in segment.columns else ()
+        return str(values.iloc[0]) if len(values) else None
+
+    dates = (
+        pd.to_datetime(segment["Date"], errors="coerce").dropna()
+        if "Date" in segment.columns
+        else ()
+    )
+    clubs = segment["Club"].value_counts(sort=False) if "Club" in segment.columns else {}
+    clubs = {club: n for club, n in dict(clubs).items() if n}
+    return {
+        "name": first("Session Name"),
+        "source_file": first("Source File"),
+        "first_shot": dates.min().isoformat() if len(dates) else None,
+        "last_shot": dates.max().isoformat() if len(dates) else None,
+        "clubs": {str(club): int(n) for club, n in dict(clubs).items()},
+    }
+
+
+def _concat_segments(segments: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate ``segments``, keeping categorical columns categorical.
+
+    ``pd.concat`` falls back to ``object`` when the categories differ, so
+    each categorical column is first given the sorted union of the
+    segments' categories.
+    """
+
+    categorical = {
+        col
+        for segment in segments
+        for col, dtype in segment.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+    }
+    dtypes = {}
+    for col in categorical:
+        categories = [
+            segment[col].cat.categories
+            if isinstance(segment[col].dtype, pd.CategoricalDtype)
+            else pd.Index(segment[col].dropna().unique())
+            for segment in segments
+            if col in segment.columns
+        ]
+        union = categories[0].append(categories[1:]).unique()
+        dtypes[col] = pd.CategoricalDtype(union.sort_values())
+    return pd.concat(
+        [
+            segment.astype({c: t for c, t in dtypes.items() if c in segment.columns})
+            for segment in segments
+        ]
+    )
+
+
+def shot_id(session_id: str, row: int) -> str:
+    """Return the stable ID of the ``row``-th shot of ``session_id``.
+
+    Segments never change once stored, so the ID survives other sessions
+    being added or removed and the app being restarted.
+    """
+
+    return f"{session_id}:{row}"
+
+
+def parse_shot_id(value: str) -> Tuple[str, int]:
+    """Split a shot ID into ``(session ID, row)``."""
+
+    session_id, _, row = value.rpartition(":")
+    return session_id, int(row)
+
+
+class ShotStore:
+    """Columnar shot table stored as one segment per session.
+
+    Segments are never modified after they are added; callers must treat the
+    frames returned by :meth:`segment` and :meth:`frame` as read-only.  Each
+    shot keeps the index label it was given when its session was added, so
+    labels stay stable when other sessions are removed.
+
+    Segments restored from disk can be attached lazily with :meth:`attach`;
+    they are only read when first accessed.
+
+    :attr:`version` changes whenever sessions are added or removed or
+    quality labels change, and is never reused, even across stores, so
+    derived data can be cached by it.  :attr:`data_version` only changes
+    when sessions are added or removed, for data that does not depend on
+    the quality labels.
+    """
+
+    _versions = itertools.count(1)
+
+    def __init__(self, segments: Iterable[pd.DataFrame] = ()) -> None:
+        self._segments: Dict[str, Union[pd.DataFrame, Callable[[], pd.DataFrame]]] = {}
+        self._rows: Dict[str, int] = {}
+        self._ends: Dict[str, int] = {}
+        self._catalog: Dict[str, Dict[str, object]] = {}
+        self._catalog_frame: Optional[pd.DataFrame] = None
+        self._codes: Dict[str, np.ndarray] = {}
+        self._overrides: Dict[str, Dict[int, int]] = {}
+        self._frame: Optional[pd.DataFrame] = None
+        self._club_index: Optional[ClubIndex] = None
+        self._next_label = 0
+        self.version = self.data_version = next(self._versions)
+        for segment in segments:
+            self.append(segment)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ShotStore":
+        """Build a store from a combined dataframe, keeping its index labels."""
+
+        store = cls()
+        store.append(df, keep_index=True)
+        return store
+
+    # ------------------------------------------------------------------
+    def append(self, df: pd.DataFrame, *, keep_index: bool = False) -> List[str]:
+        """Add the sessions in ``df`` and return their IDs in order.
+
+        ``df`` must have a ``Session ID`` column; each distinct ID becomes one
+        segment.  New rows are labelled after the highest label used so far
+        unless ``keep_index`` is set (used when restoring persisted state).
+        Adding an ID that is already stored raises :class:`ValueError`.
+        """
+
+        if df.empty:
+            return []
+        if "Session ID" not in df.columns:
+            raise ValueError("Shot data requires a 'Session ID' column")
+        added = []
+        for sid, segment in df.groupby("Session ID", sort=False, observed=True):
+            if sid in self._segments:
+                raise ValueError(f"Session {sid} is already stored")
+            if not keep_index:
+                labels = pd.RangeIndex(self._next_label, self._next_label + len(segment))
+                segment = segment.set_axis(labels)
+            end = int(segment.index.max()) + 1 if len(segment) else 0
+            self._next_label = max(self._next_label, end)
+            self._segments[sid] = segment
+            self._rows[sid] = len(segment)
+            self._ends[sid] = end
+            self._catalog[sid] = _catalog_entry(segment)
+            added.append(sid)
+        self._changed()
+        return added
+
+    def attach(
+        self,
+        session_id: str,
+        loader: Callable[[], pd.DataFrame],
+        *,
+        rows: int,
+        next_label: int,
+        catalog: Optional[Dict[str, object]] = None,
+    ) -> None:
+        """Register a segment whose rows are produced by ``loader`` on demand.
+
+        ``rows``, ``next_label`` (one past the segment's highest index label)
+        and the ``catalog`` entry describe the segment without loading it.
+        Without a catalog entry the segment is read when the catalog is
+        first needed.
+        """
+
+        if session_id in self._segments:
+            raise ValueError(f"Session {session_id} is already stored")
+        self._segments[session_id] = loader
+        self._rows[session_id] = rows
+        self._ends[session_id] = next_label
+        if catalog is not None:
+            self._catalog[session_id] = catalog
+        self._next_label = max(self._next_label, next_label)
+        self._changed()
+
+    def drop(self, session_id: str) -> bool:
+        """Remove the segment for ``session_id``; return whether it existed."""
+
+        if self._segments.pop(session_id, None) is None:
+            return False
+        self._codes.pop(session_id, None)
+        self._overrides.pop(session_id, None)
+        del self._rows[session_id]
+        del self._ends[session_id]
+        self._catalog.pop(session_id, None)
+        self._changed()
+        return True
+
+    def clear(self) -> None:
+        """Remove every session."""
+
+        self._segments.clear()
+        self._codes.clear()
+        self._overrides.clear()
+        self._rows.clear()
+        self._ends.clear()
+        self._catalog.clear()
+        self._changed()
+
+    def _changed(self) -> None:
+        self._frame = None
+        self._catalog_frame = None
+        self._club_index = None
+        self.version = self.data_version = next(self._versions)
+
+    # ------------------------------------------------------------------
+    def set_quality(self, session_id: str, labels: Union[pd.Series, np.ndarray]) -> None:
+        """Store automatic quality ``labels`` for the shots of ``session_id``.
+
+        ``labels`` is indexed like the segment, or is an array of label codes
+        in row order as returned by :meth:`quality_codes` (which does not load
+        the segment).  Shots with a manual tag keep it.
+        """
+
+        if isinstance(labels, pd.Series):
+            index = self.segment(session_id).index
+            codes = pd.Categorical(labels.reindex(index), dtype=_QUALITY_DTYPE).codes
+        else:
+            codes = np.asarray(labels, dtype=np.int64)
+            if len(codes) != self._rows[session_id]:
+                raise ValueError(f"Session {session_id} has {self._rows[session_id]} shots")
+            codes = np.where(codes < len(QUALITY_LABELS), codes, -1)
+        if (codes < 0).any():
+            raise ValueError(f"Session {session_id} has shots without a quality label")
+        self._codes[session_id] = codes.astype(np.uint8)
+        self._quality_changed()
+
+    def quality_codes(self, session_id: str) -> Optional[np.ndarray]:
+        """Return the automatic label codes of ``session_id`` (``None`` if unset).
+
+        Codes index :data:`~utils.constants.QUALITY_LABELS`, in row order.
+        """
+
+        return self._codes.get(session_id)
+
+    def tag(self, tags: Mapping[str, str]) -> None:
+        """Set manual quality labels (shot ID -> quality).
+
+        Tags for sessions that are not stored are ignored; tags for sessions
+        without automatic labels yet take effect once they are labelled.
+        """
+
+        unknown = set(tags.values()) - set(QUALITY_LABELS)
+        if unknown:
+            raise ValueError(f"Unknown quality label(s): {sorted(unknown)}")
+        changed = False
+        for key, label in tags.items():
+            sid, row = parse_shot_id(key)
+            if sid in self._segments and 0 <= row < self._rows[sid]:
+                self._overrides.setdefault(sid, {})[row] = _QUALITY_CODES[label]
+                changed = True
+        if changed:
+            self._quality_changed()
+
+    def _quality_changed(self) -> None:
+        # Only the two label columns change, so patch the cached frame rather
+        # than concatenating every segment again.
+        if self._frame is not None:
+            self._frame = self._frame.assign(**self._quality_columns())
+        self.version = next(self._versions)
+
+    def _quality_columns(self) -> Dict[str, pd.Series]:
+        codes, sources = [], []
+        for sid in self._segments:
+            rows = self._rows[sid]
+            auto = self._codes.get(sid)
+            seg_codes = np.full(rows, -1, dtype=np.int8)
+            seg_sources = np.full(rows, -1, dtype=np.int8)
+            if auto is not None:
+                seg_codes[:] = auto
+                seg_sources[:] = 0
+            overrides = self._overrides.get(sid)
+            if overrides:
+                pos = np.fromiter(overrides, dtype=np.intp, count=len(overrides))
+                seg_codes[pos] = np.fromiter(
+                    overrides.values(), dtype=np.int8, count=len(overrides)
+                )
+                seg_sources[pos] = 1
+            codes.append(seg_codes)
+            sources.append(seg_sources)
+        index = self._frame.index if self._frame is not None else None
+        return {
+            "Quality": pd.Series(
+                pd.Categorical.from_codes(np.concatenate(codes), dtype=_QUALITY_DTYPE),
+                index=index,
+            ),
+            "Quality Source": pd.Series(
+                pd.Categorical.from_codes(np.concatenate(sources), dtype=_SOURCE_DTYPE),
+                index=index,
+            ),
+        }
+
+    @property
+    def tags(self) -> Dict[str, str]:
+        """Manual quality tags by shot ID."""
+
+        return {
+            shot_id(sid, row): QUALITY_LABELS[code]
+            for sid, overrides in self._overrides.items()
+            for row, code in overrides.items()
+        }
+
+    def shot_ids(self, labels: Iterable[int]) -> List[Optional[str]]:
+        """Return the shot IDs of index ``labels`` (``None`` if not stored)."""
+
+        labels = np.asarray(list(labels), dtype=np.int64)
+        ids = np.full(len(labels), None, dtype=object)
+        for sid, segment in self._segments.items():
+            if isinstance(segment, pd.DataFrame):
+                pos = segment.index.get_indexer(labels)
+            else:
+                # Unloaded segments were labelled with a contiguous range.
+                pos = labels - (self._ends[sid] - self._rows[sid])
+                pos[(pos < 0) | (pos >= self._rows[sid])] = -1
+            hit = np.flatnonzero(pos >= 0)
+            ids[hit] = [shot_id(sid, int(p)) for p in pos[hit]]
+        return ids.tolist()
+
+    def unclassified(self) -> List[str]:
+        """Session IDs whose shots have no automatic quality labels yet."""
+
+        return [sid for sid in self._segments if sid not in self._codes]
+
+    # ------------------------------------------------------------------
+    @property
+    def session_ids(self) -> List[str]:
+        """Stored session IDs in insertion order."""
+
+        return list(self._segments)
+
+    @property
+    def empty(self) -> bool:
+        return not self._segments
+
+    def __len__(self) -> int:
+        return sum(self._rows.values())
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._segments
+
+    def segment_info(self, session_id: str) -> Dict[str, object]:
+        """Return ``rows``, ``next_label`` and ``catalog`` for a segment.
+
+        The catalog entry is left out if it is not known without loading the
+        segment.
+        """
+
+        info: Dict[str, object] = {
+            "rows": self._rows[session_id],
+            "next_label": self._ends[session_id],
+        }
+        if session_id in self._catalog:
+            info["catalog"] = self._catalog[session_id]
+        return info
+
+    @property
+    def catalog(self) -> pd.DataFrame:
+        """One row per session, in insertion order, indexed by ``Session ID``.
+
+        Columns are ``Session Name``, ``Source File``, ``First Shot`` and
+        ``Last Shot`` (timestamps), ``Rows``, ``Start`` (position of the
+        session's first row in :meth:`frame`) and ``Clubs`` (shots per club).
+        Pages pick sessions from it instead of scanning the shot table.
+        """
+
+        if self._catalog_frame is None:
+            for sid in self._segments:
+                if sid not in self._catalog:
+                    self._catalog[sid] = _catalog_entry(self.segment(sid))
+            sids = list(self._segments)
+            rows = np.array([self._rows[sid] for sid in sids], dtype=np.int64)
+            entries = [self._catalog[sid] for sid in sids]
+            self._catalog_frame = pd.DataFrame(
+                {
+                    "Session Name": [e["name"] for e in entries],
+                    "Source File": [e["source_file"] for e in entries],
+                    "First Shot": pd.to_datetime([e["first_shot"] for e in entries]),
+                    "Last Shot": pd.to_datetime([e["last_shot"] for e in entries]),
+                    "Rows": rows,
+                    "Start": np.cumsum(rows) - rows,
+                    "Clubs": [e["clubs"] for e in entries],
+                },
+            ).set_axis(pd.Index(sids, name="Session ID"))
+        return self._catalog_frame
+
+    def positions(self, session_ids: Iterable[str]) -> np.ndarray:
+        """Return the row positions in :meth:`frame` of ``session_ids``.
+
+        Positions follow the store's session order, so ``frame().iloc[...]``
+        (or ``iloc`` on any frame derived row-for-row from it) selects the
+        sessions without scanning the other shots.
+        """
+
+        catalog = self.catalog
+        wanted = catalog.index.isin(list(session_ids))
+        starts = catalog["Start"].to_numpy()[wanted]
+        counts = catalog["Rows"].to_numpy()[wanted]
+        if not len(counts):
+            return np.empty(0, dtype=np.intp)
+        # Concatenated ranges start..start+count without a Python loop.
+        offsets = np.repeat(starts - np.cumsum(np.r_[0, counts[:-1]]), counts)
+        return (np.arange(counts.sum()) + offsets).astype(np.intp)
+
+    def snapshot(self) -> List[Tuple[str, Optional[pd.DataFrame], Dict[str, object]]]:
+        """Return ``(session ID, segment or None, info)`` for every segment.
+
+        Segments that have not been loaded yet are reported as ``None``.  The
+        result shares the immutable segments, so it is cheap to take and safe
+        to hand to another thread.
+        """
+
+        return [
+            (
+                sid,
+                segment if isinstance(segment, pd.DataFrame) else None,
+                self.segment_info(sid),
+            )
+            for sid, segment in self._segments.items()
+        ]
+
+    def memory_usage(self) -> pd.DataFrame:
+        """Report the memory held per session, indexed by ``Session ID``.
+
+        Columns are ``Session Name``, ``Rows``, ``Loaded`` and ``Bytes``
+        (shot columns plus quality labels; ``0`` for segments not read from
+        disk yet).
+        """
+
+        names = self.catalog["Session Name"]
+        report = []
+        for sid, segment in self._segments.items():
+            loaded = isinstance(segment, pd.DataFrame)
+            nbytes = int(segment.memory_usage(index=True, deep=True).sum()) if loaded else 0
+            codes = self._codes.get(sid)
+            nbytes += codes.nbytes if codes is not None else 0
+            report.append(
+                {
+                    "Session Name": names.get(sid),
+                    "Rows": self._rows[sid],
+                    "Loaded": loaded,
+                    "Bytes": nbytes,
+                }
+            )
+        return pd.DataFrame(
+            report, columns=["Session Name", "Rows", "Loaded", "Bytes"]
+        ).set_axis(pd.Index(list(self._segments), name="Session ID"))
+
+    def is_loaded(self, session_id: str) -> bool:
+        """Return whether the rows of ``session_id`` are held in memory."""
+
+        return isinstance(self._segments[session_id], pd.DataFrame)
+
+    def segment(self, session_id: str) -> pd.DataFrame:
+        """Return the stored rows for ``session_id``, loading them if needed."""
+
+        segment = self._segments[session_id]
+        if not isinstance(segment, pd.DataFrame):
+            segment = segment()
+            self._segments[session_id] = segment
+        return segment
+
+    @property
+    def club_index(self) -> ClubIndex:
+        """Per-club row positions in :meth:`frame`.
+
+        Built once per set of sessions; quality label changes keep it.
+        """
+
+        if self._club_index is None:
+            self._club_index = ClubIndex.from_frame(self.frame())
+        return self._club_index
+
+    def frame(self) -> pd.DataFrame:
+        """Return all shots as one dataframe, concatenating lazily.
+
+        The result is cached until the store changes, so repeated reads within
+        a rerun are free.  Once any session has quality labels the frame has
+        ``Quality`` and ``Quality Source`` columns (missing for unlabelled
+        sessions).
+        """
+
+        if self._frame is None:
+            if self._segments:
+                frame = _concat_segments([self.segment(sid) for sid in self._segments])
+                # Keep each segment as a slice of the combined frame so the
+                # shots are held in memory once, not twice.
+                start = 0
+                for sid in self._segments:
+                    end = start + self._rows[sid]
+                    self._segments[sid] = frame.iloc[start:end]
+                    start = end
+                self._frame = frame
+                if self._codes:
+                    self._frame = frame.assign(**self._quality_columns())
+            else:
+                self._frame = pd.DataFrame()
+        return self._frame
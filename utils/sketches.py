@@ -0,0 +1,252 @@
+"""Mergeable per-club quantile sketches of shot metrics.
+
+Outlier and quality thresholds (median, MAD, quartiles) used to be recomputed
+from every stored shot whenever a session was added.  A :class:`SegmentSketch`
+instead summarises one immutable session segment with :data:`SKETCH_SIZE`
+evenly spaced quantiles per club and metric.  It is built once when the segment
+is ingested and persisted next to it.  :class:`ShotSketches` keeps one sketch
+per segment and merges them on demand, so adding or dropping a session costs
+``O(rows in that session)`` and reading thresholds costs
+``O(sessions * SKETCH_SIZE)`` however many shots are stored.
+
+Each segment's quantiles define a piecewise-linear CDF; the merged
+distribution is their count-weighted mixture.  The rank of any value under the
+merged CDF is off by at most :attr:`ShotSketches.rank_error` times the number
+of shots, so quantiles read from it are within that fraction of the exact
+ones.  For a single segment the median and quartiles are exact (up to
+floating-point rounding).
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .constants import NUMERIC_FIELDS
+from .data_utils import canonical_column, grouped_quantiles
+
+# Quantiles kept per club and metric.  ``SKETCH_SIZE - 1`` must be divisible
+# by four so the median and quartiles of a single segment are exact knots.
+SKETCH_SIZE = 101
+_PROBS = np.linspace(0.0, 1.0, SKETCH_SIZE)
+_KNOT_COLUMNS = [f"q{i}" for i in range(SKETCH_SIZE)]
+
+
+class RobustStats(NamedTuple):
+    """Approximate robust statistics of one metric."""
+
+    median: float
+    mad: float
+    q1: float
+    q3: float
+    count: int
+
+
+class SegmentSketch:
+    """Quantile summary of one session segment.
+
+    ``table`` has one row per ``(club, metric)`` with the number of values
+    in ``count`` and the quantiles at :data:`SKETCH_SIZE` evenly spaced
+    probabilities in columns ``q0`` .. ``q{SKETCH_SIZE - 1}``.  Metrics use the
+    canonical column names from :data:`~utils.constants.NUMERIC_FIELDS`.
+    """
+
+    def __init__(self, table: pd.DataFrame) -> None:
+        self.table = table
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "SegmentSketch":
+        """Summarise the launch-monitor metrics in ``df`` per ``Club``."""
+
+        if "Club" in df.columns:
+            codes, clubs = pd.factorize(df["Club"])
+            clubs = list(clubs)
+        else:
+            codes, clubs = np.zeros(len(df), dtype=np.intp), [None]
+        parts = []
+        seen = set()
+        for col in df.columns:
+            field = canonical_column(col)
+            if field not in NUMERIC_FIELDS or field in seen:
+                continue
+            seen.add(field)
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            counts, knots = grouped_quantiles(values, codes, len(clubs), _PROBS)
+            present = counts > 0
+            part = pd.DataFrame(knots[present], columns=_KNOT_COLUMNS)
+            part.insert(0, "club", [c for c, p in zip(clubs, present) if p])
+            part.insert(1, "metric", field)
+            part.insert(2, "count", counts[present])
+            parts.append(part)
+        if not parts:
+            return cls(pd.DataFrame(columns=["club", "metric", "count", *_KNOT_COLUMNS]))
+        return cls(pd.concat(parts, ignore_index=True))
+
+
+class _Mixture:
+    """Count-weighted mixture of piecewise-linear segment CDFs.
+
+    Between consecutive quantiles a segment spreads ``count / (SKETCH_SIZE -
+    1)`` shots uniformly; repeated quantile values become point masses.  The
+    mixture CDF is built with one sorted sweep over all interval endpoints.
+    """
+
+    def __init__(self, counts: np.ndarray, knots: np.ndarray) -> None:
+        self.count = int(counts.sum())
+        mass = np.repeat(counts / (SKETCH_SIZE - 1), SKETCH_SIZE - 1)
+        lo = knots[:, :-1].ravel()
+        hi = knots[:, 1:].ravel()
+        point = hi <= lo
+        slope = np.where(point, 0.0, mass / np.where(point, 1.0, hi - lo))
+        xs, inverse = np.unique(np.concatenate([lo, hi]), return_inverse=True)
+        n = len(lo)
+        slope_change = np.bincount(
+            inverse, np.concatenate([slope, -slope]), minlength=len(xs)
+        )
+        jump = np.bincount(inverse[:n][point], mass[point], minlength=len(xs))
+        # Mass accumulated continuously up to each breakpoint, plus jumps.
+        gained = np.concatenate([[0.0], np.cumsum(slope_change)[:-1] * np.diff(xs)])
+        right = np.cumsum(gained) + np.cumsum(jump)
+        left = right - jump
+        # Each breakpoint appears twice so jumps are vertical segments.
+        self.xs = np.repeat(xs, 2)
+        cdf = np.column_stack([left, right]).ravel() / self.count
+        self.cdf = np.clip(np.maximum.accumulate(cdf), 0.0, 1.0)
+
+    def cdf_at(self, x: np.ndarray) -> np.ndarray:
+        return np.interp(x, self.xs, self.cdf)
+
+    def quantile(self, q: float) -> float:
+        return float(np.interp(q, self.cdf, self.xs))
+
+    def stats(self) -> RobustStats:
+        median = self.quantile(0.5)
+        # P(|X - median| <= d) is piecewise linear with breakpoints where
+        # median +/- d hits a knot, so it can be inverted exactly.
+        d = np.unique(np.abs(self.xs[::2] - median))
+        within = self.cdf_at(median + d) - self.cdf_at(median - d)
+        mad = float(np.interp(0.5, np.maximum.accumulate(within), d))
+        return RobustStats(
+            median, mad, self.quantile(0.25), self.quantile(0.75), self.count
+        )
+
+
+class ShotSketches:
+    """Per-segment sketches of a :class:`~utils.shot_store.ShotStore`.
+
+    Sketches are keyed by ``Session ID`` like the store's segments and kept in
+    step with it by :meth:`sync`.  Merged statistics are cached until the set
+    of segments changes.
+    """
+
+    #: Maximum error of merged quantiles, as a fraction of the shot count.
+    rank_error = 1.0 / (SKETCH_SIZE - 1)
+
+    def __init__(self) -> None:
+        self._sketches: Dict[str, Union[SegmentSketch, Callable[[], SegmentSketch]]] = {}
+        self._index: Optional[Dict[Tuple[str, object], Tuple[np.ndarray, np.ndarray]]] = None
+        self._stats: Dict[Tuple[str, object], Optional[RobustStats]] = {}
+
+    # ------------------------------------------------------------------
+    def add(self, session_id: str, sketch: SegmentSketch) -> None:
+        self._sketches[session_id] = sketch
+        self._invalidate()
+
+    def attach(self, session_id: str, loader: Callable[[], SegmentSketch]) -> None:
+        """Register a persisted sketch that ``loader`` reads on first use."""
+
+        self._sketches[session_id] = loader
+        self._invalidate()
+
+    def drop(self, session_id: str) -> bool:
+        if self._sketches.pop(session_id, None) is None:
+            return False
+        self._invalidate()
+        return True
+
+    def sync(self, store) -> "ShotSketches":
+        """Sketch segments new to ``store`` and forget ones it no longer has.
+
+        Only added segments are read, so the cost is proportional to the new
+        shots rather than the whole history.
+        """
+
+        wanted = set(store.session_ids)
+        for sid in [s for s in self._sketches if s not in wanted]:
+            self.drop(sid)
+        for sid in store.session_ids:
+            if sid not in self._sketches:
+                self.add(sid, SegmentSketch.from_frame(store.segment(sid)))
+        return self
+
+    def snapshot(self) -> List[Tuple[str, Optional[SegmentSketch]]]:
+        """Return ``(session ID, sketch or None if not loaded)`` pairs."""
+
+        return [
+            (sid, sketch if isinstance(sketch, SegmentSketch) else None)
+            for sid, sketch in self._sketches.items()
+        ]
+
+    def _invalidate(self) -> None:
+        self._index = None
+        self._stats.clear()
+
+    def _sketch(self, session_id: str) -> SegmentSketch:
+        sketch = self._sketches[session_id]
+        if not isinstance(sketch, SegmentSketch):
+            sketch = sketch()
+            self._sketches[session_id] = sketch
+        return sketch
+
+    def _rows(self, metric: str, club: object) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return ``(counts, knots)`` of every sketch row for ``metric``/``club``."""
+
+        if self._index is None:
+            tables = [self._sketch(sid).table for sid in self._sketches]
+            tables = [t for t in tables if not t.empty]
+            self._index = {}
+            if tables:
+                table = pd.concat(tables, ignore_index=True)
+                counts = table["count"].to_numpy(dtype=np.int64)
+                knots = table[_KNOT_COLUMNS].to_numpy(dtype=np.float64)
+                by_club = table.groupby(["metric", "club"], dropna=False, sort=False)
+                by_metric = table.groupby("metric", sort=False)
+                for key, pos in [*by_club.indices.items(), *by_metric.indices.items()]:
+                    if not isinstance(key, tuple):
+                        key = (key, None)
+                    self._index[key] = (counts[pos], knots[pos])
+        return self._index.get((metric, club))
+
+    # ------------------------------------------------------------------
+    def stats(self, metric: str, club: object = None) -> Optional[RobustStats]:
+        """Return merged statistics of ``metric`` for ``club`` (``None`` = all).
+
+        ``metric`` may be any alias in
+        :data:`~utils.constants.COLUMN_ALIASES`.  Returns ``None``
+        when no sketched shot has a value for it.
+        """
+
+        key = (canonical_column(metric), club)
+        if key not in self._stats:
+            rows = self._rows(*key)
+            self._stats[key] = _Mixture(*rows).stats() if rows is not None else None
+        return self._stats[key]
+
+    def group_stats(
+        self, metric: str, clubs: Iterable[object]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Return ``(median, mad, q1, q3)`` arrays aligned with ``clubs``.
+
+        Returns ``None`` if any club is not covered, so callers can fall back
+        to exact statistics.
+        """
+
+        stats = [self.stats(metric, club) for club in clubs]
+        if any(s is None for s in stats):
+            return None
+        return tuple(
+            np.array([getattr(s, name) for s in stats], dtype=np.float64)
+            for name in ("median", "mad", "q1", "q3")
+        )